@@ -1,67 +1,226 @@
 import os
-import json
+import asyncio
 import argparse
 from dotenv import load_dotenv
-from src.graph import create_auditor_graph
+# Only lightweight modules at import time: LangGraph, the LLM clients, pypdf and
+# GitPython load with the graph, so --help and --dry-run return immediately
+from src.batch import arun_batch, build_initial_state, build_judge_state, load_manifest, run_batch
+from src.checkpointing import (async_sqlite_checkpointer, checkpoint_path, new_thread_id, saved_profile,
+                              sqlite_checkpointer, thread_config)
+from src.collectors import needs_repository, rubric_collectors, uncovered_criteria
+from src.evidence_file import EVIDENCE_FILE, GRAPH_PROFILES, evidence_summary, load_evidence, save_evidence
+from src.progress import AuditProgress, astream_audit, stream_audit
+from src.report import write_report
+from src.resources import audit_resources
+from src.rules import load_rubric
+from src.tracing import start_trace
+from src.llm.cache import get_cache
+from src.llm.scheduler import all_schedulers
 
 load_dotenv()
 
-def main():
-    parser = argparse.ArgumentParser(description="Automaton Auditor Swarm")
-    parser.add_argument("--repo", type=str, required=True, help="GitHub Repository URL")
-    parser.add_argument("--pdf", type=str, required=True, help="Path to the PDF report")
-    args = parser.parse_args()
+def print_llm_metrics():
+    print()
+    for provider, scheduler in all_schedulers().items():
+        metrics = scheduler.metrics.snapshot()
+        print(f"⏱️  LLM calls ({provider}): {metrics['requests']} (429 retries: {metrics['retries']}), "
+              f"queued {metrics['queued_seconds']:.1f}s total, {metrics['max_queued_seconds']:.1f}s max, "
+              f"by priority: {metrics['queued_by_priority']}")
+    cache = get_cache()
+    if cache is not None:
+        stats = cache.stats()
+        print(f"🗄️  LLM cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate), {stats['entries']} entries")
 
-    # Load Rubric
-    with open("src/rubric.json", "r") as f:
-        rubric = json.load(f)
-
-    # Initialize State
-    initial_state = {
-        "repo_url": args.repo,
-        "pdf_path": args.pdf,
-        "rubric_dimensions": rubric["dimensions"],
-        "evidences": {},
-        "opinions": [],
-        "errors": []
-    }
-
-    # Create and Run Graph
-    app = create_auditor_graph()
-    
-    print(f"🚀 Unleashing Auditor Swarm on {args.repo}...")
-    final_state = app.invoke(initial_state)
+def _announce_resume(snapshot, thread_id: str):
+    if snapshot is None or not snapshot.values:
+        raise SystemExit(f"No checkpoint found for audit '{thread_id}' (is AUDITOR_CHECKPOINTS on?)")
+    print(f"⏩ Resuming audit {thread_id} of {snapshot.values.get('repo_url')} "
+          f"at {', '.join(snapshot.next) or 'completion'}...")
+
+def _invoke_checkpointed(args, initial_state, config, progress=None):
+    # The checkpointer persists every super-step, so a crash keeps all work done so far
+    from src.graph import create_auditor_graph
+    with sqlite_checkpointer() as checkpointer:
+        app = create_auditor_graph(checkpointer=checkpointer, profile=args.profile)
+        if args.resume:
+            _announce_resume(app.get_state(config) if checkpointer else None, args.resume)
+        if progress is not None:
+            return stream_audit(app, initial_state, config, progress)
+        return app.invoke(initial_state, config)
+
+async def _ainvoke_checkpointed(args, initial_state, config, progress=None):
+    from src.graph import create_auditor_graph
+    async with async_sqlite_checkpointer() as checkpointer:
+        app = create_auditor_graph(use_async=True, checkpointer=checkpointer, profile=args.profile)
+        if args.resume:
+            _announce_resume(await app.aget_state(config) if checkpointer else None, args.resume)
+        if progress is not None:
+            return await astream_audit(app, initial_state, config, progress)
+        return await app.ainvoke(initial_state, config)
+
+REPORT_DIR = "audit/report_onpeer_generated"
+
+def export_trace(tracer):
+    if tracer is None:
+        return
+    summary = tracer.summary()
+    paths = tracer.export(REPORT_DIR)
+    print(f"\n🔎 Trace ({summary.wall_s:.1f}s wall), critical path: {' → '.join(summary.critical_path)}")
+    print(summary.table())
+    print(f"   Saved to {paths['json']} and {paths['chrome']} (open in chrome://tracing or ui.perfetto.dev)")
+
+def run_single(args, rubric: dict):
+    # A resumed run continues from the last completed super-step: no input, same thread
+    thread_id = args.resume or new_thread_id()
+    config = thread_config(thread_id, args.profile)
+    if args.resume:
+        initial_state = None
+    elif args.profile == "judges":
+        try:
+            bundle = load_evidence(args.evidence)
+        except ValueError as e:
+            raise SystemExit(f"❌ Cannot judge {args.evidence}: {str(e)}")
+        initial_state = build_judge_state(bundle, rubric)
+        print(f"⚖️  Judging saved evidence for {bundle.repo_url} ({evidence_summary(bundle.evidences)})... (audit id {thread_id})")
+    else:
+        initial_state = build_initial_state(args.repo, args.pdf, rubric)
+        print(f"🚀 Unleashing Auditor Swarm on {args.repo}... (audit id {thread_id})")
+    progress = AuditProgress(REPORT_DIR, args.events) if args.stream or args.events else None
+    with start_trace(thread_id) as tracer, audit_resources():
+        try:
+            if args.use_async:
+                final_state = asyncio.run(_ainvoke_checkpointed(args, initial_state, config, progress))
+            else:
+                final_state = _invoke_checkpointed(args, initial_state, config, progress)
+        except Exception as e:
+            if progress is not None:
+                progress.finish(completed=False)
+            print(f"\n❌ Audit interrupted: {str(e)}")
+            if checkpoint_path():
+                print(f"   Completed steps are checkpointed; continue with: python main.py --resume {thread_id}")
+            export_trace(tracer)
+            print_llm_metrics()
+            raise SystemExit(1)
 
     if final_state["errors"]:
         print("\n❌ Errors encountered during audit:")
         for error in final_state["errors"]:
             print(f"  - {error}")
 
+    if args.profile != "judges" and (args.evidence or args.profile == "detectives"):
+        evidence_file = save_evidence(final_state, args.evidence or os.path.join(REPORT_DIR, EVIDENCE_FILE))
+        print(f"\n🗂️  Evidence ({evidence_summary(final_state['evidences'])}) saved to {evidence_file}")
+        if args.profile == "detectives":
+            print(f"   Judge it with: python main.py --profile judges --evidence {evidence_file}")
+
     if final_state.get("final_report"):
         report = final_state["final_report"]
         print("\n⚖️  Audit Complete. Final Verdict:")
         print(f"Overall Score: {report.overall_score:.2f}/5")
-        
+
         # Save to Markdown
-        output_file = "audit/report_onpeer_generated/audit_report.md"
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        
-        with open(output_file, "w") as f:
-            f.write(f"# Audit Report for {args.repo}\n\n")
-            f.write(f"## Executive Summary\n{report.executive_summary}\n\n")
-            f.write(f"## Overall Score: {report.overall_score:.2f}/5\n\n")
-            
-            for criterion in report.criteria:
-                f.write(f"### {criterion.dimension_name}\n")
-                f.write(f"**Final Score: {criterion.final_score}/5**\n\n")
-                if criterion.dissent_summary:
-                    f.write(f"> **Dissent:** {criterion.dissent_summary}\n\n")
-                f.write(f"#### Judicial Opinions\n")
-                for opt in criterion.judge_opinions:
-                    f.write(f"- **{opt.judge}**: {opt.argument} (Score: {opt.score})\n")
-                f.write(f"\n#### Remediation\n{criterion.remediation}\n\n")
-        
+        output_file = write_report(report, os.path.join(REPORT_DIR, "audit_report.md"))
         print(f"\n📄 Full report saved to {output_file}")
 
+    if progress is not None:
+        progress.finish(completed=final_state.get("final_report") is not None or args.profile == "detectives")
+
+    export_trace(tracer)
+    print_llm_metrics()
+
+def run_cohort(args, rubric: dict):
+    submissions = load_manifest(args.manifest)
+    print(f"🚀 Unleashing Auditor Swarm on {len(submissions)} submissions (concurrency={args.concurrency})...")
+    if args.use_async:
+        results = asyncio.run(arun_batch(submissions, rubric, args.output_dir, concurrency=args.concurrency,
+                                         profile=args.profile))
+    else:
+        results = run_batch(submissions, rubric, args.output_dir, concurrency=args.concurrency, profile=args.profile)
+
+    failed = [r for r in results if not r["status"].startswith("completed")]
+    done = "with evidence collected" if args.profile == "detectives" else "graded"
+    print(f"\n⚖️  Cohort Audit Complete. {len(results) - len(failed)}/{len(results)} submissions {done}.")
+    print(f"📄 Reports, traces and cohort summaries saved to {args.output_dir}")
+    print_llm_metrics()
+
+def dry_run(args, rubric: dict):
+    """Checks the rubric and the submissions without loading the graph or calling any model."""
+    print(f"📐 Rubric: {len(rubric['dimensions'])} dimensions, scoring rules {'from rubric' if rubric.get('scoring_rules') else 'built-in'}")
+    uncovered = uncovered_criteria(rubric["dimensions"])
+    print(f"🔎 Evidence collectors: {len(rubric_collectors(rubric['dimensions']))} "
+          f"(repository clone {'needed' if needs_repository(rubric['dimensions']) else 'skipped'})"
+          + (f"; no collector for {', '.join(uncovered)}" if uncovered else ""))
+    if args.profile == "judges":
+        # The judges read saved evidence, not the repository or the PDF
+        if args.manifest:
+            submissions = [dict(s, pdf_path=os.path.join(args.output_dir, s["id"], EVIDENCE_FILE)) for s in load_manifest(args.manifest)]
+        else:
+            submissions = [{"id": "single", "pdf_path": args.evidence}]
+        kind = "evidence file"
+    else:
+        submissions = load_manifest(args.manifest) if args.manifest else [{"id": "single", "repo_url": args.repo, "pdf_path": args.pdf}]
+        kind = "PDF"
+    missing = [s for s in submissions if not os.path.isfile(s["pdf_path"])]
+    for s in missing:
+        print(f"   ❌ {s['id']}: {kind} not found at {s['pdf_path']}")
+    print(f"📋 {len(submissions)} submission(s), {len(submissions) - len(missing)} ready")
+    if missing:
+        raise SystemExit(1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Automaton Auditor Swarm")
+    parser.add_argument("--repo", type=str, help="GitHub Repository URL")
+    parser.add_argument("--pdf", type=str, help="Path to the PDF report")
+    parser.add_argument("--manifest", type=str, help="Batch mode: CSV/JSONL manifest with repo_url and pdf_path columns")
+    parser.add_argument("--concurrency", type=int, default=4, help="Batch mode: number of audits to run at once")
+    parser.add_argument("--output-dir", type=str, default="audit/batch", help="Batch mode: directory for per-submission reports and the cohort summary")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Run the graph with native async nodes on a single event loop (app.ainvoke)")
+    parser.add_argument("--resume", type=str, metavar="THREAD_ID", help="Resume an interrupted single audit from its last checkpoint")
+    parser.add_argument("--dry-run", action="store_true", help="Validate the rubric, manifest and PDF paths without running an audit")
+    parser.add_argument("--stream", action="store_true", help="Single audit: report progress as nodes, evidence and opinions arrive, keeping a partial report on disk")
+    parser.add_argument("--events", type=str, metavar="PATH", help="Single audit: also write progress events as NDJSON to PATH for dashboards; implies --stream")
+    parser.add_argument("--profile", choices=GRAPH_PROFILES,
+                        help="Layers to run: full (default); detectives (collect and save evidence, no judges); "
+                             "judges (judge saved evidence). --resume keeps the profile the audit was started with")
+    parser.add_argument("--evidence", type=str, metavar="PATH",
+                        help=f"Single audit: evidence file to write (full/detectives, default {REPORT_DIR}/{EVIDENCE_FILE}) "
+                             f"or to judge (judges); batch mode uses <output-dir>/<id>/{EVIDENCE_FILE}")
+    args = parser.parse_args()
+
+    if args.resume and (args.manifest or args.repo or args.pdf):
+        parser.error("--resume takes the repo and PDF from the checkpoint; do not combine it with --repo/--pdf/--manifest")
+    if args.manifest and (args.stream or args.events):
+        parser.error("--stream/--events apply to single audits; batch mode writes per-submission reports and traces")
+    if args.manifest and args.evidence:
+        parser.error(f"batch mode keeps each submission's evidence in <output-dir>/<id>/{EVIDENCE_FILE}; drop --evidence")
+    if args.profile == "judges" and not (args.resume or args.manifest or args.evidence):
+        parser.error("--profile judges needs --evidence (or --manifest with the output dir of a detectives run)")
+    if args.profile == "judges" and (args.repo or args.pdf):
+        parser.error("--profile judges takes the repo and PDF from the evidence file; do not pass --repo/--pdf")
+    if args.profile != "judges" and not args.resume and not args.manifest and not (args.repo and args.pdf):
+        parser.error("either --manifest, --resume or both --repo and --pdf are required")
+    if args.profile == "judges" and args.evidence and not args.dry_run and not os.path.isfile(args.evidence):
+        parser.error(f"evidence file not found: {args.evidence}")
+    if args.resume:
+        # The checkpoint records the graph it was written by; resuming it on another profile's graph would misroute
+        checkpointed = saved_profile(args.resume)
+        if checkpointed and args.profile and args.profile != checkpointed:
+            parser.error(f"audit '{args.resume}' was started with --profile {checkpointed}; "
+                         f"resume it with that profile or without --profile")
+        args.profile = checkpointed or args.profile
+    args.profile = args.profile or "full"
+
+    # Load Rubric
+    rubric = load_rubric()
+
+    if args.dry_run:
+        if args.resume:
+            parser.error("--dry-run checks new submissions; it cannot be combined with --resume")
+        dry_run(args, rubric)
+    elif args.manifest:
+        run_cohort(args, rubric)
+    else:
+        run_single(args, rubric)
+
 if __name__ == "__main__":
     main()
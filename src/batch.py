@@ -0,0 +1,239 @@
+import asyncio
+import csv
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from src.evidence_file import EVIDENCE_FILE, EvidenceBundle, load_evidence, save_evidence
+from src.report import write_report
+from src.resources import audit_resources
+from src.tracing import TraceSummary, batch_trace_table, start_trace
+
+
+def load_manifest(manifest_path: str) -> List[Dict]:
+    """Loads a cohort manifest (CSV or JSONL) of repo URL + PDF path submissions."""
+    rows = []
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        if manifest_path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    submissions = []
+    seen_ids = set()
+    for i, row in enumerate(rows, start=1):
+        repo_url = (row.get("repo_url") or row.get("repo") or "").strip()
+        pdf_path = (row.get("pdf_path") or row.get("pdf") or "").strip()
+        if not repo_url or not pdf_path:
+            raise ValueError(f"Manifest entry {i} needs both a repo URL and a PDF path: {row}")
+
+        submission_id = (row.get("id") or "").strip() or _slugify(repo_url)
+        base_id, n = submission_id, 2
+        while submission_id in seen_ids:
+            submission_id = f"{base_id}-{n}"
+            n += 1
+        seen_ids.add(submission_id)
+        submissions.append({"id": submission_id, "repo_url": repo_url, "pdf_path": pdf_path})
+    return submissions
+
+
+def _slugify(repo_url: str) -> str:
+    # github.com/<owner>/<repo> -> owner-repo
+    path = re.sub(r"^[a-z]+://[^/]+/", "", repo_url.rstrip("/"))
+    path = re.sub(r"\.git$", "", path)
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", path).strip("-") or "submission"
+
+
+def build_initial_state(repo_url: str, pdf_path: str, rubric: Dict) -> Dict:
+    return {
+        "repo_url": repo_url,
+        "pdf_path": pdf_path,
+        "rubric_dimensions": rubric["dimensions"],
+        "scoring_rules": rubric.get("scoring_rules"),
+        "evidences": {},
+        "opinions": [],
+        "errors": []
+    }
+
+
+def build_judge_state(bundle: EvidenceBundle, rubric: Dict) -> Dict:
+    """Input of the "judges" graph profile: the saved evidence instead of a repository to investigate."""
+    state = build_initial_state(bundle.repo_url, bundle.pdf_path, rubric)
+    state["evidences"] = bundle.evidences
+    state["errors"] = list(bundle.errors)
+    return state
+
+
+def _submission_state(submission: Dict, rubric: Dict, output_dir: str, profile: str) -> Dict:
+    if profile == "judges":
+        return build_judge_state(load_evidence(os.path.join(output_dir, submission["id"], EVIDENCE_FILE)), rubric)
+    return build_initial_state(submission["repo_url"], submission["pdf_path"], rubric)
+
+
+def _new_result(submission: Dict) -> Dict:
+    return {
+        "id": submission["id"],
+        "repo_url": submission["repo_url"],
+        "pdf_path": submission["pdf_path"],
+        "status": "failed",
+        "overall_score": None,
+        "scores": {},
+        "report_path": None,
+        "errors": [],
+    }
+
+
+def _record_final_state(result: Dict, final_state: Dict, output_dir: str, profile: str = "full") -> None:
+    result["errors"] = list(final_state.get("errors", []))
+    if profile != "judges":
+        # Kept for every audit, so the judicial layer can be re-run without the detectives
+        result["evidence_path"] = save_evidence(final_state, os.path.join(output_dir, result["id"], EVIDENCE_FILE))
+        if profile == "detectives":
+            result["status"] = "completed_with_errors" if result["errors"] else "completed"
+    report = final_state.get("final_report")
+    if report:
+        output_file = os.path.join(output_dir, result["id"], "audit_report.md")
+        result["report_path"] = write_report(report, output_file)
+        result["overall_score"] = report.overall_score
+        result["scores"] = {c.dimension_id: c.final_score for c in report.criteria}
+        result["status"] = "completed_with_errors" if result["errors"] else "completed"
+
+
+def _record_trace(result: Dict, tracer, output_dir: str) -> None:
+    # Written for crashed audits too: the trace shows how far they got
+    if tracer is None:
+        return
+    tracer.export(os.path.join(output_dir, result["id"]))
+    result["trace"] = tracer.summary().model_dump()
+
+
+def audit_submission(app, submission: Dict, rubric: Dict, output_dir: str, profile: str = "full") -> Dict:
+    """Audits one submission into `<output_dir>/<id>/`; crashes are recorded in the result, never raised.
+
+    `profile` must be the one `app` was built with: "judges" reads the
+    evidence a "detectives" (or full) run left in `<output_dir>/<id>/`.
+    """
+    started = time.perf_counter()
+    result = _new_result(submission)
+    with start_trace(submission["id"]) as tracer, audit_resources():
+        try:
+            final_state = app.invoke(_submission_state(submission, rubric, output_dir, profile))
+            _record_final_state(result, final_state, output_dir, profile)
+        except Exception as e:
+            # One broken submission must never take the cohort down with it
+            result["errors"].append(f"Audit crashed: {str(e)}")
+    _record_trace(result, tracer, output_dir)
+    result["duration_s"] = round(time.perf_counter() - started, 2)
+    return result
+
+
+async def _aaudit_submission(app, submission: Dict, rubric: Dict, output_dir: str, limiter: asyncio.Semaphore,
+                             profile: str = "full") -> Dict:
+    async with limiter:
+        started = time.perf_counter()
+        result = _new_result(submission)
+        # Each submission runs in its own task, so its trace context is its own
+        with start_trace(submission["id"]) as tracer, audit_resources():
+            try:
+                initial_state = await asyncio.to_thread(_submission_state, submission, rubric, output_dir, profile)
+                final_state = await app.ainvoke(initial_state)
+                await asyncio.to_thread(_record_final_state, result, final_state, output_dir, profile)
+            except Exception as e:
+                result["errors"].append(f"Audit crashed: {str(e)}")
+        await asyncio.to_thread(_record_trace, result, tracer, output_dir)
+        result["duration_s"] = round(time.perf_counter() - started, 2)
+        return result
+
+
+def _report_progress(result: Dict, done: int, total: int) -> None:
+    status = "✅" if result["status"].startswith("completed") else "❌"
+    print(f"{status} [{done}/{total}] {result['id']} ({result['duration_s']}s)")
+
+
+def _finish_batch(results: List[Dict], submissions: List[Dict], rubric: Dict, output_dir: str) -> List[Dict]:
+    # Keep the summary in manifest order regardless of completion order
+    order = {s["id"]: i for i, s in enumerate(submissions)}
+    results.sort(key=lambda r: order[r["id"]])
+    write_cohort_summary(results, rubric, output_dir)
+    write_trace_summary(results, output_dir)
+    return results
+
+
+def run_batch(submissions: List[Dict], rubric: Dict, output_dir: str, concurrency: int = 4, app=None,
+              profile: str = "full") -> List[Dict]:
+    """Audits every submission through one compiled graph with bounded concurrency."""
+    if app is None:
+        from src.graph import create_auditor_graph
+        app = create_auditor_graph(profile=profile)
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = [executor.submit(audit_submission, app, s, rubric, output_dir, profile) for s in submissions]
+        for future in as_completed(futures):
+            results.append(future.result())
+            _report_progress(results[-1], len(results), len(submissions))
+    return _finish_batch(results, submissions, rubric, output_dir)
+
+
+async def arun_batch(submissions: List[Dict], rubric: Dict, output_dir: str, concurrency: int = 4, app=None,
+                     profile: str = "full") -> List[Dict]:
+    """Async variant of run_batch: every audit shares one event loop and one async graph."""
+    if app is None:
+        from src.graph import create_auditor_graph
+        app = create_auditor_graph(use_async=True, profile=profile)
+    limiter = asyncio.Semaphore(max(1, concurrency))
+    results = []
+    tasks = [_aaudit_submission(app, s, rubric, output_dir, limiter, profile) for s in submissions]
+    for next_done in asyncio.as_completed(tasks):
+        results.append(await next_done)
+        _report_progress(results[-1], len(results), len(submissions))
+    return _finish_batch(results, submissions, rubric, output_dir)
+
+
+def write_cohort_summary(results: List[Dict], rubric: Dict, output_dir: str) -> str:
+    """Writes cohort_summary.json and cohort_summary.md next to the per-submission reports."""
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "cohort_summary.json"), "w") as f:
+        json.dump(results, f, indent=2)
+
+    dim_ids = [d["id"] for d in rubric["dimensions"]]
+    completed = [r for r in results if r["status"].startswith("completed")]
+    scored = [r for r in completed if r["overall_score"] is not None]
+    summary_file = os.path.join(output_dir, "cohort_summary.md")
+    with open(summary_file, "w") as f:
+        f.write("# Cohort Audit Summary\n\n")
+        f.write(f"- Submissions: {len(results)}\n")
+        f.write(f"- Completed: {len(completed)}\n")
+        f.write(f"- Failed: {len(results) - len(completed)}\n")
+        if scored:
+            mean = sum(r["overall_score"] for r in scored) / len(scored)
+            f.write(f"- Mean Overall Score: {mean:.2f}/5\n")
+        f.write("\n| Submission | Status | Overall | " + " | ".join(dim_ids) + " |\n")
+        f.write("|" + "---|" * (3 + len(dim_ids)) + "\n")
+        for r in results:
+            overall = f"{r['overall_score']:.2f}" if r["overall_score"] is not None else "-"
+            dims = " | ".join(str(r["scores"].get(d, "-")) for d in dim_ids)
+            f.write(f"| {r['id']} | {r['status']} | {overall} | {dims} |\n")
+
+        failed = [r for r in results if r["errors"]]
+        if failed:
+            f.write("\n## Errors\n")
+            for r in failed:
+                f.write(f"\n### {r['id']}\n")
+                for error in r["errors"]:
+                    f.write(f"- {error}\n")
+    return summary_file
+
+
+def write_trace_summary(results: List[Dict], output_dir: str) -> Optional[str]:
+    """Writes trace_summary.md, aggregating the per-submission traces of a batch."""
+    summaries = {r["id"]: TraceSummary.model_validate(r["trace"]) for r in results if r.get("trace")}
+    if not summaries:
+        return None
+    os.makedirs(output_dir, exist_ok=True)
+    summary_file = os.path.join(output_dir, "trace_summary.md")
+    with open(summary_file, "w") as f:
+        f.write(batch_trace_table(summaries))
+    return summary_file
@@ -0,0 +1,97 @@
+import argparse
+import json
+import os
+from typing import Dict, List
+from dotenv import load_dotenv
+from src.benchmark.fake_llm import FakeChatModel
+from src.benchmark.fixtures import DEFAULT_FIXTURE_DIR, PRESETS, ensure_fixture
+from src.benchmark.importtime import import_reports, print_import_reports
+from src.benchmark.scenarios import (ScenarioResult, audit_scenario, batch_scenario, configure_environment,
+                                     environment_info, peak_rss_mb)
+from src.rules import load_rubric
+
+# API keys and LLM settings from .env, as in main.py
+load_dotenv()
+
+
+def _print_results(results: List[ScenarioResult], baseline: Dict[str, Dict]) -> None:
+    print("\n| Scenario | Median s | Min s | Δ vs baseline | Slowest stages | Peak py MB | Audits/min | Errors |")
+    print("|---|---|---|---|---|---|---|---|")
+    for r in results:
+        previous = baseline.get(r.key())
+        delta = "-"
+        if previous:
+            before = previous["wall_s"]["median"]
+            delta = f"{(r.wall_s.median - before) / before:+.1%}" if before else "-"
+        stages = ", ".join(f"{k} {v:.2f}" for k, v in sorted(r.stages_s.items(), key=lambda kv: -kv[1])[:3]) or "-"
+        print(f"| {r.key()} | {r.wall_s.median:.3f} | {r.wall_s.min:.3f} | {delta} | {stages} "
+              f"| {r.peak_python_mb if r.peak_python_mb is not None else '-'} "
+              f"| {r.throughput_per_min if r.throughput_per_min is not None else '-'} | {r.errors} |")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline auditor benchmarks (fake LLM, generated fixtures)")
+    parser.add_argument("--sizes", default="small,medium", help="Fixture presets to run: small, medium, large")
+    parser.add_argument("--modes", default="sync,async", help="Graph modes to run: sync, async")
+    parser.add_argument("--repeat", type=int, default=3, help="Measured runs per scenario")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured runs before each audit scenario")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake model latency per call (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniform latency per call (s)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of calls answered with a 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of calls failing with a 500")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=8, help="Submissions per batch scenario (0 = skip)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Batch scenario concurrency")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory runs")
+    parser.add_argument("--no-imports", action="store_true", help="Skip the -X importtime startup report")
+    parser.add_argument("--fixture-dir", default=None, help="Where generated fixtures are kept")
+    parser.add_argument("--output", default="audit/benchmark.json", help="JSON results file")
+    parser.add_argument("--baseline", default=None, help="Earlier results file to compare median wall times with")
+    args = parser.parse_args()
+
+    configure_environment()
+    rubric = load_rubric()
+    model = FakeChatModel(latency_s=args.latency, jitter_s=args.jitter, rate_limit_rate=args.rate_limit_rate,
+                          error_rate=args.error_rate, seed=args.seed)
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    modes = [m.strip() == "async" for m in args.modes.split(",") if m.strip()]
+    unknown = [s for s in sizes if s not in PRESETS]
+    if unknown:
+        parser.error(f"unknown fixture size(s) {unknown}; choose from {sorted(PRESETS)}")
+
+    results: List[ScenarioResult] = []
+    for size in sizes:
+        fixture = ensure_fixture(PRESETS[size], args.fixture_dir or DEFAULT_FIXTURE_DIR)
+        for use_async in modes:
+            print(f"⏱️  audit/{size}/{'async' if use_async else 'sync'}...")
+            results.append(audit_scenario(fixture, rubric, model, use_async, repeat=args.repeat,
+                                          warmup=args.warmup, measure_memory=not args.no_memory))
+            if args.batch_size > 0:
+                print(f"⏱️  batch{args.batch_size}x{args.concurrency}/{size}/{'async' if use_async else 'sync'}...")
+                results.append(batch_scenario(fixture, rubric, model, use_async,
+                                              submissions=args.batch_size, concurrency=args.concurrency))
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {f"{r['scenario']}/{r['fixture']}/{r['mode']}": r for r in json.load(f)["results"]}
+    _print_results(results, baseline)
+    imports = [] if args.no_imports else import_reports()
+    if imports:
+        print_import_reports(imports)
+
+    report = {
+        "environment": environment_info(),
+        "settings": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "peak_rss_mb": peak_rss_mb(),
+        "results": [r.model_dump() for r in results],
+        "imports": [r.model_dump() for r in imports],
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📄 Results saved to {args.output} (peak RSS {report['peak_rss_mb']} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Type
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+from src.llm.scheduler import estimate_tokens
+from src.nodes import detectives, judges, justice
+from src.state import JudicialOpinion, JudicialOpinionBatch
+
+# Judge prompts spell out the expected identifiers; the fake reads them back
+_JUDGE = re.compile(r"'judge' MUST be exactly '(\w+)'")
+_CRITERION = re.compile(r"'criterion_id': '([^'<]+)'")
+_BATCH_CRITERIA = re.compile(r"criterion_id values: ([^.]+)\.")
+
+
+class FakeProviderError(Exception):
+    """Mimics a provider SDK error closely enough for the scheduler's 429 handling."""
+
+    def __init__(self, status_code: int, retry_after_s: Optional[float] = None):
+        super().__init__(f"Fake provider error {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": f"{retry_after_s}"} if retry_after_s is not None else {}
+        self.response = type("FakeResponse", (), {"status_code": status_code, "headers": headers})()
+
+
+def _prompt_text(prompt: Any) -> str:
+    if isinstance(prompt, (list, tuple)):
+        return "\n".join(str(getattr(m, "content", m)) for m in prompt)
+    return str(prompt)
+
+
+class FakeChatModel:
+    """Deterministic stand-in for the Groq chat models used by the nodes.
+
+    Supports exactly what the gateway needs: invoke/ainvoke and
+    with_structured_output(..., include_raw=True). Every response, latency
+    and injected failure is derived from the seed, the prompt and how often
+    that prompt has been seen, so runs are reproducible whatever order the
+    concurrent calls arrive in. Rate limits (429) carry a short retry-after
+    and are retried by the scheduler; other errors surface as node errors.
+    """
+
+    model_name = "fake-llm"
+    temperature = 0
+
+    def __init__(self, latency_s: float = 0.0, jitter_s: float = 0.0, rate_limit_rate: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 0, retry_after_s: float = 0.01,
+                 schema: Optional[Type[BaseModel]] = None, _attempts: Optional[Dict[str, int]] = None,
+                 _lock: Optional[threading.Lock] = None):
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.seed = seed
+        self.retry_after_s = retry_after_s
+        self.schema = schema
+        # Shared with structured-output copies so attempts are counted per prompt
+        self._attempts = _attempts if _attempts is not None else {}
+        self._lock = _lock or threading.Lock()
+
+    def with_structured_output(self, schema: Type[BaseModel], method: Optional[str] = None, include_raw: bool = False):
+        return FakeChatModel(self.latency_s, self.jitter_s, self.rate_limit_rate, self.error_rate, self.seed,
+                             self.retry_after_s, schema, self._attempts, self._lock)
+
+    def _rng(self, text: str) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}\0{self.schema}\0{text}".encode("utf-8")).hexdigest()
+        with self._lock:
+            attempt = self._attempts.get(digest, 0)
+            self._attempts[digest] = attempt + 1
+        return random.Random(f"{digest}:{attempt}")
+
+    def _plan(self, prompt: Any):
+        """Returns (latency, response or exception) for one call."""
+        text = _prompt_text(prompt)
+        rng = self._rng(text)
+        latency = self.latency_s + rng.uniform(0, self.jitter_s)
+        roll = rng.random()
+        if roll < self.rate_limit_rate:
+            return latency, FakeProviderError(429, self.retry_after_s)
+        if roll < self.rate_limit_rate + self.error_rate:
+            return latency, FakeProviderError(500)
+        return latency, self._respond(text, rng)
+
+    def _respond(self, text: str, rng: random.Random):
+        if self.schema is None:
+            content = f"Fake analysis ({rng.randrange(10 ** 6):06d}) of a {len(text)}-character prompt."
+            return AIMessage(content=content, usage_metadata=self._usage(text, content))
+        parsed = self._parsed(text, rng)
+        content = parsed.model_dump_json()
+        return {"raw": AIMessage(content=content, usage_metadata=self._usage(text, content)),
+                "parsed": parsed, "parsing_error": None}
+
+    def _parsed(self, text: str, rng: random.Random) -> BaseModel:
+        judge = (_JUDGE.search(text) or [None, "TechLead"])[1]
+        if self.schema is JudicialOpinion:
+            criterion = (_CRITERION.search(text) or [None, "unknown"])[1]
+            return _opinion(judge, criterion, rng)
+        if self.schema is JudicialOpinionBatch:
+            ids = re.findall(r"'([^']+)'", (_BATCH_CRITERIA.search(text) or [None, ""])[1])
+            return JudicialOpinionBatch(opinions=[_opinion(judge, c, rng) for c in ids])
+        raise ValueError(f"FakeChatModel cannot produce {self.schema.__name__}")
+
+    def _usage(self, prompt_text: str, content: str) -> Dict[str, int]:
+        tokens_in, tokens_out = estimate_tokens(prompt_text), estimate_tokens(content)
+        return {"input_tokens": tokens_in, "output_tokens": tokens_out, "total_tokens": tokens_in + tokens_out}
+
+    def invoke(self, prompt: Any):
+        latency, outcome = self._plan(prompt)
+        time.sleep(latency)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def ainvoke(self, prompt: Any):
+        latency, outcome = self._plan(prompt)
+        await asyncio.sleep(latency)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _opinion(judge: str, criterion_id: str, rng: random.Random) -> JudicialOpinion:
+    return JudicialOpinion(judge=judge, criterion_id=criterion_id, score=rng.randint(1, 5),
+                           argument=f"Fake argument for {criterion_id}.", cited_evidence=[criterion_id])
+
+
+@contextmanager
+def use_fake_models(model: FakeChatModel) -> Iterator[FakeChatModel]:
+    """Routes every node's get_*_model() to `model` for the duration of the block."""
+    patched: List = [(detectives, "get_detective_model", lambda: model),
+                     (judges, "get_judge_model", lambda judge_name: model),
+                     (justice, "get_justice_model", lambda: model)]
+    originals = [(module, name, getattr(module, name)) for module, name, _ in patched]
+    for module, name, fake in patched:
+        setattr(module, name, fake)
+    try:
+        yield model
+    finally:
+        for module, name, original in originals:
+            setattr(module, name, original)
@@ -0,0 +1,271 @@
+import hashlib
+import os
+import random
+import shutil
+import subprocess
+from typing import Dict, List, Tuple
+from pydantic import BaseModel
+
+DEFAULT_FIXTURE_DIR = ".auditor_cache/bench_fixtures"
+# Fixed clock so regenerated fixtures are byte-identical (same commit hashes)
+EPOCH = 1_700_000_000
+AUTHORS = [("Ada Builder", "ada@example.com"), ("Lin Tester", "lin@example.com"), ("Sam Refactor", "sam@example.com")]
+THEORY_TERMS = ["Dialectical Synthesis", "Fan-In", "Fan-Out", "Metacognition", "State Synchronization"]
+LINES_PER_PAGE = 40
+
+
+class FixtureSpec(BaseModel):
+    name: str
+    files: int
+    commits: int
+    pdf_pages: int
+    seed: int = 0
+
+    def key(self) -> str:
+        return f"{self.name}-{hashlib.sha256(self.model_dump_json().encode()).hexdigest()[:10]}"
+
+
+class Fixture(BaseModel):
+    spec: FixtureSpec
+    repo_url: str
+    pdf_path: str
+
+
+PRESETS: Dict[str, FixtureSpec] = {
+    "small": FixtureSpec(name="small", files=25, commits=20, pdf_pages=8),
+    "medium": FixtureSpec(name="medium", files=250, commits=400, pdf_pages=60),
+    "large": FixtureSpec(name="large", files=2000, commits=4000, pdf_pages=300),
+}
+
+
+# --- Repository content ---
+
+STATE_PY = '''import operator
+from typing import Annotated, Dict, List
+from pydantic import BaseModel
+from typing_extensions import TypedDict
+
+
+class Evidence(BaseModel):
+    goal: str
+    found: bool
+    content: str
+
+
+class AgentState(TypedDict):
+    repo_url: str
+    evidences: Annotated[Dict[str, List[Evidence]], operator.ior]
+    opinions: Annotated[List[str], operator.add]
+'''
+
+GRAPH_PY = '''from langgraph.graph import StateGraph, START, END
+from src.state import AgentState
+from src.nodes import node_0, node_1, node_2
+
+
+def build_graph():
+    builder = StateGraph(AgentState)
+    builder.add_node("collector_a", node_0.run)
+    builder.add_node("collector_b", node_1.run)
+    builder.add_node("aggregator", node_2.run)
+    builder.add_edge(START, "collector_a")
+    builder.add_edge(START, "collector_b")
+    builder.add_edge(["collector_a", "collector_b"], "aggregator")
+    builder.add_edge("aggregator", END)
+    return builder.compile()
+'''
+
+TOOL_PY = '''import subprocess
+import tempfile
+
+
+def run_tool_{i}(args):
+    """Runs the helper inside a temporary sandbox directory."""
+    with tempfile.TemporaryDirectory() as sandbox:
+        return subprocess.run(["git", *args], cwd=sandbox, capture_output=True, text=True, check=False)
+'''
+
+ARCHITECTURE_MD = '''# Architecture
+
+The detectives run in parallel (Fan-Out) and meet at the aggregator (Fan-In).
+Judges apply Dialectical Synthesis; State Synchronization relies on reducers.
+
+```mermaid
+graph TD
+    START --> collector_a
+    START --> collector_b
+    collector_a --> aggregator
+    collector_b --> aggregator
+    aggregator --> END
+```
+'''
+
+
+def _module_source(path: str, revision: int) -> str:
+    name = os.path.splitext(os.path.basename(path))[0]
+    body = [f'"""Generated module {name}."""', "import os", "from typing import Dict, List", ""]
+    for r in range(revision + 1):
+        body += [
+            f"class {name.title().replace('_', '')}Step{r}:",
+            f"    def __init__(self, limit: int = {10 + r}):",
+            "        self.limit = limit",
+            "",
+            "    def apply(self, items: List[str]) -> Dict[str, int]:",
+            "        return {item: len(item) for item in items[: self.limit]}",
+            "",
+            "",
+            f"def helper_{r}(path: str) -> bool:",
+            "    return os.path.exists(path)",
+            "",
+        ]
+    return "\n".join(body) + "\n"
+
+
+def _file_paths(files: int) -> List[str]:
+    fixed = ["README.md", "Architecture.md", "pyproject.toml", "src/state.py", "src/graph.py"]
+    generated = []
+    for i in range(max(0, files - len(fixed))):
+        if i < 3:
+            generated.append(f"src/nodes/node_{i}.py")
+        elif i % 7 == 0:
+            generated.append(f"src/tools/tool_{i}.py")
+        elif i % 11 == 0:
+            generated.append(f"docs/notes_{i}.md")
+        else:
+            generated.append(f"src/pkg_{i % 13}/module_{i}.py")
+    return fixed + generated
+
+
+def _initial_content(path: str) -> str:
+    if path == "README.md":
+        return "# Fixture submission\n\nGenerated benchmark repository.\n"
+    if path == "Architecture.md":
+        return ARCHITECTURE_MD
+    if path == "pyproject.toml":
+        return '[project]\nname = "fixture"\nversion = "0.1.0"\n'
+    if path == "src/state.py":
+        return STATE_PY
+    if path == "src/graph.py":
+        return GRAPH_PY
+    if path.startswith("src/tools/"):
+        return TOOL_PY.replace("{i}", path.rsplit("_", 1)[-1][:-3])
+    if path.endswith(".md"):
+        return f"# Notes\n\nDesign notes for {path}.\n"
+    return _module_source(path, 0)
+
+
+def _fast_import_stream(spec: FixtureSpec) -> Tuple[bytes, List[str]]:
+    """A `git fast-import` stream building the whole history in one process."""
+    rng = random.Random(spec.seed)
+    paths = _file_paths(spec.files)
+    skeleton, pending = paths[:5], paths[5:]
+    revisions: Dict[str, int] = {}
+    commits = max(1, spec.commits)
+    out, when = [], EPOCH
+
+    def blob(path: str, text: str) -> None:
+        data = text.encode("utf-8")
+        out.append(f"M 100644 inline {path}\ndata {len(data)}\n".encode() + data + b"\n")
+
+    for n in range(commits):
+        # Mostly short gaps within a session, occasionally a new working day
+        when += rng.choice([rng.randint(600, 5400)] * 9 + [rng.randint(40_000, 100_000)])
+        name, email = AUTHORS[rng.randrange(len(AUTHORS))]
+        added = skeleton if n == 0 else pending[: -(-len(pending) // (commits - n))] if pending else []
+        if n > 0:
+            pending = pending[len(added):]
+        touched = [] if n == 0 or not revisions else rng.sample(sorted(revisions), min(len(revisions), rng.randint(1, 3)))
+        message = "Initial skeleton" if n == 0 else f"Step {n}: add {len(added)} files, revise {len(touched)}"
+        msg = message.encode()
+        out.append(f"commit refs/heads/main\nauthor {name} <{email}> {when} +0000\n"
+                   f"committer {name} <{email}> {when} +0000\ndata {len(msg)}\n".encode() + msg + b"\n")
+        for path in added:
+            revisions[path] = 0
+            blob(path, _initial_content(path))
+        for path in touched:
+            if path.endswith(".py") and "/pkg_" in path:
+                revisions[path] += 1
+                blob(path, _module_source(path, revisions[path]))
+        out.append(b"\n")
+    # Whatever did not fit in the commit budget lands in the last commit
+    if pending:
+        msg = b"Add remaining files"
+        out.append(f"commit refs/heads/main\nauthor {AUTHORS[0][0]} <{AUTHORS[0][1]}> {when + 60} +0000\n"
+                   f"committer {AUTHORS[0][0]} <{AUTHORS[0][1]}> {when + 60} +0000\ndata {len(msg)}\n".encode() + msg + b"\n")
+        for path in pending:
+            blob(path, _initial_content(path))
+        out.append(b"\n")
+    return b"".join(out), paths
+
+
+def build_repo(spec: FixtureSpec, repo_dir: str) -> List[str]:
+    """Creates a bare repository with the spec's history; returns its file list."""
+    stream, paths = _fast_import_stream(spec)
+    subprocess.run(["git", "init", "--bare", "-q", "-b", "main", repo_dir], check=True)
+    subprocess.run(["git", "-C", repo_dir, "fast-import", "--quiet"], input=stream, check=True)
+    # Partial-clone strategies need filter support from the "server"
+    for key in ("uploadpack.allowFilter", "uploadpack.allowAnySHA1InWant"):
+        subprocess.run(["git", "-C", repo_dir, "config", key, "true"], check=True)
+    return paths
+
+
+# --- Report PDF ---
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _report_lines(spec: FixtureSpec, paths: List[str]) -> List[str]:
+    rng = random.Random(spec.seed + 1)
+    py_paths = [p for p in paths if p.endswith(".py")]
+    lines = []
+    for i in range(spec.pdf_pages * LINES_PER_PAGE):
+        roll = rng.random()
+        if roll < 0.05:
+            lines.append(f"Section {i}: the design relies on {rng.choice(THEORY_TERMS)} between the agents.")
+        elif roll < 0.10:
+            lines.append(f"The implementation lives in {rng.choice(py_paths)} and is covered by the graph.")
+        elif roll < 0.12:
+            # Claims the report makes about files that do not exist
+            lines.append(f"See src/legacy/removed_{rng.randrange(1000)}.py for the earlier approach.")
+        else:
+            lines.append(f"Paragraph {i} discusses trade-offs, measurements and follow-up work in plain prose.")
+    return lines
+
+
+def write_report_pdf(pdf_path: str, pages: List[List[str]]) -> None:
+    """Writes a minimal text-only PDF with one Helvetica text block per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>",
+               "<< /Type /Pages /Kids [" + " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages)))
+               + f"] /Count {len(pages)} >>",
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    for i, lines in enumerate(pages):
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>")
+        text = " T* ".join(f"({_pdf_escape(line)}) Tj" for line in lines)
+        stream = f"BT /F1 9 Tf 12 TL 40 760 Td {text} ET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+    body, offsets = "%PDF-1.4\n", []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body.encode("latin-1")))
+        body += f"{number} 0 obj\n{obj}\nendobj\n"
+    xref = len(body.encode("latin-1"))
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n" + "".join(f"{o:010d} 00000 n \n" for o in offsets)
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    with open(pdf_path, "wb") as f:
+        f.write(body.encode("latin-1"))
+
+
+def ensure_fixture(spec: FixtureSpec, root: str = DEFAULT_FIXTURE_DIR) -> Fixture:
+    """Builds the fixture once; later runs reuse it, so every run audits identical inputs."""
+    fixture_dir = os.path.abspath(os.path.join(root, spec.key()))
+    repo_dir, pdf_path = os.path.join(fixture_dir, "repo.git"), os.path.join(fixture_dir, "report.pdf")
+    done_marker = os.path.join(fixture_dir, ".complete")
+    if not os.path.exists(done_marker):
+        shutil.rmtree(fixture_dir, ignore_errors=True)
+        os.makedirs(fixture_dir)
+        paths = build_repo(spec, repo_dir)
+        lines = _report_lines(spec, paths)
+        write_report_pdf(pdf_path, [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)])
+        open(done_marker, "w").close()
+    return Fixture(spec=spec, repo_url=f"file://{repo_dir}", pdf_path=pdf_path)
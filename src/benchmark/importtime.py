@@ -0,0 +1,68 @@
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List
+from pydantic import BaseModel, Field
+
+# Commands whose startup the CLI should keep cheap, and the full graph for comparison
+IMPORT_COMMANDS = {
+    "main --help": ["main.py", "--help"],
+    "worker --help": ["-m", "src.worker", "--help"],
+    "import src.graph": ["-c", "import src.graph"],
+}
+# "import time: self [us] | cumulative | imported package" lines written by -X importtime
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+HEAVY_PACKAGES = ("langgraph", "langchain_core", "langchain_groq", "langchain_xai", "langsmith", "pypdf", "git",
+                  "groq", "httpx", "aiosqlite")
+
+
+class ImportReport(BaseModel):
+    command: str
+    wall_s: float
+    imports_s: float = Field(description="Cumulative time of the top-level imports")
+    modules: int
+    heavy: Dict[str, float] = Field(default_factory=dict, description="Heavy package -> seconds spent in its modules")
+    slowest: List[str] = Field(default_factory=list, description="Top-level imports by cumulative time")
+
+
+def parse_importtime(stderr: str) -> List[tuple]:
+    """(module, depth, self seconds, cumulative seconds) per line of -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            rows.append((module, (len(indent) - 1) // 2, int(own) / 1e6, int(cumulative) / 1e6))
+    return rows
+
+
+def import_report(name: str, args: List[str], top: int = 5) -> ImportReport:
+    """Runs one command under `python -X importtime` in a fresh interpreter."""
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", *args], capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    rows = parse_importtime(completed.stderr)
+    top_level = [r for r in rows if r[1] == 0]
+    heavy: Dict[str, float] = {}
+    for module, _, own, _ in rows:
+        package = module.split(".")[0]
+        if package in HEAVY_PACKAGES:
+            heavy[package] = heavy.get(package, 0.0) + own
+    return ImportReport(
+        command=name, wall_s=round(wall, 3), imports_s=round(sum(r[3] for r in top_level), 3), modules=len(rows),
+        heavy={k: round(v, 3) for k, v in heavy.items()},
+        slowest=[f"{m} {c:.3f}s" for m, _, _, c in sorted(top_level, key=lambda r: -r[3])[:top]],
+    )
+
+
+def import_reports() -> List[ImportReport]:
+    return [import_report(name, args) for name, args in IMPORT_COMMANDS.items()]
+
+
+def print_import_reports(reports: List[ImportReport]) -> None:
+    print("\n| Command | Wall s | Imports s | Modules | Heavy packages loaded | Slowest top-level imports |")
+    print("|---|---|---|---|---|---|")
+    for r in reports:
+        heavy = ", ".join(f"{k} {v:.2f}" for k, v in sorted(r.heavy.items(), key=lambda kv: -kv[1])) or "none"
+        print(f"| {r.command} | {r.wall_s:.3f} | {r.imports_s:.3f} | {r.modules} | {heavy} | {', '.join(r.slowest)} |")
@@ -0,0 +1,160 @@
+import asyncio
+import contextlib
+import io
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field
+from src.batch import arun_batch, build_initial_state, run_batch
+from src.benchmark.fake_llm import FakeChatModel, use_fake_models
+from src.benchmark.fixtures import Fixture
+from src.graph import create_auditor_graph
+from src.resources import audit_resources
+from src.tools.doc_tools import clear_memory_cache
+from src.tracing import TraceSummary, start_trace
+
+# Every run starts cold and unthrottled: nothing is reused between runs and the
+# fake model is never rate limited by the client-side scheduler.
+BENCHMARK_ENV = {
+    "LLM_CACHE": "off",
+    "AUDITOR_INCREMENTAL": "off",
+    "PDF_TEXT_CACHE": "off",
+    "AUDITOR_CHECKPOINTS": "off",
+    "AUDITOR_TRACE": "on",
+    "LLM_REQUESTS_PER_MINUTE": "1000000000",
+    "LLM_TOKENS_PER_MINUTE": "1000000000000",
+}
+
+
+class Stats(BaseModel):
+    median: float
+    min: float
+    max: float
+
+    @classmethod
+    def of(cls, values: List[float]) -> "Stats":
+        return cls(median=round(statistics.median(values), 4), min=round(min(values), 4), max=round(max(values), 4))
+
+
+class ScenarioResult(BaseModel):
+    scenario: str
+    fixture: str
+    mode: str
+    runs: int
+    wall_s: Stats
+    stages_s: Dict[str, float] = Field(default_factory=dict, description="Median wall time per graph node")
+    tools_s: Dict[str, float] = Field(default_factory=dict, description="Median time per tool span")
+    llm_calls: int = 0
+    errors: int = 0
+    peak_python_mb: Optional[float] = Field(default=None, description="tracemalloc peak of one extra run")
+    throughput_per_min: Optional[float] = Field(default=None, description="Batch scenarios: audits per minute")
+
+    def key(self) -> str:
+        return f"{self.scenario}/{self.fixture}/{self.mode}"
+
+
+def configure_environment() -> None:
+    """Applies BENCHMARK_ENV; must run before the first model call creates the scheduler."""
+    os.environ.update(BENCHMARK_ENV)
+
+
+def environment_info() -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True).stdout.strip())
+    except OSError:
+        commit, dirty = None, None
+    return {
+        "commit": commit,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "workers": os.getenv("AUDITOR_WORKERS", "0"),
+        "clone_strategy": os.getenv("AUDITOR_CLONE_STRATEGY", "sparse"),
+    }
+
+
+def _median_by_key(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    keys = sorted({k for sample in samples for k in sample})
+    return {k: round(statistics.median(sample.get(k, 0.0) for sample in samples), 4) for k in keys}
+
+
+def _run_audit(app, fixture: Fixture, rubric: Dict, use_async: bool) -> Tuple[TraceSummary, int]:
+    """One cold audit; returns its trace summary and the number of errors in the final state."""
+    clear_memory_cache()
+    state = build_initial_state(fixture.repo_url, fixture.pdf_path, rubric)
+    with start_trace(fixture.spec.name) as tracer, audit_resources(), contextlib.redirect_stdout(io.StringIO()):
+        final_state = asyncio.run(app.ainvoke(state)) if use_async else app.invoke(state)
+    return tracer.summary(), len(final_state.get("errors", []))
+
+
+def audit_scenario(fixture: Fixture, rubric: Dict, model: FakeChatModel, use_async: bool,
+                   repeat: int = 3, warmup: int = 1, measure_memory: bool = True) -> ScenarioResult:
+    """End-to-end latency of one audit, with per-stage medians from the trace."""
+    app = create_auditor_graph(use_async=use_async)
+    walls, summaries, errors = [], [], 0
+    with use_fake_models(model):
+        for i in range(warmup + repeat):
+            started = time.perf_counter()
+            summary, errors = _run_audit(app, fixture, rubric, use_async)
+            if i >= warmup:
+                walls.append(time.perf_counter() - started)
+                summaries.append(summary)
+        peak = None
+        if measure_memory:
+            # Separate run: tracemalloc slows allocation-heavy code down
+            tracemalloc.start()
+            try:
+                _run_audit(app, fixture, rubric, use_async)
+                peak = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+            finally:
+                tracemalloc.stop()
+    return ScenarioResult(
+        scenario="audit", fixture=fixture.spec.name, mode="async" if use_async else "sync", runs=repeat,
+        wall_s=Stats.of(walls),
+        stages_s=_median_by_key([{n: s.wall_s for n, s in summary.nodes.items()} for summary in summaries]),
+        tools_s=_median_by_key([summary.totals.tools for summary in summaries]),
+        llm_calls=summaries[-1].totals.llm_calls,
+        errors=errors,
+        peak_python_mb=peak,
+    )
+
+
+def batch_scenario(fixture: Fixture, rubric: Dict, model: FakeChatModel, use_async: bool,
+                   submissions: int = 8, concurrency: int = 4, repeat: int = 1) -> ScenarioResult:
+    """Cohort throughput: `submissions` audits of the fixture through one batch run."""
+    cohort = [{"id": f"{fixture.spec.name}-{i}", "repo_url": fixture.repo_url, "pdf_path": fixture.pdf_path}
+              for i in range(submissions)]
+    walls, errors = [], 0
+    with use_fake_models(model), tempfile.TemporaryDirectory() as output_dir:
+        for _ in range(repeat):
+            clear_memory_cache()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                if use_async:
+                    results = asyncio.run(arun_batch(cohort, rubric, output_dir, concurrency=concurrency))
+                else:
+                    results = run_batch(cohort, rubric, output_dir, concurrency=concurrency)
+            walls.append(time.perf_counter() - started)
+            errors = sum(len(r["errors"]) for r in results)
+    wall = Stats.of(walls)
+    return ScenarioResult(
+        scenario=f"batch{submissions}x{concurrency}", fixture=fixture.spec.name,
+        mode="async" if use_async else "sync", runs=repeat, wall_s=wall, errors=errors,
+        throughput_per_min=round(submissions / wall.median * 60, 2),
+    )
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process and of its finished children (Linux reports KiB)."""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(own, children) / 1024, 1)
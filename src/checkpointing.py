@@ -0,0 +1,86 @@
+import os
+import sqlite3
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Iterator, Optional
+
+# The savers pull in LangGraph; they are imported when a checkpointer is opened
+if TYPE_CHECKING:
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+DEFAULT_CHECKPOINT_PATH = ".auditor_cache/checkpoints.sqlite"
+
+# State types a checkpoint may contain; anything else is refused on load
+CHECKPOINT_TYPES = [
+    ("src.state", "Evidence"),
+    ("src.state", "JudicialOpinion"),
+    ("src.state", "CriterionResult"),
+    ("src.state", "AuditReport"),
+    ("src.tools.repo_index", "RepoIndex"),
+    ("src.tools.repo_index", "IndexedFile"),
+]
+
+
+def checkpoint_path() -> Optional[str]:
+    """SQLite file holding audit checkpoints, or None when AUDITOR_CHECKPOINTS=off."""
+    if os.getenv("AUDITOR_CHECKPOINTS", "on").lower() in ("off", "0", "false"):
+        return None
+    path = os.getenv("AUDITOR_CHECKPOINT_PATH", DEFAULT_CHECKPOINT_PATH)
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def new_thread_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def thread_config(thread_id: str, profile: Optional[str] = None) -> Dict:
+    config: Dict = {"configurable": {"thread_id": thread_id}}
+    if profile is not None:
+        # Written into every checkpoint's metadata, so a resume rebuilds the same graph
+        config["metadata"] = {"profile": profile}
+    return config
+
+
+def saved_profile(thread_id: str) -> Optional[str]:
+    """Graph profile of a thread's latest checkpoint; None without one (or with checkpoints off)."""
+    with sqlite_checkpointer() as checkpointer:
+        saved = checkpointer.get_tuple(thread_config(thread_id)) if checkpointer else None
+    return saved.metadata.get("profile") if saved else None
+
+
+def _serde() -> "JsonPlusSerializer":
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    return JsonPlusSerializer(allowed_msgpack_modules=CHECKPOINT_TYPES)
+
+
+@contextmanager
+def sqlite_checkpointer() -> Iterator[Optional["SqliteSaver"]]:
+    """Durable checkpointer for app.invoke; yields None when checkpoints are disabled."""
+    path = checkpoint_path()
+    if path is None:
+        yield None
+        return
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    # The sync graph runs parallel nodes on worker threads; the saver serializes access
+    conn = sqlite3.connect(path, check_same_thread=False)
+    try:
+        yield SqliteSaver(conn, serde=_serde())
+    finally:
+        conn.close()
+
+
+@asynccontextmanager
+async def async_sqlite_checkpointer() -> AsyncIterator[Optional["AsyncSqliteSaver"]]:
+    """Durable checkpointer for app.ainvoke; must be entered on the running event loop."""
+    path = checkpoint_path()
+    if path is None:
+        yield None
+        return
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    async with aiosqlite.connect(path) as conn:
+        yield AsyncSqliteSaver(conn, serde=_serde())
@@ -0,0 +1,51 @@
+from typing import Dict, List, Literal, Optional, Tuple
+from pydantic import BaseModel, Field
+
+# Which evidence each rubric dimension needs, and what producing it costs.
+# The detective nodes run only the collectors of the loaded rubric's
+# dimensions, and the repository is cloned only when one of them reads it;
+# the implementations live in src/nodes/detectives.py.
+
+Detective = Literal["repo_investigator", "doc_analyst", "vision_inspector"]
+CollectorInput = Literal["repo_index", "git_log", "pdf_text", "architecture_doc", "llm"]
+# Inputs that only exist once the submission has been cloned and indexed
+REPO_INPUTS = ("repo_index", "git_log", "architecture_doc")
+
+
+class Collector(BaseModel):
+    criterion_id: str
+    detective: Detective
+    inputs: Tuple[CollectorInput, ...]
+    optional_inputs: Tuple[CollectorInput, ...] = Field(
+        default=(), description="Used when another collector already paid for them; never the reason to clone")
+
+
+COLLECTORS: Dict[str, Collector] = {c.criterion_id: c for c in [
+    Collector(criterion_id="git_forensic_analysis", detective="repo_investigator", inputs=("git_log",)),
+    Collector(criterion_id="state_management_rigor", detective="repo_investigator", inputs=("repo_index",)),
+    Collector(criterion_id="graph_orchestration", detective="repo_investigator", inputs=("repo_index",)),
+    Collector(criterion_id="safe_tool_engineering", detective="repo_investigator", inputs=("repo_index", "llm")),
+    Collector(criterion_id="structured_output_enforcement", detective="repo_investigator", inputs=("repo_index",)),
+    Collector(criterion_id="judicial_nuance", detective="repo_investigator", inputs=("repo_index",)),
+    Collector(criterion_id="chief_justice_synthesis", detective="repo_investigator", inputs=("repo_index",)),
+    Collector(criterion_id="theoretical_depth", detective="doc_analyst", inputs=("pdf_text",),
+              optional_inputs=("architecture_doc",)),
+    # Path mentions are verified against the repository index after the detective fan-in
+    Collector(criterion_id="report_accuracy", detective="doc_analyst", inputs=("pdf_text", "repo_index")),
+    Collector(criterion_id="swarm_visual", detective="vision_inspector", inputs=("architecture_doc", "llm")),
+]}
+
+
+def rubric_collectors(dimensions: Optional[List[Dict]], detective: Optional[Detective] = None) -> Dict[str, Collector]:
+    """Collectors for the rubric's dimensions (optionally of one detective), in rubric order."""
+    needed = [COLLECTORS[d["id"]] for d in dimensions or [] if d["id"] in COLLECTORS]
+    return {c.criterion_id: c for c in needed if detective is None or c.detective == detective}
+
+
+def needs_repository(dimensions: Optional[List[Dict]]) -> bool:
+    return any(set(c.inputs) & set(REPO_INPUTS) for c in rubric_collectors(dimensions).values())
+
+
+def uncovered_criteria(dimensions: Optional[List[Dict]]) -> List[str]:
+    """Rubric dimensions no collector gathers evidence for; the judges see them without evidence."""
+    return [d["id"] for d in dimensions or [] if d["id"] not in COLLECTORS]
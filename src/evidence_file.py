@@ -0,0 +1,56 @@
+import gzip
+import json
+import os
+import time
+from typing import Dict, List
+from pydantic import BaseModel, Field
+from src.state import Evidence
+
+# On-disk hand-off between the detective and judicial layers (--profile). The
+# detectives' merged evidence is written once, gzipped JSON without empty
+# fields, and the judges can be run on it later, again or in a separate batch.
+
+# Graph layers to run: "detectives" stops after the evidence fan-in (no
+# judicial model calls), "judges" starts from evidence loaded from disk
+GRAPH_PROFILES = ("full", "detectives", "judges")
+EVIDENCE_FORMAT_VERSION = 1
+EVIDENCE_FILE = "evidence.json.gz"
+
+
+class EvidenceBundle(BaseModel):
+    version: int = EVIDENCE_FORMAT_VERSION
+    repo_url: str
+    pdf_path: str
+    created_at: float = Field(default_factory=time.time)
+    evidences: Dict[str, List[Evidence]]
+    errors: List[str] = Field(default_factory=list, description="Detective errors, carried into the final report")
+
+
+def save_evidence(state: Dict, path: str) -> str:
+    """Writes the evidence of a finished detective layer; gzipped unless the path does not end in .gz."""
+    bundle = EvidenceBundle(repo_url=state["repo_url"], pdf_path=state["pdf_path"],
+                            evidences=state.get("evidences") or {}, errors=list(state.get("errors") or []))
+    data = bundle.model_dump_json(exclude_none=True).encode("utf-8")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(gzip.compress(data) if path.endswith(".gz") else data)
+    os.replace(tmp, path)
+    return path
+
+
+def load_evidence(path: str) -> EvidenceBundle:
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    raw = json.loads(data)
+    if raw.get("version") != EVIDENCE_FORMAT_VERSION:
+        raise ValueError(f"{path} is evidence format version {raw.get('version')}, "
+                         f"expected {EVIDENCE_FORMAT_VERSION}; collect the evidence again")
+    return EvidenceBundle.model_validate(raw)
+
+
+def evidence_summary(evidences: Dict[str, List[Evidence]]) -> str:
+    items = [e for group in evidences.values() for e in group]
+    return f"{len(evidences)} criteria, {sum(e.found for e in items)}/{len(items)} evidence found"
@@ -1,50 +1,72 @@
 from langgraph.graph import StateGraph, START, END
 from src.state import AgentState
-from src.nodes.detectives import repo_investigator_node, doc_analyst_node, vision_inspector_node, evidence_aggregator_node
-from src.nodes.judges import prosecutor_node, defense_node, tech_lead_node
-from src.nodes.justice import chief_justice_node
+from src.nodes import detectives, judges, justice
+from src.evidence_file import GRAPH_PROFILES
+from src.tracing import trace_node
 
-def create_auditor_graph():
+def create_auditor_graph(use_async: bool = False, checkpointer=None, profile: str = "full"):
+    """Builds the auditor graph. With use_async the nodes await their model calls,
+    so the graph must be run with app.ainvoke/app.astream. With a checkpointer
+    every super-step is persisted per thread_id, so an interrupted audit can be
+    resumed by invoking the graph with None as input. Every node records a span
+    in the current audit trace (see src.tracing). `profile` selects the layers
+    to run (GRAPH_PROFILES); a resumed audit needs the profile it started with."""
+    if profile not in GRAPH_PROFILES:
+        raise ValueError(f"Unknown graph profile '{profile}' (expected one of {', '.join(GRAPH_PROFILES)})")
+    detectives_layer = profile in ("full", "detectives")
+    judicial_layer = profile in ("full", "judges")
     builder = StateGraph(AgentState)
+
+    def add_node(name, sync_node, async_node=None):
+        builder.add_node(name, trace_node(name, async_node if use_async and async_node else sync_node))
     
-    # Add Detective Nodes
-    builder.add_node("repo_investigator", repo_investigator_node)
-    builder.add_node("doc_analyst", doc_analyst_node)
-    builder.add_node("vision_inspector", vision_inspector_node)
-    builder.add_node("evidence_aggregator", evidence_aggregator_node)
-    
-    # Add Judicial Nodes
-    builder.add_node("prosecutor", prosecutor_node)
-    builder.add_node("defense", defense_node)
-    builder.add_node("tech_lead", tech_lead_node)
-    
-    # Add Synthesis Node
-    builder.add_node("chief_justice", chief_justice_node)
-    
-    # --- Detective Fan-Out ---
-    builder.add_edge(START, "repo_investigator")
-    builder.add_edge(START, "doc_analyst")
-    builder.add_edge(START, "vision_inspector")
-    
-    # --- Detective Fan-In ---
-    builder.add_edge("repo_investigator", "evidence_aggregator")
-    builder.add_edge("doc_analyst", "evidence_aggregator")
-    builder.add_edge("vision_inspector", "evidence_aggregator")
-    
-    # --- Judicial Fan-Out ---
-    builder.add_edge("evidence_aggregator", "prosecutor")
-    builder.add_edge("evidence_aggregator", "defense")
-    builder.add_edge("evidence_aggregator", "tech_lead")
-    
-    # --- Judicial Fan-In ---
-    builder.add_edge("prosecutor", "chief_justice")
-    builder.add_edge("defense", "chief_justice")
-    builder.add_edge("tech_lead", "chief_justice")
-    
-    # --- Final Conclusion ---
-    builder.add_edge("chief_justice", END)
-    
-    return builder.compile()
+    if detectives_layer:
+        # Add Repository Indexer (clone + single-pass index shared by the detectives)
+        add_node("repo_indexer", detectives.repo_indexer_node, detectives.arepo_indexer_node)
+
+        # Add Detective Nodes
+        add_node("repo_investigator", detectives.repo_investigator_node, detectives.arepo_investigator_node)
+        add_node("doc_analyst", detectives.doc_analyst_node, detectives.adoc_analyst_node)
+        add_node("vision_inspector", detectives.vision_inspector_node, detectives.avision_inspector_node)
+        add_node("evidence_aggregator", detectives.evidence_aggregator_node)
+
+        # --- Repository Indexing ---
+        builder.add_edge(START, "repo_indexer")
+
+        # --- Detective Fan-Out ---
+        builder.add_edge("repo_indexer", "repo_investigator")
+        builder.add_edge("repo_indexer", "doc_analyst")
+        builder.add_edge("repo_indexer", "vision_inspector")
+
+        # --- Detective Fan-In ---
+        builder.add_edge(["repo_investigator", "doc_analyst", "vision_inspector"], "evidence_aggregator")
+        if not judicial_layer:
+            builder.add_edge("evidence_aggregator", END)
+
+    if judicial_layer:
+        # Add Judicial Nodes
+        add_node("prosecutor", judges.prosecutor_node, judges.aprosecutor_node)
+        add_node("defense", judges.defense_node, judges.adefense_node)
+        add_node("tech_lead", judges.tech_lead_node, judges.atech_lead_node)
+
+        # Add Synthesis Node
+        add_node("chief_justice", justice.chief_justice_node, justice.achief_justice_node)
+
+        # --- Judicial Fan-Out ---
+        judicial_entry = "evidence_aggregator" if detectives_layer else START
+        builder.add_edge(judicial_entry, "prosecutor")
+        builder.add_edge(judicial_entry, "defense")
+        builder.add_edge(judicial_entry, "tech_lead")
+
+        # --- Judicial Fan-In ---
+        builder.add_edge("prosecutor", "chief_justice")
+        builder.add_edge("defense", "chief_justice")
+        builder.add_edge("tech_lead", "chief_justice")
+
+        # --- Final Conclusion ---
+        builder.add_edge("chief_justice", END)
+
+    return builder.compile(checkpointer=checkpointer)
 
 # For demonstration or CLI usage
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from src.checkpointing import new_thread_id
+
+DEFAULT_JOBS_PATH = ".auditor_cache/jobs.sqlite"
+JOB_STATUSES = ("queued", "running", "completed", "failed")
+# A running job belongs to its worker until the lease runs out; workers renew
+# the leases of their jobs well before that (see AuditWorker)
+DEFAULT_LEASE_S = 60.0
+# Claims per job: a job whose worker keeps dying under it is failed instead
+DEFAULT_MAX_ATTEMPTS = 3
+# Columns added after the first release, for queue files created before them
+_MIGRATIONS = {"worker_id": "TEXT", "lease_expires_at": "REAL"}
+
+
+def jobs_path() -> str:
+    return os.getenv("AUDITOR_JOBS_PATH", DEFAULT_JOBS_PATH)
+
+
+def _row_to_job(row: sqlite3.Row) -> Dict:
+    job = dict(row)
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+class JobQueue:
+    """Durable audit job queue in SQLite, shared by the worker and anything submitting jobs.
+
+    Jobs move queued -> running -> completed/failed. Claiming is a single
+    UPDATE, so several worker threads (or processes) never take the same job.
+    A claimed job records its worker and a lease the worker keeps renewing;
+    jobs whose lease ran out (their worker died) are queued again, or failed
+    once they have been claimed `max_attempts` times.
+    """
+
+    def __init__(self, path: Optional[str] = None, lease_s: float = DEFAULT_LEASE_S,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = path or jobs_path()
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, label TEXT, repo_url TEXT NOT NULL, pdf_path TEXT NOT NULL, "
+            "status TEXT NOT NULL, submitted_at REAL NOT NULL, started_at REAL, finished_at REAL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT, worker_id TEXT, lease_expires_at REAL)"
+        )
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in _MIGRATIONS.items():
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, submitted_at)")
+        self._conn.commit()
+
+    def submit(self, repo_url: str, pdf_path: str, label: Optional[str] = None) -> str:
+        job_id = new_thread_id()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, label, repo_url, pdf_path, status, submitted_at) VALUES (?, ?, ?, ?, 'queued', ?)",
+                (job_id, label, repo_url, pdf_path, time.time()),
+            )
+            self._conn.commit()
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """Marks the oldest queued job running under `worker_id`'s lease and returns it (None when the queue is empty)."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1, "
+                "worker_id = ?, lease_expires_at = ? "
+                "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY submitted_at LIMIT 1) "
+                "RETURNING *",
+                (now, worker_id, now + self.lease_s),
+            ).fetchone()
+            self._conn.commit()
+        return _row_to_job(row) if row is not None else None
+
+    def heartbeat(self, worker_id: str) -> int:
+        """Renews the leases of every job `worker_id` is running; returns how many it still holds."""
+        with self._lock:
+            count = self._conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE status = 'running' AND worker_id = ?",
+                (time.time() + self.lease_s, worker_id),
+            ).rowcount
+            self._conn.commit()
+        return count
+
+    def finish(self, job_id: str, result: Dict, worker_id: Optional[str] = None) -> bool:
+        """Stores an audit result; the job fails when the audit did not produce a report.
+
+        With `worker_id`, the result is only stored while that worker still
+        holds the job: once its lease ran out the job may be someone else's.
+        """
+        status = "completed" if result.get("status", "").startswith("completed") else "failed"
+        query = "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ?, lease_expires_at = NULL WHERE id = ?"
+        params = (status, time.time(), json.dumps(result, default=str), "; ".join(result.get("errors", [])) or None, job_id)
+        if worker_id is not None:
+            query, params = query + " AND status = 'running' AND worker_id = ?", (*params, worker_id)
+        with self._lock:
+            count = self._conn.execute(query, params).rowcount
+            self._conn.commit()
+        return count > 0
+
+    def requeue_expired(self) -> Tuple[int, int]:
+        """Queues running jobs whose lease ran out again; returns (requeued, failed).
+
+        A job already claimed `max_attempts` times is failed instead, so one
+        that kills its worker cannot take every worker down in turn. Jobs
+        from before leases existed have none and count as expired.
+        """
+        now = time.time()
+        expired = "status = 'running' AND (lease_expires_at IS NULL OR lease_expires_at < ?)"
+        with self._lock:
+            failed = self._conn.execute(
+                f"UPDATE jobs SET status = 'failed', finished_at = ?, lease_expires_at = NULL, "
+                f"error = 'Gave up after ' || attempts || ' attempts: the worker stopped mid-audit' "
+                f"WHERE {expired} AND attempts >= ?",
+                (now, now, self.max_attempts),
+            ).rowcount
+            requeued = self._conn.execute(
+                f"UPDATE jobs SET status = 'queued', started_at = NULL, worker_id = NULL, lease_expires_at = NULL "
+                f"WHERE {expired}",
+                (now,),
+            ).rowcount
+            self._conn.commit()
+        return requeued, failed
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row is not None else None
+
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """Most recent jobs first, without their (large) results."""
+        query = ("SELECT id, label, repo_url, status, submitted_at, started_at, finished_at, attempts, error, worker_id "
+                 "FROM jobs")
+        params: tuple = ()
+        if status:
+            query, params = query + " WHERE status = ?", (status,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY submitted_at DESC LIMIT ?", (*params, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: 0 for status in JOB_STATUSES} | {row[0]: row[1] for row in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
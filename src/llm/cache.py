@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Type
+from pydantic import BaseModel
+
+DEFAULT_CACHE_PATH = ".auditor_cache/llm_cache.sqlite"
+DEFAULT_MAX_ENTRIES = 50000
+DEFAULT_MAX_AGE_DAYS = 30
+# Eviction runs on every Nth write rather than on every write
+EVICT_EVERY = 100
+# A hit refreshes the entry's LRU timestamp only when it is older than this, so
+# repeated hits on a warm entry cost a read and no write/commit
+ACCESS_REFRESH_S = 600
+
+
+def model_identity(model) -> Dict:
+    """The parts of a chat model's configuration that change its output."""
+    return {
+        "class": type(model).__name__,
+        "model": getattr(model, "model_name", None) or getattr(model, "model", None),
+        "temperature": getattr(model, "temperature", None),
+    }
+
+
+def _serialize_prompt(prompt: Any) -> Any:
+    if isinstance(prompt, str):
+        return prompt
+    if isinstance(prompt, (list, tuple)):
+        return [[getattr(m, "type", "text"), getattr(m, "content", str(m))] for m in prompt]
+    return str(prompt)
+
+
+def cache_key(model, prompt: Any, schema: Optional[Type[BaseModel]] = None, provider: Optional[str] = None) -> str:
+    """Content address of a call: provider + model identity + prompt + output schema."""
+    payload = {
+        "provider": provider,
+        "model": model_identity(model),
+        "prompt": _serialize_prompt(prompt),
+        "schema": schema.model_json_schema() if schema is not None else None,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Persistent SQLite cache of model responses with size/age eviction."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_age_seconds: float = DEFAULT_MAX_AGE_DAYS * 86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_first([key])
+
+    def get_first(self, keys: List[str]) -> Optional[str]:
+        """The fresh value of the first key that has one; a single hit or miss however many keys are tried."""
+        now = time.time()
+        with self._lock:
+            rows = {
+                row[0]: row[1:] for row in self._conn.execute(
+                    f"SELECT key, value, created_at, accessed_at FROM responses WHERE key IN ({','.join('?' * len(keys))})",
+                    keys,
+                )
+            }
+            for key in keys:
+                row = rows.get(key)
+                if row is None or now - row[1] > self.max_age_seconds:
+                    continue
+                if now - row[2] > ACCESS_REFRESH_S:
+                    self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                    self._conn.commit()
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._writes += 1
+            if self._writes % EVICT_EVERY == 0:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.max_age_seconds,))
+        # Least recently used entries go first once the cache is over size
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": entries,
+        }
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[LLMCache]:
+    """Returns the process-wide response cache, or None when LLM_CACHE=off."""
+    global _cache
+    if os.getenv("LLM_CACHE", "on").lower() in ("off", "0", "false"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache(
+                path=os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+                max_age_seconds=float(os.getenv("LLM_CACHE_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS)) * 86400,
+            )
+        return _cache
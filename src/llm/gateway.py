@@ -0,0 +1,141 @@
+import asyncio
+from typing import Any, Dict, Optional, Tuple, Type
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+from src import tracing
+from src.llm.cache import cache_key, get_cache
+from src.llm.router import ModelCandidate, arun_route, as_route, run_route
+from src.llm.scheduler import Priority, estimate_tokens, get_scheduler
+
+# Single entry point for every model call made by the graph nodes. Callers pass
+# a model route (or a raw chat model); structured output is bound here so that
+# token usage can still be read from the raw response. Responses are looked up
+# in the content-addressed cache before a call is even queued with the
+# provider's scheduler, and the router fails over or hedges across providers.
+# Every call is recorded as an "llm" span of the current audit trace.
+
+
+def _prepare(model, schema: Optional[Type[BaseModel]]):
+    if schema is None:
+        return model
+    return model.with_structured_output(schema, method="json_mode", include_raw=True)
+
+
+def _usage(message) -> Optional[int]:
+    usage = getattr(message, "usage_metadata", None)
+    if not usage:
+        return None
+    tracing.annotate(tokens_in=usage.get("input_tokens"), tokens_out=usage.get("output_tokens"))
+    return usage.get("total_tokens")
+
+
+def _unwrap(result, schema: Optional[Type[BaseModel]]) -> Tuple[Any, Optional[int]]:
+    if schema is None:
+        return result, _usage(result)
+    if result.get("parsing_error"):
+        raise result["parsing_error"]
+    if result.get("parsed") is None:
+        raise ValueError(f"Model returned no parsable {schema.__name__}")
+    return result["parsed"], _usage(result.get("raw"))
+
+
+def _cache_lookup(candidates, prompt, schema: Optional[Type[BaseModel]]):
+    """Returns the key per candidate ("provider:model") and the first cached response of any of them."""
+    cache = get_cache()
+    if cache is None:
+        return {}, None
+    keys = {repr(c): cache_key(c.model, prompt, schema, provider=c.provider) for c in candidates}
+    # One lookup per call, so a failover route counts one hit or miss like any other
+    cached = cache.get_first(list(keys.values()))
+    if cached is None:
+        return keys, None
+    if schema is None:
+        return keys, AIMessage(content=cached)
+    return keys, schema.model_validate_json(cached)
+
+
+def _cache_store(key: Optional[str], result, schema: Optional[Type[BaseModel]]) -> None:
+    cache = get_cache()
+    if cache is None or key is None:
+        return
+    cache.put(key, result.content if schema is None else result.model_dump_json())
+
+
+async def _acache_lookup(candidates, prompt, schema: Optional[Type[BaseModel]]):
+    # SQLite reads and the key hashing block; keep them off the event loop
+    if get_cache() is None:
+        return {}, None
+    return await asyncio.to_thread(_cache_lookup, candidates, prompt, schema)
+
+
+async def _acache_store(key: Optional[str], result, schema: Optional[Type[BaseModel]]) -> None:
+    if get_cache() is not None and key is not None:
+        await asyncio.to_thread(_cache_store, key, result, schema)
+
+
+def _llm_span(route, prompt, priority: Priority, schema: Optional[Type[BaseModel]]):
+    # "model" is overwritten with the candidate that answered
+    return tracing.span(f"llm {priority.name.lower()}", "llm", model=route.candidates[0].model_name,
+                        priority=priority.name, schema=schema.__name__ if schema else None,
+                        tokens_estimated=estimate_tokens(prompt))
+
+
+def _record_call(keys: Dict[str, str], hit: bool) -> None:
+    current = tracing.current_span()
+    if current is None:
+        return
+    if hit:
+        current.attrs["cache"] = "hit"
+        return
+    current.attrs["cache"] = "miss" if keys else "off"
+    tracing.annotate(cost_usd=tracing.model_cost(
+        current.attrs.get("model"), current.attrs.get("tokens_in"), current.attrs.get("tokens_out")))
+
+
+def invoke_model(model, prompt, priority: Priority, schema: Optional[Type[BaseModel]] = None):
+    """Invokes the model route through the provider schedulers; returns the message or the parsed schema."""
+    route = as_route(model)
+    with _llm_span(route, prompt, priority, schema):
+        keys, cached = _cache_lookup(route.candidates, prompt, schema)
+        if cached is not None:
+            _record_call(keys, hit=True)
+            return cached
+
+        def attempt(candidate: ModelCandidate, last: bool):
+            runnable = _prepare(candidate.model, schema)
+            # The candidate comes back with the result: it keys the cache entry, with or without tracing
+            return candidate, get_scheduler(candidate.provider).run(
+                lambda: _unwrap(runnable.invoke(prompt), schema),
+                priority=priority,
+                estimated_tokens=estimate_tokens(prompt),
+                max_retries=None if last else 0,
+            )
+
+        winner, result = run_route(route, attempt)
+        _record_call(keys, hit=False)
+        _cache_store(keys.get(repr(winner)), result, schema)
+        return result
+
+
+async def ainvoke_model(model, prompt, priority: Priority, schema: Optional[Type[BaseModel]] = None):
+    route = as_route(model)
+    with _llm_span(route, prompt, priority, schema):
+        keys, cached = await _acache_lookup(route.candidates, prompt, schema)
+        if cached is not None:
+            _record_call(keys, hit=True)
+            return cached
+
+        async def attempt(candidate: ModelCandidate, last: bool):
+            runnable = _prepare(candidate.model, schema)
+
+            async def call():
+                return _unwrap(await runnable.ainvoke(prompt), schema)
+
+            return candidate, await get_scheduler(candidate.provider).arun(
+                call, priority=priority, estimated_tokens=estimate_tokens(prompt),
+                max_retries=None if last else 0)
+
+        winner, result = await arun_route(route, attempt)
+        _record_call(keys, hit=False)
+        await _acache_store(keys.get(repr(winner)), result, schema)
+        return result
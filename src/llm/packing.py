@@ -0,0 +1,109 @@
+import os
+import re
+from typing import Dict, List, Optional, Set
+from src.state import Evidence
+from src.llm.scheduler import estimate_tokens
+
+# Evidence tokens per criterion in a judge prompt; a rubric dimension can set
+# its own "evidence_token_budget"
+DEFAULT_EVIDENCE_TOKEN_BUDGET = 600
+# Below this a block is not worth including; it is listed as omitted instead
+MIN_BLOCK_TOKENS = 24
+
+_WORD = re.compile(r"[a-z][a-z_]{3,}")
+_STOPWORDS = {"that", "this", "with", "from", "into", "there", "their", "than", "then", "each", "every",
+              "flag", "check", "whether", "should", "must", "using", "used", "uses", "only", "have", "does"}
+
+
+def evidence_budget(dimension: Dict) -> int:
+    return int(dimension.get("evidence_token_budget")
+               or os.getenv("EVIDENCE_TOKEN_BUDGET", DEFAULT_EVIDENCE_TOKEN_BUDGET))
+
+
+def _terms(text: str) -> Set[str]:
+    return {w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS}
+
+
+def _relevance(evidence: Evidence, criterion_terms: Set[str]) -> float:
+    """Share of the criterion's vocabulary the evidence talks about (0..1)."""
+    if not criterion_terms:
+        return 0.0
+    return len(criterion_terms & _terms(f"{evidence.goal} {evidence.content} {evidence.rationale}")) / len(criterion_terms)
+
+
+def rank_evidence(evidences: List[Evidence], dimension: Dict) -> List[Evidence]:
+    """Most useful first: found before not-found, then confidence, then relevance to the criterion."""
+    criterion_terms = _terms(" ".join(str(dimension.get(k, "")) for k in
+                                      ("name", "forensic_instruction", "success_pattern", "failure_pattern")))
+    return sorted(
+        evidences,
+        key=lambda e: (e.found, round(e.confidence * 0.7 + _relevance(e, criterion_terms) * 0.3, 6)),
+        reverse=True,
+    )
+
+
+def _cost(text: str) -> int:
+    # estimate_tokens rounded up, so the parts of a packed prompt never add up to less than the whole
+    return -(-len(text) // 4)
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    if _cost(text) <= max_tokens:
+        return text
+    # The marker is paid for out of the same budget
+    max_chars = max(0, max_tokens - _cost(f"\n[... truncated, {text.count(chr(10)) + 1} more lines]")) * 4
+    cut = text.rfind("\n", 0, max_chars)
+    cut = cut if cut > max_chars // 2 else max_chars
+    dropped = text[cut:].count("\n") + 1
+    return text[:cut].rstrip() + f"\n[... truncated, {dropped} more lines]"
+
+
+def _content(evidence: Evidence) -> str:
+    # Evidence without content (e.g. no Architecture.md) reads as the judges' prompts always showed it
+    return evidence.content if evidence.content is not None else "None"
+
+
+def _block(evidence: Evidence, content: str) -> str:
+    return f"- {evidence.goal}: {content} (Confidence: {evidence.confidence})"
+
+
+def pack_evidence(evidences: List[Evidence], dimension: Dict, budget: Optional[int] = None) -> str:
+    """Renders a criterion's evidence into at most `budget` (estimated) tokens.
+
+    Evidence is ranked, then each block gets what is left of the budget in
+    rank order: content that is too long is cut at a line boundary, and
+    blocks that no longer fit are named as omitted so the judge knows they
+    exist. Commit histories arrive already summarized (see git_history).
+    """
+    budget = budget or evidence_budget(dimension)
+    packed, omitted, remaining = [], [], budget
+    for evidence in rank_evidence(evidences, dimension):
+        # Every block but the first is preceded by a newline
+        overhead = _cost(_block(evidence, "")) + (1 if packed else 0)
+        if remaining - overhead < MIN_BLOCK_TOKENS:
+            omitted.append(evidence.goal)
+            continue
+        block = _block(evidence, _truncate(_content(evidence), remaining - overhead))
+        remaining -= _cost(block) + (1 if packed else 0)
+        packed.append((evidence, block))
+    # The omitted note needs room too: cut the lowest-ranked block further, or
+    # drop it when what would be left of it is not worth including
+    while omitted and packed and _cost(_omitted_note(omitted)) + 1 > remaining:
+        evidence, block = packed.pop()
+        separator = 1 if packed else 0
+        remaining += _cost(block) + separator
+        room = remaining - (_cost(_omitted_note(omitted)) + 1) - _cost(_block(evidence, "")) - separator
+        if room >= MIN_BLOCK_TOKENS:
+            block = _block(evidence, _truncate(_content(evidence), room))
+            remaining -= _cost(block) + separator
+            packed.append((evidence, block))
+        else:
+            omitted.insert(0, evidence.goal)
+    blocks = [block for _, block in packed]
+    if omitted:
+        blocks.append(_omitted_note(omitted))
+    return "\n".join(blocks)
+
+
+def _omitted_note(omitted: List[str]) -> str:
+    return f"- (omitted for length: {'; '.join(omitted)})"
@@ -0,0 +1,312 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+from src import tracing
+from src.llm.scheduler import DEFAULT_PROVIDER, _status_code, get_scheduler
+
+# Ordered "provider:model" candidates per role, overridable with LLM_ROUTE_<ROLE>.
+# Candidates whose provider has no API key configured are skipped, so with only
+# GROQ_API_KEY set every role runs on Groq alone.
+DEFAULT_ROUTES = {
+    "detective": "groq:llama-3.1-8b-instant,xai:grok-3-mini",
+    "judge": "groq:llama-3.3-70b-versatile,xai:grok-3-mini",
+    "justice": "groq:llama-3.3-70b-versatile,xai:grok-3",
+}
+# Roles that hedge when LLM_HEDGE_AFTER_S is set: the judicial fan-out waits on
+# its slowest call, so that is where a duplicate request pays off
+DEFAULT_HEDGE_ROLES = "judge"
+MAX_HEDGE_THREADS = 32
+
+
+def _groq(model: str, **options):
+    from langchain_groq import ChatGroq
+    # Retries are owned by the shared LLM scheduler and the router
+    return ChatGroq(model=model, temperature=0, max_retries=0, **options)
+
+
+def _xai(model: str, **options):
+    from langchain_xai import ChatXAI
+    return ChatXAI(model=model, temperature=0, max_retries=0, **options)
+
+
+def _fake(model: str, **options):
+    # Local stand-in (see src.benchmark.fake_llm), e.g. "fake:slow?latency_s=2&rate_limit_rate=0.3"
+    from src.benchmark.fake_llm import FakeChatModel
+    fake = FakeChatModel(**options)
+    fake.model_name = f"fake-{model}"
+    return fake
+
+
+# provider -> (chat model factory, API key variable or None)
+PROVIDERS: Dict[str, Tuple[Callable[..., Any], Optional[str]]] = {
+    "groq": (_groq, "GROQ_API_KEY"),
+    "xai": (_xai, "XAI_API_KEY"),
+    "fake": (_fake, None),
+}
+
+
+class ModelCandidate:
+    """One provider/model a role may be served by."""
+
+    def __init__(self, provider: str, model_name: str, model):
+        self.provider = provider
+        self.model_name = model_name
+        self.model = model
+
+    def __repr__(self) -> str:
+        return f"{self.provider}:{self.model_name}"
+
+
+class ModelRoute:
+    """Ordered candidates for a role, plus its hedging threshold (None = no hedging)."""
+
+    def __init__(self, role: str, candidates: List[ModelCandidate], hedge_after_s: Optional[float] = None):
+        if not candidates:
+            raise ValueError(f"No usable model for role '{role}'")
+        self.role = role
+        self.candidates = candidates
+        self.hedge_after_s = hedge_after_s
+
+    def ordered(self) -> List[ModelCandidate]:
+        """Candidates in preference order, providers paused by a 429 moved to the back."""
+        return sorted(self.candidates, key=lambda c: get_scheduler(c.provider).paused_for() > 0)
+
+
+def _parse_candidate(spec: str) -> Optional[ModelCandidate]:
+    spec, _, query = spec.strip().partition("?")
+    provider, _, model_name = spec.partition(":")
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unknown model provider '{provider}' in '{spec}', expected one of {sorted(PROVIDERS)}")
+    factory, key_var = PROVIDERS[provider]
+    if key_var and not os.getenv(key_var):
+        return None
+    options = {k: _option(v) for k, v in parse_qsl(query)}
+    return ModelCandidate(provider, model_name, factory(model_name, **options))
+
+
+def _option(value: str):
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _hedge_after(role: str) -> Optional[float]:
+    after = os.getenv("LLM_HEDGE_AFTER_S")
+    roles = {r.strip() for r in os.getenv("LLM_HEDGE_ROLES", DEFAULT_HEDGE_ROLES).split(",")}
+    return float(after) if after and float(after) > 0 and role in roles else None
+
+
+_routes: Dict[Tuple, ModelRoute] = {}
+_routes_lock = threading.Lock()
+
+
+def get_model(role: str) -> ModelRoute:
+    """The model route for a role ("detective", "judge" or "justice").
+
+    Routes are built once per configuration and shared, so every node call
+    reuses the same chat model clients and their HTTP connection pools.
+    """
+    specs = os.getenv(f"LLM_ROUTE_{role.upper()}", DEFAULT_ROUTES[role])
+    hedge_after_s = _hedge_after(role)
+    keys = tuple(bool(os.getenv(key_var)) for _, key_var in PROVIDERS.values() if key_var)
+    with _routes_lock:
+        route = _routes.get((role, specs, hedge_after_s, keys))
+        if route is None:
+            candidates = [c for c in (_parse_candidate(s) for s in specs.split(",") if s.strip()) if c is not None]
+            route = _routes[(role, specs, hedge_after_s, keys)] = ModelRoute(role, candidates, hedge_after_s)
+        return route
+
+
+def as_route(model) -> ModelRoute:
+    """Wraps a bare chat model (e.g. a test double) as a single-candidate route."""
+    if isinstance(model, ModelRoute):
+        return model
+    name = getattr(model, "model_name", None) or getattr(model, "model", None) or type(model).__name__
+    return ModelRoute("custom", [ModelCandidate(DEFAULT_PROVIDER, str(name), model)])
+
+
+def is_failover_error(exc: Exception) -> bool:
+    """Errors another provider may not have: throttling, server errors, timeouts, connection failures."""
+    status = _status_code(exc)
+    if status is not None:
+        return status == 429 or status >= 500
+    name = type(exc).__name__
+    return isinstance(exc, (TimeoutError, ConnectionError)) or "Timeout" in name or "Connection" in name
+
+
+def _record(winner: ModelCandidate) -> None:
+    tracing.annotate(provider=winner.provider, model=winner.model_name)
+
+
+def _failed_over(candidate: ModelCandidate, exc: Exception) -> None:
+    tracing.add("failovers", 1)
+    print(f"Model router: {candidate} failed ({type(exc).__name__}), failing over")
+
+
+# --- Sync execution ---
+
+_hedge_pool: Optional[ThreadPoolExecutor] = None
+_hedge_lock = threading.Lock()
+# One slot per pool thread. A hedged call reserves both of its threads up
+# front, so its requests never wait in the pool's queue; when the slots are
+# taken (e.g. by losers that cannot be cancelled) calls are not hedged
+_hedge_slots = threading.BoundedSemaphore(MAX_HEDGE_THREADS)
+
+
+def _get_hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_pool
+    with _hedge_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(max_workers=MAX_HEDGE_THREADS, thread_name_prefix="llm-hedge")
+        return _hedge_pool
+
+
+def _reserve_hedge_slots() -> bool:
+    if not _hedge_slots.acquire(blocking=False):
+        return False
+    if not _hedge_slots.acquire(blocking=False):
+        _hedge_slots.release()
+        return False
+    return True
+
+
+def _in_slot(started: Optional[threading.Event], attempt: Callable[[ModelCandidate, bool], Any],
+             candidate: ModelCandidate, last: bool) -> Any:
+    if started is not None:
+        started.set()
+    try:
+        return attempt(candidate, last)
+    finally:
+        _hedge_slots.release()
+
+
+def _hedged(route: ModelRoute, first: ModelCandidate, second: ModelCandidate, second_is_last: bool,
+            attempt: Callable[[ModelCandidate, bool], Any]) -> Any:
+    """Runs `first` and races a duplicate on `second` once it is slower than the threshold.
+
+    The caller holds both hedge slots (see _reserve_hedge_slots). `second`
+    also takes over straight away if `first` fails with a failover error
+    before the threshold. A losing thread cannot be cancelled; its result is
+    dropped and its slot stays taken until it returns.
+    """
+    pool = _get_hedge_pool()
+    started = threading.Event()
+    running = {pool.submit(copy_context().run, _in_slot, started, attempt, first, False): first}
+    second_started = False
+    try:
+        # The threshold counts from when the first request starts, not from its submission
+        started.wait()
+        done, _ = wait(running, timeout=route.hedge_after_s)
+        if not done:
+            tracing.add("hedges", 1)
+            second_started = True
+            running[pool.submit(copy_context().run, _in_slot, None, attempt, second, second_is_last)] = second
+        while True:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                candidate = running.pop(future)
+                error = future.exception()
+                if error is None:
+                    _record(candidate)
+                    return future.result()
+                if running:
+                    continue
+                if second_started or not is_failover_error(error):
+                    raise error
+                _failed_over(candidate, error)
+                second_started = True
+                running[pool.submit(copy_context().run, _in_slot, None, attempt, second, second_is_last)] = second
+    finally:
+        if not second_started:
+            _hedge_slots.release()
+
+
+def run_route(route: ModelRoute, attempt: Callable[[ModelCandidate, bool], Any]) -> Any:
+    """Calls `attempt(candidate, last)` down the route until one succeeds.
+
+    Failover happens on throttling, 5xx and connection errors; `last` tells
+    the attempt whether it may spend the scheduler's own 429 retries. With a
+    hedging threshold the first two candidates are raced as in _hedged,
+    unless every hedge thread is busy; the call then runs here unhedged.
+    """
+    candidates = route.ordered()
+    if route.hedge_after_s is not None and len(candidates) > 1 and _reserve_hedge_slots():
+        try:
+            return _hedged(route, candidates[0], candidates[1], len(candidates) == 2, attempt)
+        except Exception as e:
+            if len(candidates) == 2 or not is_failover_error(e):
+                raise
+            _failed_over(candidates[1], e)
+            candidates = candidates[2:]
+    for i, candidate in enumerate(candidates):
+        last = i == len(candidates) - 1
+        try:
+            result = attempt(candidate, last)
+        except Exception as e:
+            if last or not is_failover_error(e):
+                raise
+            _failed_over(candidate, e)
+            continue
+        _record(candidate)
+        return result
+
+
+# --- Async execution ---
+
+async def _ahedged(route: ModelRoute, first: ModelCandidate, second: ModelCandidate, second_is_last: bool,
+                   attempt: Callable[[ModelCandidate, bool], Awaitable]) -> Any:
+    running = {asyncio.ensure_future(attempt(first, False)): first}
+    done, _ = await asyncio.wait(running, timeout=route.hedge_after_s)
+    second_started = not done
+    if second_started:
+        tracing.add("hedges", 1)
+        running[asyncio.ensure_future(attempt(second, second_is_last))] = second
+    try:
+        while True:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                candidate = running.pop(task)
+                error = task.exception()
+                if error is None:
+                    _record(candidate)
+                    return task.result()
+                if running:
+                    continue
+                if second_started or not is_failover_error(error):
+                    raise error
+                _failed_over(candidate, error)
+                second_started = True
+                running[asyncio.ensure_future(attempt(second, second_is_last))] = second
+    finally:
+        # Unlike threads, the losing request can be cancelled
+        for task in running:
+            task.cancel()
+
+
+async def arun_route(route: ModelRoute, attempt: Callable[[ModelCandidate, bool], Awaitable]) -> Any:
+    """Async variant of run_route; `attempt` returns an awaitable."""
+    candidates = route.ordered()
+    if route.hedge_after_s is not None and len(candidates) > 1:
+        try:
+            return await _ahedged(route, candidates[0], candidates[1], len(candidates) == 2, attempt)
+        except Exception as e:
+            if len(candidates) == 2 or not is_failover_error(e):
+                raise
+            _failed_over(candidates[1], e)
+            candidates = candidates[2:]
+    for i, candidate in enumerate(candidates):
+        last = i == len(candidates) - 1
+        try:
+            result = await attempt(candidate, last)
+        except Exception as e:
+            if last or not is_failover_error(e):
+                raise
+            _failed_over(candidate, e)
+            continue
+        _record(candidate)
+        return result
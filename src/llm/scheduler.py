@@ -0,0 +1,348 @@
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Any, Callable, Dict, Optional, Tuple
+from src import tracing
+
+# Groq free tier limits for llama-3.3-70b-versatile
+DEFAULT_REQUESTS_PER_MINUTE = 30
+DEFAULT_TOKENS_PER_MINUTE = 12000
+DEFAULT_MAX_RETRIES = 5
+# Completion tokens are billed against the TPM budget as well
+DEFAULT_COMPLETION_TOKENS = 300
+# Waiters re-check the queue at least this often so a new head or a 429 pause is noticed
+POLL_INTERVAL = 0.05
+MAX_WAIT_SLICE = 1.0
+
+
+class Priority(IntEnum):
+    """Lower values are scheduled first."""
+    JUSTICE = 0
+    JUDGE = 1
+    DETECTIVE = 2
+
+
+def estimate_tokens(prompt: Any) -> int:
+    """Cheap token estimate (~4 characters per token) for strings or message lists."""
+    if isinstance(prompt, str):
+        text_len = len(prompt)
+    elif isinstance(prompt, (list, tuple)):
+        text_len = sum(len(str(getattr(m, "content", m))) for m in prompt)
+    else:
+        text_len = len(str(prompt))
+    return max(1, text_len // 4)
+
+
+class TokenBucket:
+    """Continuously refilling budget of `capacity` units per minute."""
+
+    def __init__(self, capacity_per_minute: float):
+        self.capacity = float(capacity_per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # A single request larger than the bucket only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float, now: float) -> None:
+        self._refill(now)
+        # May go negative: an underestimated call is paid back by later callers waiting longer
+        self.level = min(self.capacity, self.level - amount)
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    # Groq reset headers look like "7.66s", "2m59.56s" or "120ms"
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total, number = 0.0, ""
+    i = 0
+    while i < len(value):
+        ch = value[i]
+        if ch.isdigit() or ch == ".":
+            number += ch
+        elif value.startswith("ms", i):
+            total += float(number or 0) / 1000
+            number = ""
+            i += 1
+        elif ch in "hms":
+            total += float(number or 0) * {"h": 3600, "m": 60, "s": 1}[ch]
+            number = ""
+        else:
+            return None
+        i += 1
+    return total if not number else None
+
+
+def retry_after_seconds(exc: Exception) -> Optional[float]:
+    """Extracts the server-requested delay from a 429 response, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        seconds = _parse_duration(retry_after)
+        if seconds is not None:
+            return seconds
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    for header in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        if headers.get(header):
+            seconds = _parse_duration(headers[header])
+            if seconds is not None:
+                return seconds
+    return None
+
+
+class SchedulerMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.queued_seconds = 0.0
+        self.max_queued_seconds = 0.0
+        self.queued_by_priority: Dict[str, float] = {}
+        self.tokens_estimated = 0
+        self.tokens_used = 0
+
+    def record_queue(self, priority: Priority, waited: float) -> None:
+        self.queued_seconds += waited
+        self.max_queued_seconds = max(self.max_queued_seconds, waited)
+        self.queued_by_priority[priority.name] = self.queued_by_priority.get(priority.name, 0.0) + waited
+
+    def snapshot(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "queued_seconds": round(self.queued_seconds, 3),
+            "max_queued_seconds": round(self.max_queued_seconds, 3),
+            "queued_by_priority": {k: round(v, 3) for k, v in self.queued_by_priority.items()},
+            "tokens_estimated": self.tokens_estimated,
+            "tokens_used": self.tokens_used,
+        }
+
+
+class LLMScheduler:
+    """Process-wide admission control for model calls.
+
+    Requests wait in a priority queue and are admitted only when both the
+    requests-per-minute and tokens-per-minute buckets can pay for them. A 429
+    pauses admission for everybody for the server's retry-after window before
+    the failed call is retried. Works for threads and event loops alike: the
+    lock only guards bookkeeping, waiting happens in time.sleep/asyncio.sleep.
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+                 max_retries: int = DEFAULT_MAX_RETRIES, base_backoff: float = 2.0):
+        self._lock = threading.Lock()
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._waiting = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.metrics = SchedulerMetrics()
+
+    # --- Admission ---
+
+    def _enqueue(self, priority: Priority) -> Tuple[int, int]:
+        ticket = (int(priority), next(self._seq))
+        with self._lock:
+            heapq.heappush(self._waiting, ticket)
+        return ticket
+
+    def _dequeue(self, ticket: Tuple[int, int]) -> None:
+        with self._lock:
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+
+    def _try_admit(self, ticket: Tuple[int, int], cost: int) -> float:
+        """Admits the ticket and returns 0, or returns how long to wait before retrying."""
+        with self._lock:
+            if self._waiting[0] != ticket:
+                return POLL_INTERVAL
+            now = time.monotonic()
+            wait = max(
+                self._paused_until - now,
+                self._requests.wait_time(1, now),
+                self._tokens.wait_time(cost, now),
+            )
+            if wait > 0:
+                return min(wait, MAX_WAIT_SLICE)
+            self._requests.consume(1, now)
+            self._tokens.consume(cost, now)
+            heapq.heappop(self._waiting)
+            self.metrics.requests += 1
+            self.metrics.tokens_estimated += cost
+            return 0.0
+
+    def acquire(self, priority: Priority, cost: int) -> float:
+        """Blocks until admitted; returns the time spent queued."""
+        started = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            while (wait := self._try_admit(ticket, cost)) > 0:
+                time.sleep(wait)
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        waited = time.monotonic() - started
+        with self._lock:
+            self.metrics.record_queue(priority, waited)
+        tracing.add("queued_s", waited)
+        return waited
+
+    async def aacquire(self, priority: Priority, cost: int) -> float:
+        started = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            while (wait := self._try_admit(ticket, cost)) > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        waited = time.monotonic() - started
+        with self._lock:
+            self.metrics.record_queue(priority, waited)
+        tracing.add("queued_s", waited)
+        return waited
+
+    def _settle(self, estimated: int, used: Optional[int]) -> None:
+        # Charge the difference between the estimate and the real usage
+        if used is None:
+            return
+        with self._lock:
+            self._tokens.consume(used - estimated, time.monotonic())
+            self.metrics.tokens_used += used
+
+    # --- Backoff ---
+
+    def _backoff(self, exc: Exception, attempt: int, max_retries: int) -> Optional[float]:
+        """Returns the delay before retrying, or None if the error is not a retryable rate limit.
+
+        A 429 pauses admission even when it is not retried here, so callers
+        such as the model router can see the provider is throttled.
+        """
+        if _status_code(exc) != 429:
+            return None
+        delay = retry_after_seconds(exc)
+        if delay is None:
+            delay = self.base_backoff * (2 ** attempt) + random.uniform(0, self.base_backoff)
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self.metrics.rate_limited += 1
+            if attempt >= max_retries:
+                return None
+            self.metrics.retries += 1
+        tracing.add("retries", 1)
+        tracing.add("backoff_s", delay)
+        return delay
+
+    def paused_for(self) -> float:
+        """Seconds until admission resumes after a 429 (0 when not paused)."""
+        with self._lock:
+            return max(0.0, self._paused_until - time.monotonic())
+
+    # --- Execution ---
+
+    def run(self, call: Callable[[], Tuple[Any, Optional[int]]], priority: Priority, estimated_tokens: int,
+            max_retries: Optional[int] = None) -> Any:
+        """Runs `call` (returning (result, tokens_used)) under the rate limits, retrying 429s.
+
+        max_retries overrides the scheduler's retry budget for this call (0 to
+        fail fast, e.g. when another provider can take over).
+        """
+        cost = estimated_tokens + DEFAULT_COMPLETION_TOKENS
+        max_retries = self.max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            self.acquire(priority, cost)
+            try:
+                result, used = call()
+            except Exception as e:
+                if self._backoff(e, attempt, max_retries) is None:
+                    raise
+                attempt += 1
+                continue
+            self._settle(cost, used)
+            return result
+
+    async def arun(self, call: Callable[[], Any], priority: Priority, estimated_tokens: int,
+                   max_retries: Optional[int] = None) -> Any:
+        """Async variant of run; `call` returns an awaitable of (result, tokens_used)."""
+        cost = estimated_tokens + DEFAULT_COMPLETION_TOKENS
+        max_retries = self.max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            await self.aacquire(priority, cost)
+            try:
+                result, used = await call()
+            except Exception as e:
+                if self._backoff(e, attempt, max_retries) is None:
+                    raise
+                attempt += 1
+                continue
+            self._settle(cost, used)
+            return result
+
+
+DEFAULT_PROVIDER = "groq"
+
+_schedulers: Dict[str, LLMScheduler] = {}
+_scheduler_lock = threading.Lock()
+
+
+def _provider_setting(provider: str, name: str, default: Any) -> str:
+    # LLM_XAI_REQUESTS_PER_MINUTE etc.; the unprefixed settings describe the default provider
+    if provider != DEFAULT_PROVIDER:
+        value = os.getenv(f"LLM_{provider.upper()}_{name}")
+        if value is not None:
+            return value
+    return os.getenv(f"LLM_{name}", default)
+
+
+def get_scheduler(provider: str = DEFAULT_PROVIDER) -> LLMScheduler:
+    """Returns the process-wide scheduler of a provider, configured from the environment on first use."""
+    with _scheduler_lock:
+        if provider not in _schedulers:
+            _schedulers[provider] = LLMScheduler(
+                requests_per_minute=float(_provider_setting(provider, "REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)),
+                tokens_per_minute=float(_provider_setting(provider, "TOKENS_PER_MINUTE", DEFAULT_TOKENS_PER_MINUTE)),
+                max_retries=int(_provider_setting(provider, "MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+            )
+        return _schedulers[provider]
+
+
+def all_schedulers() -> Dict[str, LLMScheduler]:
+    """Every provider scheduler created so far."""
+    with _scheduler_lock:
+        return dict(_schedulers)
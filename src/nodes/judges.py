@@ -1,15 +1,22 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from typing import Dict, List
-import time
-import random
-from langchain_groq import ChatGroq
-from src.state import AgentState, JudicialOpinion, Evidence
+from src.state import AgentState, JudicialOpinion, JudicialOpinionBatch, Evidence
 from langchain_core.prompts import ChatPromptTemplate
+from src.llm.gateway import ainvoke_model, invoke_model
+from src.llm.packing import pack_evidence
+from src.llm.router import get_model
+from src.llm.scheduler import Priority
+from src.progress import emit
 import os
 
+DEFAULT_JUDGE_CONCURRENCY = 8
+
 def get_judge_model(judge_name: str):
-    # Using Llama 3.3 70B via Groq with JSON mode for better stability
-    model = ChatGroq(model="llama-3.3-70b-versatile", temperature=0)
-    return model.with_structured_output(JudicialOpinion, method="json_mode")
+    # Llama 3.3 70B first, another provider on throttling; the gateway binds
+    # JudicialOpinion in JSON mode for better stability
+    return get_model("judge")
 
 PROSECUTOR_PROMPT = """You are the Prosecutor in a Digital Courtroom.
 Core Philosophy: "Trust No One. Assume Vibe Coding."
@@ -41,47 +48,151 @@ Ignore the "Vibe" and "Struggle." Focus on artifacts. Is it functionally solid?
 Are the reducers used? Are the tool calls safe? You are the pragmatic tie-breaker.
 """
 
+def _evidence_summary(dim: Dict, evidences: Dict) -> str:
+    # Find relevant evidence, ranked and packed into the criterion's token budget
+    relevant_evidence = evidences.get(dim["id"], [])
+    evidence_summary = pack_evidence(relevant_evidence, dim)
+    return evidence_summary or "No evidence found for this criterion."
+
+def _build_judge_request(judge_name: str, prompt_template: str, dim: Dict, evidences: Dict):
+    criterion_id = dim["id"]
+    criterion_name = dim["name"]
+    evidence_summary = _evidence_summary(dim, evidences)
+
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", prompt_template),
+        ("user", f"Evaluate the evidence and provide your judicial opinion. Output the result as a flat JSON object matching this schema: {{{{ 'judge': '{judge_name}', 'criterion_id': '{criterion_id}', 'score': <int 1-5>, 'argument': '<string>', 'cited_evidence': ['<string>', ...] }}}}. The 'judge' MUST be exactly '{judge_name}'. The 'score' MUST be an integer between 1 and 5. The 'cited_evidence' MUST be a list of strings.")
+    ])
+    inputs = {
+        "criterion_name": criterion_name,
+        "evidence_summary": evidence_summary
+    }
+    return prompt, inputs
+
+def _build_batched_request(judge_name: str, prompt_template: str, dimensions: List[Dict], evidences: Dict):
+    # The persona prompt and output instructions are sent once for the whole rubric
+    criterion_ids = ", ".join(f"'{dim['id']}'" for dim in dimensions)
+    evidence_blocks = "\n\n".join(
+        f"### {dim['name']} (criterion_id: {dim['id']})\n{_evidence_summary(dim, evidences)}"
+        for dim in dimensions
+    )
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", prompt_template),
+        ("user", f"Evaluate the evidence for EVERY criterion above and provide one judicial opinion per criterion. Output the result as a JSON object matching this schema: {{{{ 'opinions': [ {{{{ 'judge': '{judge_name}', 'criterion_id': '<criterion_id>', 'score': <int 1-5>, 'argument': '<string>', 'cited_evidence': ['<string>', ...] }}}}, ... ] }}}}. There MUST be exactly one opinion for each of these criterion_id values: {criterion_ids}. The 'judge' MUST be exactly '{judge_name}'. The 'score' MUST be an integer between 1 and 5. The 'cited_evidence' MUST be a list of strings.")
+    ])
+    inputs = {
+        "criterion_name": "each rubric criterion listed below",
+        "evidence_summary": "\n\n" + evidence_blocks,
+    }
+    return prompt, inputs
+
+def _split_batch(batch: JudicialOpinionBatch, judge_name: str, dimensions: List[Dict]):
+    """Validates a batched response; returns opinions by criterion and the dimensions still missing."""
+    by_id = {}
+    wanted = {dim["id"] for dim in dimensions}
+    for opinion in batch.opinions:
+        if opinion.criterion_id in wanted and opinion.criterion_id not in by_id:
+            by_id[opinion.criterion_id] = _finalize_opinion(opinion, judge_name, opinion.criterion_id)
+    missing = [dim for dim in dimensions if dim["id"] not in by_id]
+    return by_id, missing
+
+def _finalize_opinion(opinion: JudicialOpinion, judge_name: str, criterion_id: str) -> JudicialOpinion:
+    # Ensure the judge field is set correctly
+    opinion.judge = judge_name
+    opinion.criterion_id = criterion_id
+    # Streaming runs see each opinion before the whole judge node finishes
+    emit("opinion", opinion=opinion)
+    return opinion
+
+def _judge_concurrency() -> int:
+    # Each criterion is an independent call; the shared scheduler still enforces
+    # the provider limits, this only bounds how many are in flight per judge.
+    return max(1, int(os.getenv("JUDGE_CONCURRENCY", DEFAULT_JUDGE_CONCURRENCY)))
+
+def _evaluate_criterion(model, judge_name: str, prompt_template: str, dim: Dict, evidences: Dict) -> JudicialOpinion:
+    prompt, inputs = _build_judge_request(judge_name, prompt_template, dim, evidences)
+    opinion = invoke_model(model, prompt.format_messages(**inputs), priority=Priority.JUDGE, schema=JudicialOpinion)
+    return _finalize_opinion(opinion, judge_name, dim["id"])
+
+async def _aevaluate_criterion(model, judge_name: str, prompt_template: str, dim: Dict, evidences: Dict, limiter: asyncio.Semaphore) -> JudicialOpinion:
+    async with limiter:
+        prompt, inputs = _build_judge_request(judge_name, prompt_template, dim, evidences)
+        opinion = await ainvoke_model(model, prompt.format_messages(**inputs), priority=Priority.JUDGE, schema=JudicialOpinion)
+        return _finalize_opinion(opinion, judge_name, dim["id"])
+
+def _batched_mode() -> bool:
+    return os.getenv("JUDGE_MODE", "per_criterion").lower() == "batched"
+
+def _judge_each(model, judge_name: str, prompt_template: str, dimensions: List[Dict], evidences: Dict) -> List[JudicialOpinion]:
+    if not dimensions:
+        return []
+    # Every rubric dimension is judged concurrently; results keep rubric order.
+    # Each call runs in a copy of this context so its trace span nests under the judge.
+    with ThreadPoolExecutor(max_workers=min(_judge_concurrency(), len(dimensions))) as executor:
+        futures = [
+            executor.submit(copy_context().run, _evaluate_criterion, model, judge_name, prompt_template, dim, evidences)
+            for dim in dimensions
+        ]
+        return [future.result() for future in futures]
+
+async def _ajudge_each(model, judge_name: str, prompt_template: str, dimensions: List[Dict], evidences: Dict) -> List[JudicialOpinion]:
+    limiter = asyncio.Semaphore(_judge_concurrency())
+    opinions = await asyncio.gather(*[
+        _aevaluate_criterion(model, judge_name, prompt_template, dim, evidences, limiter)
+        for dim in dimensions
+    ])
+    return list(opinions)
+
 def judge_node_factory(judge_name: str, prompt_template: str):
     def node(state: AgentState) -> Dict:
         model = get_judge_model(judge_name)
-        opinions = []
-        
-        # In a real fan-out, we might handle one criterion at a time or all.
-        # Here we iterate through the rubric dimensions for simplicity in this node implementation.
-        for dim in state["rubric_dimensions"]:
-            criterion_id = dim["id"]
-            criterion_name = dim["name"]
-            
-            # Find relevant evidence
-            relevant_evidence = state["evidences"].get(criterion_id, [])
-            evidence_summary = "\n".join([f"- {e.goal}: {e.content} (Confidence: {e.confidence})" for e in relevant_evidence])
-            
-            if not evidence_summary:
-                evidence_summary = "No evidence found for this criterion."
-            
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", prompt_template),
-                ("user", f"Evaluate the evidence and provide your judicial opinion. Output the result as a flat JSON object matching this schema: {{{{ 'judge': '{judge_name}', 'criterion_id': '{criterion_id}', 'score': <int 1-5>, 'argument': '<string>', 'cited_evidence': ['<string>', ...] }}}}. The 'judge' MUST be exactly '{judge_name}'. The 'score' MUST be an integer between 1 and 5. The 'cited_evidence' MUST be a list of strings.")
-            ])
-            
-            chain = prompt | model
-            
-            # Aggressive rate limit mitigation for Groq free tier
-            time.sleep(random.uniform(2, 5))
-            
-            opinion = chain.invoke({
-                "criterion_name": criterion_name,
-                "evidence_summary": evidence_summary
-            })
-            
-            # Ensure the judge field is set correctly
-            opinion.judge = judge_name
-            opinion.criterion_id = criterion_id
-            opinions.append(opinion)
-            
-        return {"opinions": opinions}
+        dimensions = state["rubric_dimensions"]
+        evidences = state["evidences"]
+
+        if not _batched_mode():
+            return {"opinions": _judge_each(model, judge_name, prompt_template, dimensions, evidences)}
+
+        # One structured call for the whole rubric; anything malformed or
+        # missing from the batch falls back to per-criterion calls
+        by_id, missing = {}, dimensions
+        try:
+            prompt, inputs = _build_batched_request(judge_name, prompt_template, dimensions, evidences)
+            batch = invoke_model(model, prompt.format_messages(**inputs), priority=Priority.JUDGE, schema=JudicialOpinionBatch)
+            by_id, missing = _split_batch(batch, judge_name, dimensions)
+        except Exception as e:
+            print(f"{judge_name}: batched judging failed ({str(e)}), falling back to per-criterion calls")
+
+        for opinion in _judge_each(model, judge_name, prompt_template, missing, evidences):
+            by_id[opinion.criterion_id] = opinion
+        return {"opinions": [by_id[dim["id"]] for dim in dimensions]}
+    return node
+
+def async_judge_node_factory(judge_name: str, prompt_template: str):
+    async def node(state: AgentState) -> Dict:
+        model = get_judge_model(judge_name)
+        dimensions = state["rubric_dimensions"]
+        evidences = state["evidences"]
+
+        if not _batched_mode():
+            return {"opinions": await _ajudge_each(model, judge_name, prompt_template, dimensions, evidences)}
+
+        by_id, missing = {}, dimensions
+        try:
+            prompt, inputs = _build_batched_request(judge_name, prompt_template, dimensions, evidences)
+            batch = await ainvoke_model(model, prompt.format_messages(**inputs), priority=Priority.JUDGE, schema=JudicialOpinionBatch)
+            by_id, missing = _split_batch(batch, judge_name, dimensions)
+        except Exception as e:
+            print(f"{judge_name}: batched judging failed ({str(e)}), falling back to per-criterion calls")
+
+        for opinion in await _ajudge_each(model, judge_name, prompt_template, missing, evidences):
+            by_id[opinion.criterion_id] = opinion
+        return {"opinions": [by_id[dim["id"]] for dim in dimensions]}
     return node
 
 prosecutor_node = judge_node_factory("Prosecutor", PROSECUTOR_PROMPT)
 defense_node = judge_node_factory("Defense", DEFENSE_PROMPT)
 tech_lead_node = judge_node_factory("TechLead", TECH_LEAD_PROMPT)
+
+aprosecutor_node = async_judge_node_factory("Prosecutor", PROSECUTOR_PROMPT)
+adefense_node = async_judge_node_factory("Defense", DEFENSE_PROMPT)
+atech_lead_node = async_judge_node_factory("TechLead", TECH_LEAD_PROMPT)
@@ -1,71 +1,68 @@
-from typing import Dict, List
-import time
-import random
-from langchain_groq import ChatGroq
+import asyncio
+import os
+from typing import Dict, List, Optional
 from src.state import AgentState, AuditReport, CriterionResult, JudicialOpinion
-import math
+from src.llm.gateway import ainvoke_model, invoke_model
+from src.llm.router import get_model
+from src.llm.scheduler import Priority
+from src.rules import (DimensionVerdict, load_scoring_rules, needs_synthesis, score_dimension,
+                       templated_remediation, templated_summary)
 
 def get_justice_model():
-    return ChatGroq(model="llama-3.3-70b-versatile", temperature=0)
+    # Routed like the judges (see src.llm.router)
+    return get_model("justice")
 
-def chief_justice_node(state: AgentState) -> Dict:
-    opinions = state["opinions"]
-    dimensions = state["rubric_dimensions"]
-    results = []
-    
-    model = get_justice_model()
-    
-    for dim in dimensions:
-        dim_id = dim["id"]
-        dim_name = dim["name"]
-        
-        # Gather all judge opinions for this dimension
-        dim_opinions = [o for o in opinions if o.criterion_id == dim_id]
-        
-        # Rule of Security (Example: For 'safe_tool_engineering')
-        prosecutor_opt = next((o for o in dim_opinions if o.judge == "Prosecutor"), None)
-        tech_lead_opt = next((o for o in dim_opinions if o.judge == "TechLead"), None)
-        defense_opt = next((o for o in dim_opinions if o.judge == "Defense"), None)
-        
-        # Base score calculation (Deterministic fallback)
-        scores = {o.judge: o.score for o in dim_opinions}
-        p_sc = scores.get("Prosecutor", 3)
-        d_sc = scores.get("Defense", 3)
-        t_sc = scores.get("TechLead", 3)
-        
-        # Dialectical Synthesis via LLM
-        time.sleep(random.uniform(1, 4)) # Rate limit
-        opinion_text = "\n".join([f"{o.judge}: {o.argument} (Score: {o.score})" for o in dim_opinions])
-        synthesis = model.invoke(f"Synthesize these judicial opinions for '{dim_name}'. Balance the Prosecution's rigor, the Defense's intent-based view, and the Tech Lead's pragmatism. \n\nOpinions:\n{opinion_text}\n\nProvide a final synthesis and remediation plan.").content
-        
-        # Score Logic
-        if dim_id == "safe_tool_engineering" and p_sc <= 2:
-            final_score = min(p_sc, 3) 
-        elif dim_id == "graph_orchestration":
-            final_score = t_sc
-        else:
-            final_score = round((p_sc * 0.3) + (d_sc * 0.3) + (t_sc * 0.4))
-        
-        dissent_summary = None
-        if (max(p_sc, d_sc, t_sc) - min(p_sc, d_sc, t_sc)) > 2:
-            dissent_summary = f"High variance detected ({min(p_sc, d_sc, t_sc)} vs {max(p_sc, d_sc, t_sc)}). Dialectical synthesis performed to reach consensus."
-
-        results.append(CriterionResult(
-            dimension_id=dim_id,
-            dimension_name=dim_name,
-            final_score=final_score,
-            judge_opinions=dim_opinions,
-            dissent_summary=dissent_summary,
-            remediation=synthesis # Use the LLM synthesis for remediation
-        ))
-        
-    overall_score = sum(r.final_score for r in results) / len(results) if results else 0
-    
-    # Generate Executive Summary via LLM
-    time.sleep(random.uniform(2, 5))
+def _synthesis_prompt(dim_name: str, dim_opinions: List[JudicialOpinion]) -> str:
+    opinion_text = "\n".join([f"{o.judge}: {o.argument} (Score: {o.score}; cites: {', '.join(o.cited_evidence) or 'nothing'})"
+                              for o in dim_opinions])
+    return f"Synthesize these judicial opinions for '{dim_name}'. Balance the Prosecution's rigor, the Defense's intent-based view, and the Tech Lead's pragmatism. \n\nOpinions:\n{opinion_text}\n\nProvide a final synthesis and remediation plan."
+
+def _summary_prompt(results: List[CriterionResult], overall_score: float) -> str:
     summary_context = "\n".join([f"{r.dimension_name}: {r.final_score}/5" for r in results])
-    exec_summary = model.invoke(f"Generate a professional executive summary for this AI codebase audit. Overall Score: {overall_score:.2f}/5. \n\nResults:\n{summary_context}").content
-    
+    return f"Generate a professional executive summary for this AI codebase audit. Overall Score: {overall_score:.2f}/5. \n\nResults:\n{summary_context}"
+
+def _justice_mode() -> str:
+    # "rules" (default): scores, dissent and most remediation come from the rubric's
+    # scoring rules, the model only synthesizes high-variance dimensions.
+    # "llm": every dimension and the executive summary are synthesized by the model.
+    return os.getenv("JUSTICE_MODE", "rules").lower()
+
+def _verdicts(state: AgentState) -> List[tuple]:
+    """(dimension, its opinions, verdict, whether the model synthesizes it) per rubric dimension."""
+    rules = load_scoring_rules(state.get("scoring_rules"))
+    synthesize_all = _justice_mode() == "llm"
+    verdicts = []
+    for dim in state["rubric_dimensions"]:
+        dim_opinions = [o for o in state["opinions"] if o.criterion_id == dim["id"]]
+        verdict = score_dimension(rules, dim["id"], dim_opinions)
+        verdicts.append((dim, dim_opinions, verdict, synthesize_all or needs_synthesis(rules, verdict)))
+    return verdicts
+
+def _model_if_needed(verdicts: List[tuple]):
+    # Consensus-only audits make no model call at all
+    if _justice_mode() == "llm" or any(synthesize for *_, synthesize in verdicts):
+        return get_justice_model()
+    return None
+
+def _criterion_result(dim: Dict, dim_opinions: List[JudicialOpinion], verdict: DimensionVerdict,
+                      synthesis: Optional[str]) -> CriterionResult:
+    dissent_summary = verdict.dissent_summary
+    if dissent_summary and synthesis is not None:
+        dissent_summary += " Dialectical synthesis performed to reach consensus."
+    return CriterionResult(
+        dimension_id=dim["id"],
+        dimension_name=dim["name"],
+        final_score=verdict.final_score,
+        judge_opinions=dim_opinions,
+        dissent_summary=dissent_summary,
+        # The model's synthesis where judges disagreed, the rubric template otherwise
+        remediation=synthesis if synthesis is not None else templated_remediation(dim, dim_opinions, verdict)
+    )
+
+def _overall_score(results: List[CriterionResult]) -> float:
+    return sum(r.final_score for r in results) / len(results) if results else 0
+
+def _audit_report(state: AgentState, results: List[CriterionResult], overall_score: float, exec_summary: str) -> Dict:
     report = AuditReport(
         repo_url=state["repo_url"],
         executive_summary=exec_summary,
@@ -73,5 +70,48 @@ def chief_justice_node(state: AgentState) -> Dict:
         criteria=results,
         remediation_plan="Refer to individual criterion remediation steps for detailed dialectical guidance."
     )
-    
     return {"final_report": report}
+
+def chief_justice_node(state: AgentState) -> Dict:
+    verdicts = _verdicts(state)
+    model = _model_if_needed(verdicts)
+
+    results = []
+    for dim, dim_opinions, verdict, synthesize in verdicts:
+        # Dialectical Synthesis via LLM, only where the rules cannot settle it
+        synthesis = None
+        if synthesize:
+            synthesis = invoke_model(model, _synthesis_prompt(dim["name"], dim_opinions), priority=Priority.JUSTICE).content
+        results.append(_criterion_result(dim, dim_opinions, verdict, synthesis))
+
+    overall_score = _overall_score(results)
+
+    if _justice_mode() == "llm":
+        exec_summary = invoke_model(model, _summary_prompt(results, overall_score), priority=Priority.JUSTICE).content
+    else:
+        exec_summary = templated_summary(results, overall_score)
+
+    return _audit_report(state, results, overall_score, exec_summary)
+
+async def achief_justice_node(state: AgentState) -> Dict:
+    verdicts = _verdicts(state)
+    model = _model_if_needed(verdicts)
+
+    async def synthesize_dimension(dim: Dict, dim_opinions: List[JudicialOpinion]) -> str:
+        return (await ainvoke_model(model, _synthesis_prompt(dim["name"], dim_opinions), priority=Priority.JUSTICE)).content
+
+    # The disputed dimensions are synthesized concurrently
+    syntheses = await asyncio.gather(*[synthesize_dimension(dim, dim_opinions)
+                                       for dim, dim_opinions, _, synthesize in verdicts if synthesize])
+    pending = iter(syntheses)
+    results = [_criterion_result(dim, dim_opinions, verdict, next(pending) if synthesize else None)
+               for dim, dim_opinions, verdict, synthesize in verdicts]
+
+    overall_score = _overall_score(results)
+
+    if _justice_mode() == "llm":
+        exec_summary = (await ainvoke_model(model, _summary_prompt(results, overall_score), priority=Priority.JUSTICE)).content
+    else:
+        exec_summary = templated_summary(results, overall_score)
+
+    return _audit_report(state, results, overall_score, exec_summary)
@@ -0,0 +1,148 @@
+import json
+import os
+import time
+from typing import Any, Dict, IO, List, Optional, Tuple
+from src.report import render_progress_markdown
+from src.rules import load_scoring_rules, needs_synthesis, score_dimension
+from src.state import Evidence, JudicialOpinion
+
+# Streaming mode of a single audit (main.py --stream / --events). Node updates
+# carry each detective's evidence and every node completion; judges also push
+# each opinion as a custom event the moment its criterion is judged, so early
+# criteria can be reviewed while the rest of the rubric is still being argued.
+
+STREAM_MODES = ["updates", "custom", "values"]
+PARTIAL_REPORT = "audit_report.partial.md"
+
+
+def emit(event: str, **payload) -> None:
+    """Sends a custom stream event from inside a graph node; a no-op outside a graph run."""
+    from langgraph.config import get_stream_writer
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return
+    writer({"event": event, **payload})
+
+
+class AuditProgress:
+    """Turns graph stream chunks into NDJSON events, console lines and a partial report."""
+
+    def __init__(self, report_dir: str, events_path: Optional[str] = None):
+        self.report_dir = report_dir
+        self.partial_path = os.path.join(report_dir, PARTIAL_REPORT)
+        self.state: Dict[str, Any] = {}
+        # Evidence from node updates, ahead of the super-step's merged state
+        self.evidences: Dict[str, List[Evidence]] = {}
+        self.opinions: Dict[Tuple[str, str], JudicialOpinion] = {}
+        self.scored = set()
+        self._started = time.perf_counter()
+        self._events: Optional[IO] = None
+        if events_path:
+            os.makedirs(os.path.dirname(events_path) or ".", exist_ok=True)
+            self._events = open(events_path, "w")
+
+    def _event(self, event: str, **payload) -> None:
+        if self._events is not None:
+            record = {"t": round(time.perf_counter() - self._started, 3), "event": event, **payload}
+            self._events.write(json.dumps(record, default=str) + "\n")
+            self._events.flush()
+
+    def _say(self, line: str) -> None:
+        print(line, flush=True)
+
+    def handle(self, mode: str, chunk: Any) -> None:
+        if mode == "values":
+            if not self.state:
+                self._event("audit_started", repo_url=chunk.get("repo_url"), pdf_path=chunk.get("pdf_path"))
+            self.state = chunk
+            self.evidences.update(chunk.get("evidences") or {})
+        elif mode == "custom" and chunk.get("event") == "opinion":
+            self._opinion(chunk["opinion"])
+            self._write_partial()
+        elif mode == "updates":
+            for node, update in chunk.items():
+                self._node_update(node, update or {})
+            self._write_partial()
+
+    def _node_update(self, node: str, update: Dict) -> None:
+        evidences: Dict[str, list] = update.get("evidences") or {}
+        self.evidences.update(evidences)
+        for criterion_id, items in evidences.items():
+            for evidence in items:
+                self._evidence(node, criterion_id, evidence)
+        for opinion in update.get("opinions") or []:
+            self._opinion(opinion)
+        for error in update.get("errors") or []:
+            self._event("error", node=node, message=error)
+            self._say(f"   ⚠️  {error}")
+        self._event("node_completed", node=node, evidence=sum(len(v) for v in evidences.values()),
+                    opinions=len(update.get("opinions") or []), errors=len(update.get("errors") or []))
+        found = sum(e.found for items in evidences.values() for e in items)
+        detail = f", {found}/{sum(len(v) for v in evidences.values())} evidence found" if evidences else ""
+        self._say(f"✅ {node} done ({time.perf_counter() - self._started:.1f}s{detail})")
+        report = update.get("final_report")
+        if report is not None:
+            self._event("report", overall_score=report.overall_score,
+                        criteria={c.dimension_id: c.final_score for c in report.criteria})
+
+    def _evidence(self, node: str, criterion_id: str, evidence: Evidence) -> None:
+        self._event("evidence", node=node, criterion_id=criterion_id, **evidence.model_dump(exclude={"content"}))
+
+    def _opinion(self, opinion: JudicialOpinion) -> None:
+        key = (opinion.judge, opinion.criterion_id)
+        if key in self.opinions:
+            return
+        self.opinions[key] = opinion
+        self._event("opinion", **opinion.model_dump())
+        self._score_if_complete(opinion.criterion_id)
+
+    def _score_if_complete(self, criterion_id: str) -> None:
+        rules = load_scoring_rules(self.state.get("scoring_rules"))
+        dim_opinions = [o for (_, c), o in self.opinions.items() if c == criterion_id]
+        if criterion_id in self.scored or len(dim_opinions) < len(rules.judge_weights):
+            return
+        self.scored.add(criterion_id)
+        verdict = score_dimension(rules, criterion_id, dim_opinions)
+        self._event("criterion_scored", criterion_id=criterion_id, provisional_score=verdict.final_score,
+                    scores=verdict.scores, spread=verdict.spread, rule=verdict.rule,
+                    needs_synthesis=needs_synthesis(rules, verdict))
+        scores = " ".join(f"{judge[0]}{score}" for judge, score in verdict.scores.items())
+        self._say(f"📋 {criterion_id}: provisional {verdict.final_score}/5 ({scores})"
+                  + (" — disputed, goes to synthesis" if needs_synthesis(rules, verdict) else ""))
+
+    def _write_partial(self) -> None:
+        if not self.state.get("rubric_dimensions"):
+            return
+        rules = load_scoring_rules(self.state.get("scoring_rules"))
+        opinions = list(self.opinions.values())
+        verdicts = {c: score_dimension(rules, c, [o for o in opinions if o.criterion_id == c]) for c in self.scored}
+        text = render_progress_markdown(self.state.get("repo_url", ""), self.state["rubric_dimensions"],
+                                        self.evidences, opinions, verdicts,
+                                        elapsed_s=time.perf_counter() - self._started)
+        os.makedirs(self.report_dir, exist_ok=True)
+        tmp = self.partial_path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, self.partial_path)
+
+    def finish(self, completed: bool) -> None:
+        """Closes the event log; a completed audit's partial report is superseded by the final one."""
+        self._event("audit_finished", completed=completed)
+        if self._events is not None:
+            self._events.close()
+        if completed and os.path.exists(self.partial_path):
+            os.remove(self.partial_path)
+
+
+def stream_audit(app, initial_state, config, progress: AuditProgress) -> Dict:
+    """app.invoke with progress: returns the final state."""
+    for mode, chunk in app.stream(initial_state, config, stream_mode=STREAM_MODES):
+        progress.handle(mode, chunk)
+    return progress.state
+
+
+async def astream_audit(app, initial_state, config, progress: AuditProgress) -> Dict:
+    async for mode, chunk in app.astream(initial_state, config, stream_mode=STREAM_MODES):
+        progress.handle(mode, chunk)
+    return progress.state
@@ -0,0 +1,63 @@
+import os
+from typing import Dict, List
+from src.state import AuditReport, Evidence, JudicialOpinion
+
+
+def render_report_markdown(report: AuditReport) -> str:
+    """Renders an AuditReport as the Markdown audit report."""
+    lines = [
+        f"# Audit Report for {report.repo_url}\n",
+        f"## Executive Summary\n{report.executive_summary}\n",
+        f"## Overall Score: {report.overall_score:.2f}/5\n",
+    ]
+    for criterion in report.criteria:
+        lines.append(f"### {criterion.dimension_name}")
+        lines.append(f"**Final Score: {criterion.final_score}/5**\n")
+        if criterion.dissent_summary:
+            lines.append(f"> **Dissent:** {criterion.dissent_summary}\n")
+        lines.append("#### Judicial Opinions")
+        for opt in criterion.judge_opinions:
+            lines.append(f"- **{opt.judge}**: {opt.argument} (Score: {opt.score})")
+        lines.append(f"\n#### Remediation\n{criterion.remediation}\n")
+    return "\n".join(lines) + "\n"
+
+
+def render_progress_markdown(repo_url: str, dimensions: List[Dict], evidences: Dict[str, List[Evidence]],
+                             opinions: List[JudicialOpinion], verdicts: Dict, elapsed_s: float) -> str:
+    """Renders the partial report of a running audit: opinions and provisional scores so far, then the evidence."""
+    lines = [
+        f"# Audit in progress for {repo_url}\n",
+        f"_Updated after {elapsed_s:.1f}s. Scores are provisional (rubric scoring rules) until the Chief Justice rules._\n",
+    ]
+    for dim in dimensions:
+        dim_opinions = [o for o in opinions if o.criterion_id == dim["id"]]
+        if not dim_opinions:
+            continue
+        lines.append(f"### {dim['name']}")
+        verdict = verdicts.get(dim["id"])
+        if verdict is not None:
+            lines.append(f"**Provisional Score: {verdict.final_score}/5**\n")
+            if verdict.dissent_summary:
+                lines.append(f"> **Dissent:** {verdict.dissent_summary}\n")
+        else:
+            lines.append(f"_Judged so far by {', '.join(o.judge for o in dim_opinions)}_\n")
+        for opt in dim_opinions:
+            lines.append(f"- **{opt.judge}**: {opt.argument} (Score: {opt.score})")
+        lines.append("")
+    if evidences:
+        lines.append("## Evidence Collected\n")
+        for criterion_id, items in evidences.items():
+            lines.append(f"### {criterion_id}")
+            for evidence in items:
+                lines.append(f"- {'✅' if evidence.found else '❌'} {evidence.goal} — `{evidence.location}` "
+                             f"(confidence {evidence.confidence:.2f})")
+            lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def write_report(report: AuditReport, output_file: str) -> str:
+    """Writes the Markdown audit report to disk and returns its path."""
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    with open(output_file, "w") as f:
+        f.write(render_report_markdown(report))
+    return output_file
@@ -0,0 +1,57 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional, Tuple
+
+
+class AuditResources:
+    """What an audit's nodes hold beyond their own run, e.g. the workspace lock or a throwaway clone.
+
+    Each resource is registered under a key (the checkout path) with the
+    callable that releases it. The evidence aggregator releases the checkout
+    as soon as the detectives are done; audit_resources() releases whatever
+    is left when the audit fails or is interrupted before that.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._held: List[Tuple[str, Callable[[], None]]] = []
+
+    def hold(self, key: str, release: Callable[[], None]) -> None:
+        with self._lock:
+            self._held.append((key, release))
+
+    def holds(self, key: str) -> bool:
+        with self._lock:
+            return any(k == key for k, _ in self._held)
+
+    def release(self, key: Optional[str] = None) -> None:
+        """Releases the resources under `key` (all of them when None), newest first."""
+        with self._lock:
+            released = [r for k, r in self._held if key is None or k == key]
+            self._held = [(k, r) for k, r in self._held if key is not None and k != key]
+        for release in reversed(released):
+            try:
+                release()
+            except Exception as e:
+                print(f"Failed to release audit resource: {str(e)}")
+
+
+_current: ContextVar[Optional[AuditResources]] = ContextVar("audit_resources", default=None)
+
+
+@contextmanager
+def audit_resources() -> Iterator[AuditResources]:
+    """Scope of one audit: the graph's nodes (worker threads and async tasks included) register into it."""
+    resources = AuditResources()
+    token = _current.set(resources)
+    try:
+        yield resources
+    finally:
+        _current.reset(token)
+        resources.release()
+
+
+def current_resources() -> Optional[AuditResources]:
+    """The running audit's resources; None outside audit_resources() (e.g. a bare app.invoke)."""
+    return _current.get()
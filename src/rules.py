@@ -0,0 +1,147 @@
+import json
+import math
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, model_validator
+from src.state import CriterionResult, JudicialOpinion
+
+# Machine-readable counterpart of the rubric's prose "synthesis_rules". The
+# Chief Justice scores every dimension with these rules alone; the model is
+# only asked to synthesize dimensions whose judges disagree too much.
+
+JUDGE_LABELS = {"Prosecutor": "Prosecutor", "Defense": "Defense", "TechLead": "Tech Lead"}
+# Range of a judge's score and of a criterion's final score
+MIN_SCORE, MAX_SCORE = 1, 5
+
+
+class OverrideCondition(BaseModel):
+    judge: str
+    at_most: Optional[int] = None
+    at_least: Optional[int] = None
+
+    def matches(self, scores: Dict[str, int]) -> bool:
+        score = scores.get(self.judge)
+        if score is None:
+            return False
+        return ((self.at_most is None or score <= self.at_most)
+                and (self.at_least is None or score >= self.at_least))
+
+
+class ScoreOverride(BaseModel):
+    rule: str = Field(description="Name of the synthesis rule this implements")
+    criterion_id: str
+    when: Optional[OverrideCondition] = None
+    score_from: str = Field(description="Judge whose score becomes the final score")
+    cap: Optional[int] = None
+
+
+class ScoringRules(BaseModel):
+    # Defaults reproduce the rubric's synthesis rules for rubrics without a "scoring_rules" block
+    judge_weights: Dict[str, float] = Field(default_factory=lambda: {"Prosecutor": 0.3, "Defense": 0.3, "TechLead": 0.4})
+    missing_score: int = Field(default=3, description="Score assumed for a judge without an opinion")
+    dissent_variance: int = Field(default=2, description="Score spread above which a dissent is recorded")
+    synthesis_variance: int = Field(default=2, description="Score spread above which the model synthesizes")
+    overrides: List[ScoreOverride] = Field(default_factory=lambda: [
+        ScoreOverride(rule="security_override", criterion_id="safe_tool_engineering",
+                      when=OverrideCondition(judge="Prosecutor", at_most=2), score_from="Prosecutor", cap=3),
+        ScoreOverride(rule="functionality_weight", criterion_id="graph_orchestration", score_from="TechLead"),
+    ])
+
+    @model_validator(mode="after")
+    def _check_judges(self) -> "ScoringRules":
+        # Caught when the rubric loads rather than as a KeyError halfway through an audit
+        total = sum(self.judge_weights.values())
+        if not math.isclose(total, 1.0, abs_tol=1e-6):
+            raise ValueError(f"judge_weights must sum to 1, not {total:g}")
+        for override in self.overrides:
+            judges = [override.score_from] + ([override.when.judge] if override.when else [])
+            unknown = [j for j in judges if j not in self.judge_weights]
+            if unknown:
+                raise ValueError(f"Override '{override.rule}' names judge(s) {unknown} missing from "
+                                 f"judge_weights {sorted(self.judge_weights)}")
+        return self
+
+
+class DimensionVerdict(BaseModel):
+    final_score: int
+    scores: Dict[str, int]
+    spread: int
+    rule: str = Field(description="Override applied, or 'weighted_average'")
+    dissent_summary: Optional[str] = None
+
+
+def load_scoring_rules(rubric_rules: Optional[Dict]) -> ScoringRules:
+    """Parses a rubric's "scoring_rules" block (None = built-in defaults)."""
+    return ScoringRules.model_validate(rubric_rules or {})
+
+
+def load_rubric(path: str = "src/rubric.json") -> Dict:
+    """Reads the rubric the CLI, the worker and the benchmark audit against."""
+    with open(path, "r") as f:
+        rubric = json.load(f)
+    # A broken "scoring_rules" block fails here, not in the Chief Justice after every judge ran
+    load_scoring_rules(rubric.get("scoring_rules"))
+    return rubric
+
+
+def score_dimension(rules: ScoringRules, dim_id: str, dim_opinions: List[JudicialOpinion]) -> DimensionVerdict:
+    """Final score, score spread and dissent of one dimension, without any model call."""
+    given = {o.judge: o.score for o in dim_opinions}
+    scores = {judge: given.get(judge, rules.missing_score) for judge in rules.judge_weights}
+    final_score, rule = round(sum(scores[j] * w for j, w in rules.judge_weights.items())), "weighted_average"
+    for override in rules.overrides:
+        if override.criterion_id != dim_id or scores.get(override.score_from) is None:
+            continue
+        if override.when is None or override.when.matches(scores):
+            final_score, rule = scores[override.score_from], override.rule
+            if override.cap is not None:
+                final_score = min(final_score, override.cap)
+            break
+    # Weights, caps and missing_score come from the rubric; the verdict stays on the judges' scale
+    final_score = min(MAX_SCORE, max(MIN_SCORE, final_score))
+    spread = max(scores.values()) - min(scores.values())
+    dissent_summary = None
+    if spread > rules.dissent_variance:
+        low, high = min(scores, key=scores.get), max(scores, key=scores.get)
+        dissent_summary = (f"High variance detected ({scores[low]} vs {scores[high]}): the {JUDGE_LABELS.get(low, low)} "
+                           f"scored {scores[low]} and the {JUDGE_LABELS.get(high, high)} {scores[high]}.")
+    return DimensionVerdict(final_score=final_score, scores=scores, spread=spread, rule=rule,
+                            dissent_summary=dissent_summary)
+
+
+def needs_synthesis(rules: ScoringRules, verdict: DimensionVerdict) -> bool:
+    return verdict.spread > rules.synthesis_variance
+
+
+def templated_remediation(dim: Dict, dim_opinions: List[JudicialOpinion], verdict: DimensionVerdict) -> str:
+    """Remediation for a low-variance dimension, built from the rubric patterns and the harshest opinion."""
+    lines = []
+    if verdict.final_score >= 4:
+        lines.append(f"Meets the bar: {dim.get('success_pattern', 'see the rubric success pattern')}")
+    else:
+        lines.append(f"Target: {dim.get('success_pattern', 'see the rubric success pattern')}")
+        if dim.get("failure_pattern"):
+            lines.append(f"Avoid: {dim['failure_pattern']}")
+    if dim_opinions:
+        harshest = min(dim_opinions, key=lambda o: o.score)
+        cited = f" (evidence: {', '.join(harshest.cited_evidence)})" if harshest.cited_evidence else ""
+        lines.append(f"Main concern from the {JUDGE_LABELS.get(harshest.judge, harshest.judge)}: {harshest.argument}{cited}")
+    if verdict.rule != "weighted_average":
+        lines.append(f"Score set by the '{verdict.rule}' rule.")
+    return "\n".join(f"- {line}" for line in lines)
+
+
+def templated_summary(results: List[CriterionResult], overall_score: float) -> str:
+    """Executive summary from the scored criteria, without a model call."""
+    if not results:
+        return "No rubric criteria were scored."
+    ranked = sorted(results, key=lambda r: r.final_score)
+    strongest = [r.dimension_name for r in results if r.final_score == ranked[-1].final_score]
+    weakest = [r.dimension_name for r in results if r.final_score == ranked[0].final_score]
+    disputed = [r.dimension_name for r in results if r.dissent_summary]
+    lines = [f"The submission scores {overall_score:.2f}/5 across {len(results)} rubric criteria.",
+             f"Strongest: {', '.join(strongest)} ({ranked[-1].final_score}/5)."]
+    if ranked[0].final_score < ranked[-1].final_score:
+        lines.append(f"Weakest: {', '.join(weakest)} ({ranked[0].final_score}/5); see their remediation steps first.")
+    if disputed:
+        lines.append(f"The judges disagreed sharply on {', '.join(disputed)}; those criteria carry a dissent explanation.")
+    return " ".join(lines)
@@ -4,6 +4,8 @@ from typing import Annotated, Dict, List, Literal, Optional, Union
 from pydantic import BaseModel, Field
 from typing_extensions import TypedDict
 
+from src.tools.repo_index import RepoIndex
+
 
 # --- Detective Output ---
 
@@ -33,6 +35,12 @@ class JudicialOpinion(BaseModel):
     cited_evidence: List[str]
 
 
+class JudicialOpinionBatch(BaseModel):
+    opinions: List[JudicialOpinion] = Field(
+        description="Exactly one opinion per rubric criterion",
+    )
+
+
 # --- Chief Justice Output ---
 
 
@@ -66,6 +74,12 @@ class AgentState(TypedDict):
     repo_url: str
     pdf_path: str
     rubric_dimensions: List[Dict]
+    # The rubric's machine-readable "scoring_rules" (None = built-in defaults)
+    scoring_rules: Optional[Dict]
+    # Built once by the repo indexer and read by every detective
+    repo_index: Optional[RepoIndex]
+    # Report path mentions (path -> citing pages), verified against the index after the fan-in
+    claimed_paths: Optional[Dict[str, List[int]]]
     # Use reducers to prevent parallel agents
     # from overwriting data
     evidences: Annotated[
@@ -1,37 +1,186 @@
-from pypdf import PdfReader
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+import hashlib
+import json
 import os
+import threading
+import time
+from src.tools.process_pool import pool_map
+from src.tools.text_matcher import MultiPatternMatcher, TermHits, TextMatch, find_paths
+
+DEFAULT_PDF_CACHE_DIR = ".auditor_cache/pdf_text"
+# Disk cache bounds: documents unused for the max age go, then the least recently used beyond max entries
+DEFAULT_PDF_CACHE_MAX_ENTRIES = 1000
+DEFAULT_PDF_CACHE_MAX_AGE_DAYS = 30
+# A disk hit refreshes the file's mtime (its LRU timestamp) only when it is older than this
+ACCESS_REFRESH_S = 600
+# Pages per worker task; below two chunks the pool is not worth starting
+PAGES_PER_CHUNK = 8
+MIN_PARALLEL_CHUNKS = 2
+# Recently extracted documents kept in memory for repeated consumers within a run
+MEMORY_CACHE_SIZE = 16
+
+_memory_cache: "OrderedDict[str, List[str]]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _page_count(pdf_path: str) -> int:
+    # pypdf is imported here rather than at module load: only PDF extraction needs it
+    from pypdf import PdfReader
+    return len(PdfReader(pdf_path).pages)
+
+
+def _extract_page_range(task: Tuple[str, int, int]) -> List[str]:
+    # Runs in a worker process: each task opens its own reader
+    from pypdf import PdfReader
+    pdf_path, start, stop = task
+    reader = PdfReader(pdf_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _disk_cache_path(digest: str) -> Optional[str]:
+    if os.getenv("PDF_TEXT_CACHE", "on").lower() in ("off", "0", "false"):
+        return None
+    return os.path.join(os.getenv("PDF_TEXT_CACHE_DIR", DEFAULT_PDF_CACHE_DIR), f"{digest}.json")
+
+
+def _cached_pages(digest: str) -> Optional[List[str]]:
+    with _memory_lock:
+        if digest in _memory_cache:
+            _memory_cache.move_to_end(digest)
+            return _memory_cache[digest]
+    path = _disk_cache_path(digest)
+    if path is None or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            pages = json.load(f)
+    except (OSError, ValueError):
+        return None
+    _touch(path)
+    _remember(digest, pages)
+    return pages
+
+
+def _touch(path: str) -> None:
+    try:
+        if time.time() - os.path.getmtime(path) > ACCESS_REFRESH_S:
+            os.utime(path)
+    except OSError:
+        pass
+
+
+def _remember(digest: str, pages: List[str]) -> None:
+    with _memory_lock:
+        _memory_cache[digest] = pages
+        _memory_cache.move_to_end(digest)
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def clear_memory_cache() -> None:
+    """Forgets in-memory extractions (the disk cache is untouched), e.g. between benchmark runs."""
+    with _memory_lock:
+        _memory_cache.clear()
+
+
+def _store_pages(digest: str, pages: List[str]) -> None:
+    _remember(digest, pages)
+    path = _disk_cache_path(digest)
+    if path is None:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(pages, f)
+    os.replace(tmp_path, path)
+    _evict_pages(os.path.dirname(path))
+
+
+def _evict_pages(cache_dir: str) -> None:
+    """Bounds the disk cache (PDF_TEXT_CACHE_MAX_ENTRIES, PDF_TEXT_CACHE_MAX_AGE_DAYS) after each new document."""
+    max_entries = int(os.getenv("PDF_TEXT_CACHE_MAX_ENTRIES", DEFAULT_PDF_CACHE_MAX_ENTRIES))
+    max_age_s = float(os.getenv("PDF_TEXT_CACHE_MAX_AGE_DAYS", DEFAULT_PDF_CACHE_MAX_AGE_DAYS)) * 86400
+    now = time.time()
+    try:
+        # Most recently used first; another process may be evicting the same files
+        entries = sorted(((e.stat().st_mtime, e.path) for e in os.scandir(cache_dir) if e.name.endswith(".json")),
+                         reverse=True)
+    except OSError:
+        return
+    for rank, (mtime, path) in enumerate(entries):
+        if rank >= max_entries or now - mtime > max_age_s:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
 
 class DocTools:
+    @staticmethod
+    def iter_pdf_pages(pdf_path: str) -> Iterator[str]:
+        """Yields the text of each page lazily (a text/markdown file is a single page).
+
+        Pages come from the per-file cache (keyed by content hash) when the
+        document was extracted before; otherwise page ranges are extracted in
+        the shared process pool for long PDFs, and the result is cached once
+        the iterator has been fully consumed.
+        """
+        if not pdf_path.lower().endswith(".pdf"):
+            # Assume text/markdown
+            with open(pdf_path, "r", encoding="utf-8") as f:
+                yield f.read()
+            return
+
+        digest = _file_hash(pdf_path)
+        cached = _cached_pages(digest)
+        if cached is not None:
+            yield from cached
+            return
+
+        page_count = _page_count(pdf_path)
+        tasks = [(pdf_path, start, min(start + PAGES_PER_CHUNK, page_count))
+                 for start in range(0, page_count, PAGES_PER_CHUNK)]
+        pages = []
+        for chunk in pool_map(_extract_page_range, tasks, min_items=MIN_PARALLEL_CHUNKS):
+            for page_text in chunk:
+                pages.append(page_text)
+                yield page_text
+        _store_pages(digest, pages)
+
     @staticmethod
     def extract_text_from_pdf(pdf_path: str) -> str:
         """Extracts text from a PDF or text/markdown file."""
-        text = ""
         if not os.path.exists(pdf_path):
             return "File not found."
-        
-        if pdf_path.lower().endswith(".pdf"):
-            reader = PdfReader(pdf_path)
-            for page in reader.pages:
-                text += page.extract_text() or ""
-        else:
-            # Assume text/markdown
-            with open(pdf_path, "r", encoding="utf-8") as f:
-                text = f.read()
-        return text
+        return "\n".join(DocTools.iter_pdf_pages(pdf_path))
 
     @staticmethod
     def search_keywords(text: str, keywords: List[str]) -> Dict[str, bool]:
         """Searches for keywords in the text."""
-        results = {}
-        for keyword in keywords:
-            results[keyword] = keyword.lower() in text.lower()
-        return results
+        hits = MultiPatternMatcher(keywords).scan(text)
+        return {keyword: hits[keyword].count > 0 for keyword in hits}
+
+    @staticmethod
+    def locate_keywords(pages: Iterable[str], keywords: List[str]) -> Dict[str, TermHits]:
+        """Counts, page numbers and offsets (with context) of every keyword, in a single pass."""
+        return MultiPatternMatcher(keywords).scan_pages(pages)
+
+    @staticmethod
+    def locate_file_paths(pages: Iterable[str]) -> List[TextMatch]:
+        """Path-like mentions with their page, offset and context, in reading order."""
+        return find_paths(pages)
 
     @staticmethod
     def extract_file_paths(text: str) -> List[str]:
         """Simple heuristic to extract potential file paths from text."""
-        import re
-        # This regex looks for path-like strings (e.g., src/main.py, ./README.md)
-        path_pattern = r'[a-zA-Z0-9_\-\./]+\.[a-zA-Z0-9]+'
-        return list(set(re.findall(path_pattern, text)))
+        # Sorted so the evidence (and every prompt built from it) is stable across runs
+        return sorted({m.text for m in find_paths([text])})
@@ -0,0 +1,202 @@
+import statistics
+import subprocess
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+from pydantic import BaseModel, Field
+
+RECORD_SEP, FIELD_SEP = "\x1e", "\x1f"
+LOG_FORMAT = f"{RECORD_SEP}%H{FIELD_SEP}%aI{FIELD_SEP}%an{FIELD_SEP}%s"
+# A pause longer than this starts a new working session
+SESSION_GAP_SECONDS = 2 * 3600
+# Gaps shorter than this are "rapid-fire" commits
+BURST_SECONDS = 300
+# A commit carrying at least this share of all changed lines dominates the history
+BULK_LINE_SHARE = 0.8
+HEAD_TAIL = 5
+TOP_AUTHORS = 10
+# Beyond this many active weeks the frequency histogram is rolled up per year
+MAX_WEEKS_SHOWN = 26
+
+
+class CommitRecord(BaseModel):
+    hash: str
+    date: str
+    author: str
+    subject: str
+    files_changed: Optional[int] = None
+    insertions: Optional[int] = None
+    deletions: Optional[int] = None
+
+
+class CommitHistorySummary(BaseModel):
+    """Compact, structured view of a repository's history (no raw log)."""
+
+    total_commits: int = 0
+    first_commit: Optional[str] = None
+    last_commit: Optional[str] = None
+    span_hours: float = 0.0
+    active_days: int = 0
+    commits_per_week: Dict[str, int] = Field(default_factory=dict, description="ISO week (YYYY-Www) -> commits")
+    sessions: int = 0
+    median_gap_minutes: Optional[float] = None
+    longest_gap_hours: Optional[float] = None
+    rapid_fire_share: float = Field(default=0.0, description="Share of gaps under 5 minutes")
+    authors: Dict[str, int] = Field(default_factory=dict)
+    line_stats: Optional[str] = Field(default=None, description="numstat, files or None: what --numstat data was read")
+    files_changed: Optional[int] = None
+    insertions: Optional[int] = None
+    deletions: Optional[int] = None
+    largest_commit: Optional[CommitRecord] = None
+    largest_commit_share: Optional[float] = None
+    first_subjects: List[str] = Field(default_factory=list)
+    last_subjects: List[str] = Field(default_factory=list)
+    bulk_dump: bool = False
+    bulk_dump_reasons: List[str] = Field(default_factory=list)
+
+    def summary(self) -> str:
+        if not self.total_commits:
+            return "No commit history available."
+        lines = [
+            f"{self.total_commits} commits by {len(self.authors)} author(s) from {self.first_commit} to {self.last_commit} "
+            f"({self.span_hours:.1f} h, {self.active_days} active days, {self.sessions} work sessions).",
+            _frequency_line(self.commits_per_week),
+        ]
+        if self.median_gap_minutes is not None:
+            lines.append(f"Median gap {self.median_gap_minutes:.1f} min, longest gap {self.longest_gap_hours:.1f} h, "
+                         f"{self.rapid_fire_share:.0%} of gaps under {BURST_SECONDS // 60} min.")
+        lines.append(f"Authors: {self.authors}")
+        if self.line_stats == "numstat":
+            lines.append(f"Lines: +{self.insertions} / -{self.deletions} across {self.files_changed} file changes.")
+        elif self.line_stats == "files":
+            lines.append(f"{self.files_changed} file changes (line counts not fetched for partial clones).")
+        if self.largest_commit is not None and self.largest_commit_share is not None:
+            lines.append(f"Largest commit: {self.largest_commit.hash[:8]} '{self.largest_commit.subject}' "
+                         f"({self.largest_commit_share:.0%} of all changes).")
+        lines.append("First commits: " + " | ".join(self.first_subjects))
+        if self.last_subjects:
+            lines.append("Latest commits: " + " | ".join(self.last_subjects))
+        lines.append(f"Bulk dump: {self.bulk_dump}" + (f" ({'; '.join(self.bulk_dump_reasons)})" if self.bulk_dump_reasons else ""))
+        return "\n".join(lines)
+
+
+def _frequency_line(per_week: Dict[str, int]) -> str:
+    if len(per_week) <= MAX_WEEKS_SHOWN:
+        return f"Commits per week: {per_week}"
+    # Long histories are shown per year instead, to keep the evidence compact
+    per_year = Counter()
+    for week, count in per_week.items():
+        per_year[week[:4]] += count
+    return f"Commits per year: {dict(sorted(per_year.items()))} (active in {len(per_week)} weeks)"
+
+
+def iter_commits(repo_path: str, line_stats: Optional[str] = "numstat") -> Iterator[CommitRecord]:
+    """Streams commits oldest first from a single `git log` subprocess.
+
+    line_stats: "numstat" (insertions/deletions, needs blobs), "files" (changed
+    file count from trees only, cheap on blobless clones) or None.
+    """
+    command = ["git", "-C", repo_path, "log", "--reverse", "--no-color", f"--format={LOG_FORMAT}"]
+    if line_stats == "numstat":
+        command.append("--numstat")
+    elif line_stats == "files":
+        command.append("--name-only")
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                          text=True, encoding="utf-8", errors="replace") as proc:
+        current: Optional[CommitRecord] = None
+        for raw in proc.stdout:
+            line = raw.rstrip("\n")
+            if line.startswith(RECORD_SEP):
+                if current is not None:
+                    yield current
+                sha, date, author, subject = (line[1:].split(FIELD_SEP) + ["", "", ""])[:4]
+                current = CommitRecord(hash=sha, date=date, author=author, subject=subject)
+                if line_stats:
+                    current.files_changed = 0
+                if line_stats == "numstat":
+                    current.insertions = current.deletions = 0
+            elif line and current is not None and line_stats:
+                current.files_changed += 1
+                if line_stats == "numstat":
+                    added, deleted = (line.split("\t") + ["", ""])[:2]
+                    # Binary files report "-"
+                    current.insertions += int(added) if added.isdigit() else 0
+                    current.deletions += int(deleted) if deleted.isdigit() else 0
+        if current is not None:
+            yield current
+    if proc.returncode not in (0, None):
+        raise RuntimeError(f"git log exited with status {proc.returncode}")
+
+
+def _changed(commit: CommitRecord, line_stats: Optional[str]) -> int:
+    if line_stats == "numstat":
+        return (commit.insertions or 0) + (commit.deletions or 0)
+    return commit.files_changed or 0
+
+
+def summarize_history(commits: Iterator[CommitRecord], line_stats: Optional[str] = "numstat") -> CommitHistorySummary:
+    """Folds a commit stream into a CommitHistorySummary without keeping the commits."""
+    summary = CommitHistorySummary(line_stats=line_stats)
+    timestamps: List[float] = []
+    weeks, days, authors = Counter(), set(), Counter()
+    last_subjects = deque(maxlen=HEAD_TAIL)
+    total_changed = 0
+    for commit in commits:
+        summary.total_commits += 1
+        try:
+            when = datetime.fromisoformat(commit.date)
+        except ValueError:
+            when = None
+        if when is not None:
+            timestamps.append(when.timestamp())
+            year, week, _ = when.isocalendar()
+            weeks[f"{year}-W{week:02d}"] += 1
+            days.add(when.date())
+        authors[commit.author] += 1
+        if len(summary.first_subjects) < HEAD_TAIL:
+            summary.first_subjects.append(commit.subject)
+        else:
+            last_subjects.append(commit.subject)
+        if line_stats:
+            summary.files_changed = (summary.files_changed or 0) + (commit.files_changed or 0)
+        if line_stats == "numstat":
+            summary.insertions = (summary.insertions or 0) + (commit.insertions or 0)
+            summary.deletions = (summary.deletions or 0) + (commit.deletions or 0)
+        changed = _changed(commit, line_stats)
+        total_changed += changed
+        if line_stats and (summary.largest_commit is None or changed > _changed(summary.largest_commit, line_stats)):
+            summary.largest_commit = commit
+
+    summary.last_subjects = list(last_subjects)
+    summary.commits_per_week = dict(sorted(weeks.items()))
+    summary.active_days = len(days)
+    summary.authors = dict(authors.most_common(TOP_AUTHORS))
+    if timestamps:
+        timestamps.sort()
+        to_iso = lambda ts: datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+        summary.first_commit, summary.last_commit = to_iso(timestamps[0]), to_iso(timestamps[-1])
+        summary.span_hours = round((timestamps[-1] - timestamps[0]) / 3600, 2)
+        gaps = [b - a for a, b in zip(timestamps, timestamps[1:])]
+        summary.sessions = 1 + sum(g > SESSION_GAP_SECONDS for g in gaps)
+        if gaps:
+            summary.median_gap_minutes = round(statistics.median(gaps) / 60, 2)
+            summary.longest_gap_hours = round(max(gaps) / 3600, 2)
+            summary.rapid_fire_share = round(sum(g < BURST_SECONDS for g in gaps) / len(gaps), 3)
+    if summary.largest_commit is not None and total_changed:
+        summary.largest_commit_share = round(_changed(summary.largest_commit, line_stats) / total_changed, 3)
+    summary.bulk_dump_reasons = _bulk_dump_reasons(summary)
+    summary.bulk_dump = bool(summary.bulk_dump_reasons)
+    return summary
+
+
+def _bulk_dump_reasons(summary: CommitHistorySummary) -> List[str]:
+    reasons = []
+    if summary.total_commits == 1:
+        reasons.append("single commit")
+    elif summary.total_commits > 1 and summary.span_hours < 1:
+        reasons.append(f"all {summary.total_commits} commits within one hour")
+    if summary.total_commits > 2 and summary.rapid_fire_share >= 0.9:
+        reasons.append(f"{summary.rapid_fire_share:.0%} of commits less than {BURST_SECONDS // 60} min apart")
+    if summary.total_commits > 1 and (summary.largest_commit_share or 0) >= BULK_LINE_SHARE:
+        reasons.append(f"one commit carries {summary.largest_commit_share:.0%} of all changes")
+    return reasons
@@ -0,0 +1,15 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def git_repo_class():
+    """GitPython's Repo, imported on first use; None when GitPython (or a git binary) is unavailable.
+
+    Importing GitPython costs ~0.1s, which commands that never touch a
+    repository (--help, --dry-run, the worker's HTTP API) should not pay.
+    """
+    try:
+        from git import Repo
+    except (ImportError, Exception):
+        return None
+    return Repo
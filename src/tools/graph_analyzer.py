@@ -0,0 +1,234 @@
+import ast
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from pydantic import BaseModel, Field
+from src.tools.process_pool import pool_map
+
+# Below this many files the pool's start-up and pickling cost more than the parse
+MIN_PARALLEL_FILES = 64
+GRAPH_METHODS = {"add_node", "add_edge", "add_conditional_edges", "set_entry_point", "set_finish_point"}
+ENTRY, EXIT = "START", "END"
+
+class GraphEdge(BaseModel):
+    source: str
+    target: str
+    file: str
+    line: int
+
+
+class ConditionalEdge(BaseModel):
+    source: str
+    router: str
+    targets: List[str] = Field(default_factory=list, description="Empty when the path map could not be resolved statically")
+    file: str
+    line: int
+
+
+class StateReducer(BaseModel):
+    state: str
+    field: str
+    reducer: str
+    file: str
+
+
+class GraphModel(BaseModel):
+    """LangGraph topology recovered statically from a repository's sources."""
+
+    stategraph_found: bool = False
+    state_classes: List[str] = Field(default_factory=list)
+    nodes: List[str] = Field(default_factory=list)
+    edges: List[GraphEdge] = Field(default_factory=list)
+    conditional_edges: List[ConditionalEdge] = Field(default_factory=list)
+    send_targets: List[str] = Field(default_factory=list)
+    send_used: bool = False
+    reducers: List[StateReducer] = Field(default_factory=list)
+    fan_out: Dict[str, int] = Field(default_factory=dict)
+    fan_in: Dict[str, int] = Field(default_factory=dict)
+    parallel_execution: bool = False
+    files_analyzed: int = 0
+    parse_errors: List[str] = Field(default_factory=list)
+
+    def summary(self) -> str:
+        """Compact textual rendering used as evidence content for the judges."""
+        lines = [
+            f"StateGraph found: {self.stategraph_found} (state: {', '.join(self.state_classes) or 'unknown'})",
+            f"Nodes ({len(self.nodes)}): {', '.join(self.nodes) or 'none'}",
+            f"Edges ({len(self.edges)}): " + (", ".join(f"{e.source} -> {e.target}" for e in self.edges) or "none"),
+        ]
+        for edge in self.conditional_edges:
+            targets = ", ".join(edge.targets) or "dynamic"
+            lines.append(f"Conditional: {edge.source} --{edge.router}--> [{targets}]")
+        if self.send_used:
+            lines.append(f"Send API used (targets: {', '.join(self.send_targets) or 'dynamic'})")
+        for r in self.reducers:
+            lines.append(f"Reducer: {r.state}.{r.field} uses {r.reducer}")
+        fan_out = {n: d for n, d in self.fan_out.items() if d > 1}
+        fan_in = {n: d for n, d in self.fan_in.items() if d > 1}
+        lines.append(f"Fan-out > 1: {fan_out or 'none'}; fan-in > 1: {fan_in or 'none'}")
+        lines.append(f"Parallel execution: {self.parallel_execution}")
+        return "\n".join(lines)
+
+
+# --- Per-file extraction (runs inside worker processes) ---
+
+def _constants(tree: ast.Module) -> Dict[str, str]:
+    # Module-level NAME = "node_name" assignments, so add_edge(NAME, ...) resolves
+    names = {"START": ENTRY, "END": EXIT}
+    for stmt in tree.body:
+        if isinstance(stmt, ast.Assign) and isinstance(stmt.value, ast.Constant) and isinstance(stmt.value.value, str):
+            for target in stmt.targets:
+                if isinstance(target, ast.Name):
+                    names[target.id] = stmt.value.value
+    return names
+
+
+def _callee_name(node: ast.AST) -> str:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return ""
+
+
+def _label(node: ast.AST, names: Dict[str, str]) -> str:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.Name) and node.id in names:
+        return names[node.id]
+    if isinstance(node, ast.Attribute) and node.attr in ("START", "END"):
+        return names[node.attr]
+    return ast.unparse(node)
+
+
+def _labels(node: ast.AST, names: Dict[str, str]) -> List[str]:
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return [_label(e, names) for e in node.elts]
+    return [_label(node, names)]
+
+
+def _arg(call: ast.Call, position: int, keyword: str) -> Optional[ast.AST]:
+    if len(call.args) > position:
+        return call.args[position]
+    return next((k.value for k in call.keywords if k.arg == keyword), None)
+
+
+def _path_targets(path_map: Optional[ast.AST], names: Dict[str, str]) -> List[str]:
+    if isinstance(path_map, ast.Dict):
+        return [_label(v, names) for v in path_map.values]
+    if isinstance(path_map, (ast.List, ast.Tuple, ast.Set)):
+        return _labels(path_map, names)
+    return []
+
+
+def _reducers(cls: ast.ClassDef, file: str) -> List[Dict]:
+    found = []
+    for stmt in cls.body:
+        if not (isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name)):
+            continue
+        ann = stmt.annotation
+        if isinstance(ann, ast.Subscript) and _callee_name(ann.value) == "Annotated" and isinstance(ann.slice, ast.Tuple):
+            metadata = ann.slice.elts[1:]
+            if metadata:
+                found.append({"state": cls.name, "field": stmt.target.id,
+                              "reducer": ", ".join(ast.unparse(m) for m in metadata), "file": file})
+    return found
+
+
+def analyze_source(item: Tuple[str, str]) -> Dict:
+    """Extracts graph facts from one file. Returns plain data so it pickles cheaply."""
+    path, source = item
+    facts = {"path": path, "stategraph": False, "state_classes": [], "nodes": [], "edges": [],
+             "conditional_edges": [], "send_targets": [], "send_used": False, "reducers": [], "error": None}
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        facts["error"] = f"{path}: {e}"
+        return facts
+    names = _constants(tree)
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            facts["reducers"].extend(_reducers(node, path))
+            continue
+        if not isinstance(node, ast.Call):
+            continue
+        callee = _callee_name(node.func)
+        if callee == "StateGraph":
+            facts["stategraph"] = True
+            if node.args:
+                facts["state_classes"].append(ast.unparse(node.args[0]))
+        elif callee == "Send":
+            facts["send_used"] = True
+            target = _arg(node, 0, "node")
+            if target is not None:
+                facts["send_targets"].append(_label(target, names))
+        elif callee in GRAPH_METHODS and isinstance(node.func, ast.Attribute):
+            _graph_call(node, callee, names, path, facts)
+    return facts
+
+
+def _graph_call(node: ast.Call, method: str, names: Dict[str, str], path: str, facts: Dict) -> None:
+    first = _arg(node, 0, "node" if method in ("add_node", "set_entry_point", "set_finish_point") else
+                 "start_key" if method == "add_edge" else "source")
+    if first is None:
+        return
+    if method == "add_node":
+        # add_node(fn) names the node after the function
+        facts["nodes"].append(_label(first, names) if len(node.args) > 1 or node.keywords
+                              else _callee_name(first) or ast.unparse(first))
+    elif method == "add_edge":
+        second = _arg(node, 1, "end_key")
+        if second is None:
+            return
+        for source in _labels(first, names):
+            facts["edges"].append({"source": source, "target": _label(second, names), "file": path, "line": node.lineno})
+    elif method == "add_conditional_edges":
+        router = _arg(node, 1, "path")
+        facts["conditional_edges"].append({
+            "source": _label(first, names),
+            "router": ast.unparse(router) if router is not None else "unknown",
+            "targets": _path_targets(_arg(node, 2, "path_map"), names),
+            "file": path,
+            "line": node.lineno,
+        })
+    elif method == "set_entry_point":
+        facts["edges"].append({"source": ENTRY, "target": _label(first, names), "file": path, "line": node.lineno})
+    elif method == "set_finish_point":
+        facts["edges"].append({"source": _label(first, names), "target": EXIT, "file": path, "line": node.lineno})
+
+
+# --- Fan-out over processes and merge ---
+
+def _degrees(edges: Iterable[Tuple[str, str]]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    targets, sources = defaultdict(set), defaultdict(set)
+    for source, target in edges:
+        targets[source].add(target)
+        sources[target].add(source)
+    return {n: len(t) for n, t in targets.items()}, {n: len(s) for n, s in sources.items()}
+
+
+def analyze_sources(sources: Dict[str, str]) -> GraphModel:
+    """Builds the GraphModel for a set of Python sources (path -> text)."""
+    model = GraphModel(files_analyzed=len(sources))
+    for facts in pool_map(analyze_source, sorted(sources.items()), min_items=MIN_PARALLEL_FILES):
+        if facts["error"]:
+            model.parse_errors.append(facts["error"])
+            continue
+        model.stategraph_found = model.stategraph_found or facts["stategraph"]
+        model.send_used = model.send_used or facts["send_used"]
+        model.state_classes.extend(c for c in facts["state_classes"] if c not in model.state_classes)
+        model.nodes.extend(n for n in facts["nodes"] if n not in model.nodes)
+        model.send_targets.extend(t for t in facts["send_targets"] if t not in model.send_targets)
+        model.edges.extend(GraphEdge(**e) for e in facts["edges"])
+        model.conditional_edges.extend(ConditionalEdge(**e) for e in facts["conditional_edges"])
+        model.reducers.extend(StateReducer(**r) for r in facts["reducers"])
+
+    # Static edges all fire; a conditional edge picks among its targets, so it
+    # only counts towards fan-in. Send fans out to N copies at runtime.
+    model.fan_out, _ = _degrees((e.source, e.target) for e in model.edges)
+    _, model.fan_in = _degrees(
+        [(e.source, e.target) for e in model.edges]
+        + [(c.source, t) for c in model.conditional_edges for t in c.targets]
+    )
+    model.parallel_execution = model.send_used or any(d > 1 for d in model.fan_out.values())
+    return model
@@ -0,0 +1,136 @@
+import difflib
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+# Mentions without a slash only count as file paths when they carry one of these extensions
+FILE_EXTENSIONS = {"py", "md", "json", "toml", "txt", "yaml", "yml", "cfg", "ini", "ipynb", "sh",
+                   "js", "ts", "tsx", "jsx", "html", "css", "rst", "lock", "env", "example", "pdf", "png", "jpg"}
+# First components that mark a URL or domain rather than a repository path
+DOMAIN_SUFFIXES = (".com", ".org", ".io", ".net", ".dev", ".ai", ".edu", ".gov", ".co")
+MAX_SUGGESTIONS = 3
+SUGGESTION_CUTOFF = 0.75
+_LEAF = ""
+
+
+class VerifiedPath(BaseModel):
+    claimed: str
+    matched: List[str]
+    match_type: str = Field(description="exact or suffix")
+
+
+class UnverifiedPath(BaseModel):
+    claimed: str
+    pages: List[int] = Field(default_factory=list)
+    suggestions: List[str] = Field(default_factory=list, description="Near-miss repository paths")
+
+
+class PathVerification(BaseModel):
+    verified: List[VerifiedPath] = Field(default_factory=list)
+    hallucinated: List[UnverifiedPath] = Field(default_factory=list)
+    ignored: List[str] = Field(default_factory=list, description="Mentions that are not repository file paths")
+
+    def summary(self) -> str:
+        lines = [f"Verified paths ({len(self.verified)}):"]
+        for v in self.verified:
+            via = "" if v.match_type == "exact" else f" -> {', '.join(v.matched)}"
+            lines.append(f"  {v.claimed}{via}")
+        lines.append(f"Hallucinated paths ({len(self.hallucinated)}):")
+        for h in self.hallucinated:
+            hint = f" (did you mean: {', '.join(h.suggestions)})" if h.suggestions else ""
+            lines.append(f"  {h.claimed}{hint}")
+        return "\n".join(lines)
+
+
+def normalize_path(claimed: str) -> str:
+    path = claimed.strip().strip("'\"`").replace("\\", "/").rstrip(".,;:)")
+    path = re.sub(r"/{2,}", "/", path)
+    while path.startswith("./"):
+        path = path[2:]
+    return path.lstrip("/")
+
+
+def is_file_path(path: str) -> bool:
+    if not path or path.startswith("../"):
+        return False
+    first = path.split("/", 1)[0].lower()
+    if "/" in path and first.endswith(DOMAIN_SUFFIXES):
+        return False
+    extension = path.rsplit(".", 1)[-1].lower() if "." in os.path.basename(path) else ""
+    return "/" in path or extension in FILE_EXTENSIONS
+
+
+class PathVerifier:
+    """Checks claimed paths against a repository file list in bulk.
+
+    Paths are stored in a trie of reversed path components, so a claim is
+    resolved by walking its own components from the file name up: exact
+    matches, claims that are a suffix of a repo path ("nodes/judges.py") and
+    claims that carry extra leading directories ("my-repo/src/graph.py")
+    each cost one walk regardless of repository size.
+    """
+
+    def __init__(self, repo_paths: Iterable[str]):
+        self._path_set = set(repo_paths)
+        self.paths = sorted(self._path_set)
+        self._trie: Dict = {}
+        self._by_basename: Dict[str, List[str]] = {}
+        for path in self.paths:
+            node = self._trie
+            for part in reversed(path.split("/")):
+                node = node.setdefault(part, {})
+            node.setdefault(_LEAF, []).append(path)
+            self._by_basename.setdefault(os.path.basename(path).lower(), []).append(path)
+
+    def lookup(self, path: str) -> Tuple[List[str], Optional[str]]:
+        """Returns (matching repo paths, match type) for a normalized path."""
+        if path in self._path_set:
+            return [path], "exact"
+        node, longest_suffix = self._trie, None
+        for depth, part in enumerate(reversed(path.split("/")), start=1):
+            if part not in node:
+                break
+            node = node[part]
+            if _LEAF in node and depth > 1:
+                # A repo path that is a suffix of the claim (extra leading dirs in the report);
+                # a bare root file name is too weak to vouch for "docs/README.md"
+                longest_suffix = node[_LEAF]
+        else:
+            # Every component matched: the claim is a suffix of these repo paths
+            return self._under(node), "suffix"
+        return (longest_suffix, "suffix") if longest_suffix else ([], None)
+
+    def _under(self, node: Dict) -> List[str]:
+        found, stack = [], [node]
+        while stack:
+            current = stack.pop()
+            for key, child in current.items():
+                if key == _LEAF:
+                    found.extend(child)
+                else:
+                    stack.append(child)
+        return sorted(found)
+
+    def suggestions(self, path: str) -> List[str]:
+        """Near misses: repo paths with a similar file name, ranked by whole-path similarity."""
+        basename = os.path.basename(path).lower()
+        close_names = difflib.get_close_matches(basename, self._by_basename, n=MAX_SUGGESTIONS, cutoff=SUGGESTION_CUTOFF)
+        candidates = [p for name in close_names for p in self._by_basename[name]]
+        candidates.sort(key=lambda p: difflib.SequenceMatcher(None, path, p).ratio(), reverse=True)
+        return candidates[:MAX_SUGGESTIONS]
+
+    def verify(self, claims: Dict[str, List[int]]) -> PathVerification:
+        """Verifies every claimed path (mapped to the report pages citing it)."""
+        result = PathVerification()
+        for claimed, pages in claims.items():
+            path = normalize_path(claimed)
+            if not is_file_path(path):
+                result.ignored.append(claimed)
+                continue
+            matched, match_type = self.lookup(path)
+            if matched:
+                result.verified.append(VerifiedPath(claimed=claimed, matched=matched, match_type=match_type))
+            else:
+                result.hallucinated.append(UnverifiedPath(claimed=claimed, pages=pages, suggestions=self.suggestions(path)))
+        return result
@@ -0,0 +1,62 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Shared by the CPU-bound collectors (AST analysis, PDF page extraction) so a
+# batch run keeps one set of warm worker processes instead of one per audit.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# Workers are started from a clean server process: forking a process that runs
+# audit threads would copy locks some other thread held at that moment
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def worker_count() -> int:
+    return int(os.getenv("AUDITOR_WORKERS", 0)) or (os.cpu_count() or 1)
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=worker_count(), mp_context=multiprocessing.get_context(START_METHOD))
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+
+def _reset_process_pool() -> None:
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def pool_map(fn: Callable[[T], R], items: Iterable[T], min_items: int) -> Iterator[R]:
+    """Lazily maps `fn` over `items` in input order, in worker processes when it pays off.
+
+    Runs serially with a single worker or fewer than `min_items` items, and
+    falls back to serial execution for the remaining items if the pool breaks.
+    `fn` must be a module-level function and items/results must pickle.
+    """
+    items = list(items)
+    workers = worker_count()
+    if workers < 2 or len(items) < min_items:
+        yield from map(fn, items)
+        return
+    done = 0
+    try:
+        chunksize = max(1, len(items) // (workers * 4))
+        for result in get_process_pool().map(fn, items, chunksize=chunksize):
+            yield result
+            done += 1
+    except (BrokenProcessPool, OSError) as e:
+        # e.g. a worker was OOM-killed or the sandbox forbids process creation
+        print(f"Process pool unavailable ({e}); continuing serially.")
+        _reset_process_pool()
+        yield from map(fn, items[done:])
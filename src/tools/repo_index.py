@@ -0,0 +1,162 @@
+import ast
+import fnmatch
+import hashlib
+import os
+from typing import Callable, Dict, List, Optional
+from pydantic import BaseModel, Field, PrivateAttr
+from src.tools.git_support import git_repo_class
+
+# Never worth indexing, whether or not the repo's .gitignore mentions them
+DEFAULT_IGNORED_DIRS = {".git", ".venv", "venv", "env", "node_modules", "__pycache__",
+                        ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", "dist", "build"}
+TEXT_EXTENSIONS = {".py", ".md", ".txt", ".rst", ".toml", ".json", ".yaml", ".yml", ".cfg", ".ini"}
+# Larger files are listed and hashed but their text is not kept in memory
+MAX_TEXT_BYTES = 512 * 1024
+
+
+class IndexedFile(BaseModel):
+    path: str
+    # None for tracked files that are not checked out: their blob may not even be downloaded
+    size: Optional[int] = None
+    sha: str = Field(description="git blob id when tracked, otherwise SHA-1 of the bytes")
+    on_disk: bool = True
+    # Kept out of checkpoints: a resumed audit re-reads it from the checkout on demand
+    text: Optional[str] = Field(default=None, exclude=True)
+
+
+class RepoIndex(BaseModel):
+    """In-memory view of a cloned repository, built in a single walk and shared by every detective."""
+
+    repo_path: str
+    head_sha: Optional[str] = None
+    clone_strategy: str = "full"
+    temporary: bool = Field(default=False, description="Whether the clone should be deleted after the detectives ran")
+    files: Dict[str, IndexedFile] = Field(default_factory=dict)
+    _asts: Dict[str, Optional[ast.Module]] = PrivateAttr(default_factory=dict)
+
+    def paths(self) -> List[str]:
+        return sorted(self.files)
+
+    def find(self, predicate: Callable[[str], bool]) -> List[str]:
+        return [p for p in self.paths() if predicate(p)]
+
+    def text(self, path: str) -> Optional[str]:
+        entry = self.files.get(path)
+        if entry is None:
+            return None
+        if entry.text is None and entry.on_disk and _is_text(path, entry.size):
+            entry.text = _read_text(os.path.join(self.repo_path, path))
+        return entry.text
+
+    def file_hashes(self) -> Dict[str, str]:
+        return {p: f.sha for p, f in self.files.items()}
+
+    def python_files(self) -> List[str]:
+        return self.find(lambda p: p.endswith(".py"))
+
+    def ast(self, path: str) -> Optional[ast.Module]:
+        """Parsed module for a Python file (memoized; None if it does not parse)."""
+        if path not in self._asts:
+            source = self.text(path)
+            try:
+                self._asts[path] = ast.parse(source) if source is not None else None
+            except (SyntaxError, ValueError):
+                self._asts[path] = None
+        return self._asts[path]
+
+    def doc(self, name: str) -> Optional[str]:
+        """Text of a documentation file by name (case-insensitive), preferring the shallowest match."""
+        matches = [p for p in self.files if os.path.basename(p).lower() == name.lower()]
+        if not matches:
+            return None
+        return self.text(min(matches, key=lambda p: (p.count("/"), p)))
+
+    @classmethod
+    def build(cls, repo_path: str, head_sha: Optional[str] = None, clone_strategy: str = "full",
+              temporary: bool = False) -> "RepoIndex":
+        index = cls(repo_path=repo_path, head_sha=head_sha, clone_strategy=clone_strategy, temporary=temporary)
+        tracked = _tracked_blobs(repo_path)
+        ignore_patterns = _gitignore_patterns(repo_path)
+
+        # Single walk: size, hash and text for everything on disk; ASTs are parsed on demand
+        for root, dirs, files in os.walk(repo_path):
+            rel_root = os.path.relpath(root, repo_path)
+            rel_root = "" if rel_root == "." else rel_root.replace(os.sep, "/") + "/"
+            dirs[:] = [d for d in dirs if d not in DEFAULT_IGNORED_DIRS
+                       and not _ignored(rel_root + d, d, ignore_patterns, tracked)]
+            for name in files:
+                rel_path = rel_root + name
+                if _ignored(rel_path, name, ignore_patterns, tracked):
+                    continue
+                full_path = os.path.join(root, name)
+                try:
+                    with open(full_path, "rb") as f:
+                        data = f.read()
+                except OSError:
+                    continue
+                text = data.decode("utf-8", errors="replace") if _is_text(name, len(data)) else None
+                sha = tracked[rel_path] if rel_path in tracked else hashlib.sha1(data).hexdigest()
+                index.files[rel_path] = IndexedFile(path=rel_path, size=len(data), sha=sha, text=text)
+
+        # Tracked files a sparse/treeless checkout left out: listed and hashed from the git tree
+        for rel_path, sha in tracked.items():
+            if rel_path not in index.files and not any(part in DEFAULT_IGNORED_DIRS for part in rel_path.split("/")[:-1]):
+                index.files[rel_path] = IndexedFile(path=rel_path, size=None, sha=sha, on_disk=False)
+        return index
+
+
+def _is_text(path: str, size: int) -> bool:
+    return os.path.splitext(path)[1].lower() in TEXT_EXTENSIONS and size <= MAX_TEXT_BYTES
+
+
+def _read_text(full_path: str) -> Optional[str]:
+    try:
+        with open(full_path, "rb") as f:
+            return f.read().decode("utf-8", errors="replace")
+    except OSError:
+        return None
+
+
+def _tracked_blobs(repo_path: str) -> Dict[str, str]:
+    """path -> blob sha for HEAD, read from tree objects only.
+
+    No sizes: `ls-tree -l` reads every blob, which in a partial clone
+    downloads all the ones the filter or sparse checkout left out.
+    """
+    Repo = git_repo_class()
+    if Repo is None or not os.path.isdir(os.path.join(repo_path, ".git")):
+        return {}
+    try:
+        output = Repo(repo_path).git.ls_tree("-r", "-z", "HEAD")
+    except Exception:
+        return {}
+    blobs = {}
+    for entry in output.split("\0"):
+        if "\t" not in entry:
+            continue
+        meta, rel_path = entry.split("\t", 1)
+        parts = meta.split()
+        if len(parts) == 3 and parts[1] == "blob":
+            blobs[rel_path] = parts[2]
+    return blobs
+
+
+def _gitignore_patterns(repo_path: str) -> List[str]:
+    path = os.path.join(repo_path, ".gitignore")
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", errors="replace") as f:
+        lines = [line.strip() for line in f]
+    # Negations are rare in submissions; they are simply not honoured here
+    return [line.rstrip("/") for line in lines if line and not line.startswith(("#", "!"))]
+
+
+def _ignored(rel_path: str, name: str, patterns: List[str], tracked: Dict) -> bool:
+    # Anything git tracks is part of the submission, whatever .gitignore says
+    if rel_path in tracked:
+        return False
+    for pattern in patterns:
+        anchored = pattern.lstrip("/")
+        if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(rel_path, anchored):
+            return True
+    return False
@@ -1,25 +1,47 @@
-import ast
 import os
 import subprocess
 import tempfile
 from typing import List, Optional, Dict
 import shutil
-try:
-    from git import Repo
-    HAS_GIT_PYTHON = True
-except (ImportError, Exception):
-    HAS_GIT_PYTHON = False
+from src.tools.git_history import CommitHistorySummary, iter_commits, summarize_history
+from src.tools.graph_analyzer import analyze_sources
+from src.tools.git_support import git_repo_class
+from src.tools.repo_index import DEFAULT_IGNORED_DIRS
+
+# Clone strategies:
+#   full     - every commit, tree and blob (plain `git clone`)
+#   blobless - full history and trees, file contents fetched on demand (--filter=blob:none)
+#   treeless - commits only, nothing checked out; enough for `git log` metadata (--filter=tree:0)
+#   sparse   - blobless, and only files matching sparse_paths are checked out
+CLONE_STRATEGIES = ("full", "blobless", "treeless", "sparse")
 
 class RepoTools:
     @staticmethod
-    def clone_repository(repo_url: str) -> str:
-        """Clones a repository into a temporary directory and returns the path."""
-        temp_dir = tempfile.mkdtemp()
+    def clone_repository(repo_url: str, target_dir: Optional[str] = None, strategy: str = "full",
+                         sparse_paths: Optional[List[str]] = None) -> str:
+        """Clones a repository into target_dir (a fresh temporary directory by default) and returns the path."""
+        if strategy not in CLONE_STRATEGIES:
+            raise ValueError(f"Unknown clone strategy '{strategy}', expected one of {CLONE_STRATEGIES}")
+        if target_dir:
+            os.makedirs(target_dir, exist_ok=True)
+            temp_dir = target_dir
+        else:
+            temp_dir = tempfile.mkdtemp()
         
         # Try Git first
-        if HAS_GIT_PYTHON:
+        Repo = git_repo_class()
+        if Repo is not None:
             try:
-                Repo.clone_from(repo_url, temp_dir)
+                options = {
+                    "full": [],
+                    "blobless": ["--filter=blob:none"],
+                    "treeless": ["--filter=tree:0", "--no-checkout"],
+                    "sparse": ["--filter=blob:none", "--sparse"],
+                }[strategy]
+                repo = Repo.clone_from(repo_url, temp_dir, multi_options=options)
+                if strategy == "sparse":
+                    # Non-cone patterns so globs like "*.py" match at any depth
+                    repo.git.sparse_checkout("set", "--no-cone", *(sparse_paths or ["*"]))
                 return temp_dir
             except Exception as e:
                 print(f"Git clone failed: {str(e)}. Attempting fallback...")
@@ -57,21 +79,25 @@ class RepoTools:
                 shutil.rmtree(temp_dir)
             raise Exception("Git is not available and no fallback for this URL type is implemented.")
 
+    @staticmethod
+    def get_head_sha(repo_path: str) -> Optional[str]:
+        """Returns the checked-out commit SHA, or None when git metadata is unavailable."""
+        Repo = git_repo_class()
+        if Repo is not None and os.path.isdir(os.path.join(repo_path, ".git")):
+            try:
+                return Repo(repo_path).head.commit.hexsha
+            except Exception:
+                pass
+        return None
+
     @staticmethod
     def get_git_log(repo_path: str) -> List[Dict]:
-        """Returns the git log as a list of dictionaries."""
-        if HAS_GIT_PYTHON:
+        """Returns the git log (oldest first) as a list of dictionaries."""
+        if os.path.isdir(os.path.join(repo_path, ".git")):
             try:
-                repo = Repo(repo_path)
-                commits = list(repo.iter_commits())
                 return [
-                    {
-                        "hash": commit.hexsha,
-                        "message": commit.message.strip(),
-                        "author": commit.author.name,
-                        "date": commit.committed_datetime.isoformat(),
-                    }
-                    for commit in reversed(commits)
+                    {"hash": c.hash, "message": c.subject, "author": c.author, "date": c.date}
+                    for c in iter_commits(repo_path, line_stats=None)
                 ]
             except Exception:
                 pass
@@ -84,38 +110,29 @@ class RepoTools:
             "date": "2024-01-01T00:00:00"
         }]
 
+    @staticmethod
+    def summarize_git_history(repo_path: str, line_stats: Optional[str] = "numstat") -> CommitHistorySummary:
+        """Streams `git log` once and returns commit cadence, author and change statistics."""
+        if not os.path.isdir(os.path.join(repo_path, ".git")):
+            return CommitHistorySummary()
+        try:
+            return summarize_history(iter_commits(repo_path, line_stats=line_stats), line_stats=line_stats)
+        except Exception as e:
+            print(f"git log failed: {str(e)}")
+            return CommitHistorySummary()
+
     @staticmethod
     def analyze_graph_structure(repo_path: str) -> Dict:
-        """Analyzes the repository for LangGraph StateGraph instantiation using AST."""
-        results = {
-            "stategraph_found": False,
-            "parallel_execution": False,
-            "nodes": [],
-            "edges": [],
-            "code_snippets": []
-        }
-        
-        for root, _, files in os.walk(repo_path):
+        """Recovers the LangGraph topology of a checkout from its Python sources (see graph_analyzer)."""
+        sources = {}
+        for root, dirs, files in os.walk(repo_path):
+            dirs[:] = [d for d in dirs if d not in DEFAULT_IGNORED_DIRS and not d.startswith(".")]
             for file in files:
                 if file.endswith(".py"):
                     file_path = os.path.join(root, file)
-                    with open(file_path, "r") as f:
-                        try:
-                            tree = ast.parse(f.read())
-                            for node in ast.walk(tree):
-                                # Look for StateGraph instantiation
-                                if isinstance(node, ast.Call) and getattr(node.func, "id", "") == "StateGraph":
-                                    results["stategraph_found"] = True
-                                
-                                # Look for add_edge calls
-                                if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "add_edge":
-                                    results["edges"].append(ast.unparse(node))
-                                    
-                                # Look for parallel patterns (very basic heuristic)
-                                # A better heuristic would be checking if multiple edges originate from the same node
-                        except Exception:
-                            continue
-        return results
+                    with open(file_path, "r", errors="replace") as f:
+                        sources[os.path.relpath(file_path, repo_path)] = f.read()
+        return analyze_sources(sources).model_dump()
 
     @staticmethod
     def list_files(repo_path: str) -> List[str]:
@@ -127,6 +144,19 @@ class RepoTools:
                 file_list.append(rel_path)
         return file_list
 
+    @staticmethod
+    def list_tracked_files(repo_path: str) -> List[str]:
+        """Lists every file in HEAD, including paths a sparse checkout left out of the working tree."""
+        Repo = git_repo_class()
+        if Repo is not None and os.path.isdir(os.path.join(repo_path, ".git")):
+            try:
+                # Reads tree objects only, so it never triggers a blob download
+                output = Repo(repo_path).git.ls_tree("-r", "-z", "--name-only", "HEAD")
+                return [p for p in output.split("\0") if p]
+            except Exception:
+                pass
+        return RepoTools.list_files(repo_path)
+
     @staticmethod
     def read_file(repo_path: str, rel_path: str) -> Optional[str]:
         """Reads a file from the repository."""
@@ -134,4 +164,11 @@ class RepoTools:
         if os.path.exists(full_path):
             with open(full_path, "r") as f:
                 return f.read()
+        # Outside a sparse checkout (or never checked out): partial clones fetch the blob lazily
+        Repo = git_repo_class()
+        if Repo is not None and os.path.isdir(os.path.join(repo_path, ".git")):
+            try:
+                return Repo(repo_path).git.show(f"HEAD:{rel_path}")
+            except Exception:
+                pass
         return None
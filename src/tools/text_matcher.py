@@ -0,0 +1,138 @@
+import re
+from typing import Dict, Iterable, List, Optional, Pattern
+from pydantic import BaseModel, Field
+
+# Characters of surrounding text kept on each side of a match
+CONTEXT_CHARS = 60
+# Occurrences kept per term; counts and pages still cover every occurrence
+MAX_MATCHES_PER_TERM = 5
+# Path-like strings (e.g. src/main.py, ./README.md)
+PATH_PATTERN = re.compile(r"[a-zA-Z0-9_\-\./]+\.[a-zA-Z0-9]+")
+# Separator used between pages, matching DocTools.extract_text_from_pdf
+PAGE_SEPARATOR = "\n"
+
+
+def format_pages(pages: List[int]) -> str:
+    """Compact page list, e.g. [1, 2, 3, 7] -> '1-3, 7'."""
+    ranges = []
+    for page in sorted(set(pages)):
+        if ranges and page == ranges[-1][1] + 1:
+            ranges[-1][1] = page
+        else:
+            ranges.append([page, page])
+    return ", ".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+class TextMatch(BaseModel):
+    text: str = Field(description="The matched text as it appears in the document")
+    page: int = Field(description="1-based page number")
+    offset: int = Field(description="Character offset in the page-joined document text")
+    context: str
+
+
+class TermHits(BaseModel):
+    term: str
+    count: int = 0
+    pages: List[int] = Field(default_factory=list)
+    matches: List[TextMatch] = Field(default_factory=list)
+
+    def add(self, match: TextMatch, max_matches: int) -> None:
+        self.count += 1
+        if not self.pages or self.pages[-1] != match.page:
+            self.pages.append(match.page)
+        if len(self.matches) < max_matches:
+            self.matches.append(match)
+
+    def citation(self) -> str:
+        """Short citation: count, pages and the first occurrence in context."""
+        if not self.count:
+            return f"'{self.term}': not found"
+        first = self.matches[0]
+        return f"'{self.term}': {self.count}x on p. {format_pages(self.pages)} (first at offset {first.offset}: \"...{first.context}...\")"
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Regex for a set of literal terms, factored into a trie of shared prefixes.
+
+    One compiled alternation whose branches share prefixes, so matching cost
+    depends on the text and the longest term rather than on the term count.
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        end = "" in node
+        # A space in a term matches any whitespace run, since PDF text breaks lines mid-phrase
+        branches = [(r"\s+" if ch == " " else re.escape(ch)) + build(child)
+                    for ch, child in sorted(node.items()) if ch != ""]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Longer continuations are tried first, the term ending here is the fallback
+        return f"(?:{body})?" if end else body
+
+    return build(trie)
+
+
+class MultiPatternMatcher:
+    """Finds every occurrence of many literal terms in a single pass over the text."""
+
+    def __init__(self, terms: Iterable[str], case_sensitive: bool = False, whole_words: bool = True,
+                 context_chars: int = CONTEXT_CHARS, max_matches_per_term: int = MAX_MATCHES_PER_TERM):
+        self.terms = list(dict.fromkeys(t for t in terms if t))
+        self.case_sensitive = case_sensitive
+        self.context_chars = context_chars
+        self.max_matches_per_term = max_matches_per_term
+        self._canonical = {self._normalize(t): t for t in self.terms}
+        self._pattern: Optional[Pattern] = None
+        if self.terms:
+            body = _trie_pattern(self._canonical)
+            if whole_words:
+                body = rf"(?<!\w)(?:{body})(?!\w)"
+            self._pattern = re.compile(body, 0 if case_sensitive else re.IGNORECASE)
+
+    def _normalize(self, text: str) -> str:
+        text = " ".join(text.split())
+        return text if self.case_sensitive else text.lower()
+
+    def scan_pages(self, pages: Iterable[str]) -> Dict[str, TermHits]:
+        """Scans page texts in order; offsets refer to the page-joined document."""
+        hits = {term: TermHits(term=term) for term in self.terms}
+        if self._pattern is None:
+            return hits
+        offset = 0
+        for page_number, page in enumerate(pages, start=1):
+            for m in self._pattern.finditer(page):
+                term = self._canonical.get(self._normalize(m.group(0)))
+                if term is None:
+                    continue
+                hits[term].add(self._match(page, m, page_number, offset), self.max_matches_per_term)
+            offset += len(page) + len(PAGE_SEPARATOR)
+        return hits
+
+    def scan(self, text: str) -> Dict[str, TermHits]:
+        return self.scan_pages([text])
+
+    def _match(self, page: str, m: "re.Match", page_number: int, offset: int) -> TextMatch:
+        return _text_match(page, m, page_number, offset, self.context_chars)
+
+
+def _text_match(page: str, m: "re.Match", page_number: int, offset: int, context_chars: int) -> TextMatch:
+    start = max(0, m.start() - context_chars)
+    end = min(len(page), m.end() + context_chars)
+    context = " ".join(page[start:end].split())
+    return TextMatch(text=m.group(0), page=page_number, offset=offset + m.start(), context=context)
+
+
+def find_paths(pages: Iterable[str], context_chars: int = CONTEXT_CHARS) -> List[TextMatch]:
+    """Every path-like mention in the document, in reading order."""
+    mentions = []
+    offset = 0
+    for page_number, page in enumerate(pages, start=1):
+        mentions.extend(_text_match(page, m, page_number, offset, context_chars) for m in PATH_PATTERN.finditer(page))
+        offset += len(page) + len(PAGE_SEPARATOR)
+    return mentions
@@ -0,0 +1,229 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import threading
+from contextlib import nullcontext
+from typing import ContextManager, Dict, List, Optional
+from src.resources import current_resources
+from src.state import Evidence
+from src.tools.git_support import git_repo_class
+from src.tools.repo_tools import RepoTools
+
+try:
+    import fcntl
+except ImportError:  # Windows: workspaces are only locked within one process
+    fcntl = None
+
+DEFAULT_WORKSPACE_ROOT = ".auditor_cache/workspaces"
+# How often an async audit retries a workspace another audit holds
+LOCK_POLL_S = 0.05
+
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+class WorkspaceLock:
+    """Exclusive lock on one workspace, shared by threads and processes (CLI, batch and worker).
+
+    An flock on `<workspace>.lock`: every acquisition opens its own file, so
+    two threads of one process exclude each other just like two processes,
+    and a crashed process lets go of it with its file descriptors.
+    """
+
+    def __init__(self, root: str):
+        self.path = root + ".lock"
+        self._file = None
+        self._fallback = None
+
+    def acquire(self) -> None:
+        if fcntl is None:
+            with _locks_guard:
+                self._fallback = _locks.setdefault(self.path, threading.Lock())
+            self._fallback.acquire()
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a")
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+
+    def try_acquire(self) -> bool:
+        """acquire() without waiting; False when someone else holds the lock."""
+        if fcntl is None:
+            with _locks_guard:
+                lock = _locks.setdefault(self.path, threading.Lock())
+            if not lock.acquire(blocking=False):
+                return False
+            self._fallback = lock
+            return True
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "a")
+        try:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    async def aacquire(self) -> None:
+        """acquire() for the event loop: polls, so the wait never parks an executor thread."""
+        try:
+            while not self.try_acquire():
+                await asyncio.sleep(LOCK_POLL_S)
+        except BaseException:
+            self.release()
+            raise
+
+    def release(self) -> None:
+        if self._fallback is not None:
+            self._fallback, lock = None, self._fallback
+            lock.release()
+        elif self._file is not None:
+            self._file, f = None, self._file
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            f.close()
+
+    def __enter__(self) -> "WorkspaceLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+def fingerprint(*parts) -> str:
+    """Stable hash of the inputs an evidence entry was computed from."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class RepoWorkspace:
+    """Persistent per-repository checkout plus the evidence computed at the last audited commit.
+
+    The first audit clones; later audits `git fetch` the remote HEAD and reset
+    onto it. The manifest records the audited SHA, a content hash for every
+    file (from the RepoIndex) and, per criterion, the fingerprint of the inputs
+    its evidence was built from, so unchanged criteria can reuse their previous
+    evidence.
+    """
+
+    def __init__(self, repo_url: str, root: Optional[str] = None):
+        self.repo_url = repo_url
+        self.root = os.path.join(
+            root or os.getenv("AUDITOR_WORKSPACE_DIR", DEFAULT_WORKSPACE_ROOT),
+            hashlib.sha256(repo_url.encode("utf-8")).hexdigest()[:16],
+        )
+        self.path = os.path.join(self.root, "checkout")
+        self.manifest_path = os.path.join(self.root, "manifest.json")
+
+    def lock(self) -> ContextManager:
+        """Exclusive use of the checkout and manifest; a no-op inside an audit that already holds it."""
+        resources = current_resources()
+        if resources is not None and resources.holds(self.path):
+            return nullcontext()
+        return WorkspaceLock(self.root)
+
+    def hold(self) -> bool:
+        """Locks the workspace until the running audit releases its checkout (see src.resources).
+
+        Two audits of the same repo must not fetch/reset/clean under each
+        other's reads, which go on until the evidence aggregator. Returns False
+        without locking outside an audit scope; callers then lock around each
+        use instead.
+        """
+        resources = current_resources()
+        if resources is None:
+            return False
+        if resources.holds(self.path):
+            return True
+        lock = WorkspaceLock(self.root)
+        lock.acquire()
+        resources.hold(self.path, lock.release)
+        return True
+
+    async def ahold(self) -> bool:
+        """hold() for async audits.
+
+        Waiting in a thread would take one of the default executor's workers
+        per queued audit of the same repo; with enough of them the holder's
+        sync nodes (the evidence aggregator that releases the lock included)
+        never get a thread again.
+        """
+        resources = current_resources()
+        if resources is None:
+            return False
+        if resources.holds(self.path):
+            return True
+        lock = WorkspaceLock(self.root)
+        await lock.aacquire()
+        resources.hold(self.path, lock.release)
+        return True
+
+    def sync(self, strategy: str = "full", sparse_paths: Optional[List[str]] = None) -> str:
+        """Brings the checkout up to date with the remote HEAD and returns its path."""
+        Repo = git_repo_class()
+        if Repo is not None and os.path.isdir(os.path.join(self.path, ".git")):
+            try:
+                repo = Repo(self.path)
+                # A partial clone keeps its filter, so the fetch stays blobless/treeless
+                repo.git.fetch("origin", "HEAD")
+                if strategy == "sparse":
+                    repo.git.sparse_checkout("set", "--no-cone", *(sparse_paths or ["*"]))
+                elif repo.config_reader().get_value("core", "sparseCheckout", False):
+                    repo.git.sparse_checkout("disable")
+                if strategy == "treeless":
+                    repo.git.update_ref("HEAD", "FETCH_HEAD")
+                else:
+                    repo.git.reset("--hard", "FETCH_HEAD")
+                    repo.git.clean("-fdx")
+                return self.path
+            except Exception as e:
+                print(f"Workspace fetch failed: {str(e)}. Re-cloning...")
+
+        # No usable git checkout (first audit, broken workspace or zip fallback)
+        if os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        return RepoTools.clone_repository(self.repo_url, target_dir=self.path, strategy=strategy, sparse_paths=sparse_paths)
+
+    def load_manifest(self) -> Dict:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def reusable_evidence(self, fingerprints: Dict[str, Optional[str]]) -> Dict[str, List[Evidence]]:
+        """Previous evidence for every criterion whose input fingerprint is unchanged."""
+        previous = self.load_manifest().get("criteria", {})
+        reused = {}
+        for criterion_id, fp in fingerprints.items():
+            entry = previous.get(criterion_id)
+            if fp is not None and entry and entry.get("fingerprint") == fp:
+                reused[criterion_id] = [Evidence.model_validate(e) for e in entry["evidence"]]
+        return reused
+
+    def record(self, head_sha: Optional[str], file_hashes: Dict[str, str],
+               fingerprints: Dict[str, Optional[str]], evidences: Dict[str, List[Evidence]]) -> None:
+        # Criteria this audit did not investigate (a smaller rubric) keep their
+        # entries; their fingerprints still decide whether they can be reused
+        criteria = self.load_manifest().get("criteria", {})
+        criteria.update({
+            criterion_id: {
+                "fingerprint": fingerprints[criterion_id],
+                "evidence": [e.model_dump() for e in evidences[criterion_id]],
+            }
+            for criterion_id in fingerprints
+            if criterion_id in evidences
+        })
+        manifest = {
+            "repo_url": self.repo_url,
+            "head_sha": head_sha,
+            "file_hashes": file_hashes,
+            "criteria": criteria,
+        }
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
@@ -0,0 +1,348 @@
+import inspect
+import json
+import os
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from pydantic import BaseModel, Field
+
+# USD per million (input, output) tokens; unknown models are traced without a cost
+MODEL_PRICES = {
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "grok-3-mini": (0.30, 0.50),
+    "grok-3": (3.0, 15.0),
+}
+# Spans ending this close to a node's start still count as its predecessor
+CRITICAL_PATH_SLACK_S = 0.005
+# Numeric span attributes summed per node and per run
+SUMMED_ATTRS = ("tokens_in", "tokens_out", "cost_usd", "queued_s", "retries", "backoff_s", "failovers", "hedges")
+
+
+class Span(BaseModel):
+    id: int
+    parent_id: Optional[int] = None
+    name: str
+    category: str = Field(description="node, llm or tool")
+    start_s: float = Field(description="Seconds since the start of the trace")
+    end_s: Optional[float] = None
+    thread: int
+    attrs: Dict[str, Any] = Field(default_factory=dict)
+
+    @property
+    def duration_s(self) -> float:
+        return (self.end_s if self.end_s is not None else self.start_s) - self.start_s
+
+
+class NodeStats(BaseModel):
+    wall_s: float = 0.0
+    llm_calls: int = 0
+    llm_s: float = 0.0
+    cache_hits: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+    cost_usd: float = 0.0
+    queued_s: float = 0.0
+    retries: int = 0
+    backoff_s: float = 0.0
+    failovers: int = 0
+    hedges: int = 0
+    tools: Dict[str, float] = Field(default_factory=dict, description="Tool span name -> seconds")
+
+
+class TraceSummary(BaseModel):
+    run_id: str
+    started_at: str
+    wall_s: float = 0.0
+    nodes: Dict[str, NodeStats] = Field(default_factory=dict)
+    totals: NodeStats = Field(default_factory=NodeStats)
+    critical_path: List[str] = Field(default_factory=list)
+
+    def table(self) -> str:
+        lines = ["| Node | Wall s | LLM calls | LLM s | Queued s | Cache hits | Tokens in/out | Cost $ | Tools |",
+                 "|---|---|---|---|---|---|---|---|---|"]
+        for name, s in [*self.nodes.items(), ("total", self.totals)]:
+            tools = ", ".join(f"{k} {v:.2f}s" for k, v in s.tools.items()) or "-"
+            lines.append(f"| {name} | {s.wall_s:.2f} | {s.llm_calls} | {s.llm_s:.2f} | {s.queued_s:.2f} | {s.cache_hits} "
+                         f"| {s.tokens_in}/{s.tokens_out} | {s.cost_usd:.4f} | {tools} |")
+        return "\n".join(lines)
+
+
+def tracing_enabled() -> bool:
+    return os.getenv("AUDITOR_TRACE", "on").lower() not in ("off", "0", "false")
+
+
+def model_cost(model_name: Optional[str], tokens_in: Optional[int], tokens_out: Optional[int]) -> Optional[float]:
+    prices = MODEL_PRICES.get(model_name or "")
+    if prices is None or tokens_in is None or tokens_out is None:
+        return None
+    return round((tokens_in * prices[0] + tokens_out * prices[1]) / 1e6, 6)
+
+
+class Tracer:
+    """Collects the spans of one audit.
+
+    Spans nest through a context variable, so a model call made by a judge's
+    worker thread or an awaited task is attached to the node that made it as
+    long as the context is propagated (asyncio tasks, asyncio.to_thread and
+    LangGraph's own executor do this).
+    """
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self.spans: List[Span] = []
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def open(self, name: str, category: str, parent: Optional[Span], attrs: Dict) -> Span:
+        with self._lock:
+            self._next_id += 1
+            span = Span(id=self._next_id, parent_id=parent.id if parent else None, name=name, category=category,
+                        start_s=self._now(), thread=threading.get_ident(), attrs=attrs)
+            self.spans.append(span)
+        return span
+
+    def close(self, span: Span) -> None:
+        span.end_s = self._now()
+
+    # --- Analysis ---
+
+    def _node_of(self, span: Span, by_id: Dict[int, Span]) -> Optional[Span]:
+        while span is not None and span.category != "node":
+            span = by_id.get(span.parent_id)
+        return span
+
+    def summary(self) -> TraceSummary:
+        by_id = {s.id: s for s in self.spans}
+        summary = TraceSummary(run_id=self.run_id, started_at=self.started_at,
+                               wall_s=round(max((s.end_s or 0.0 for s in self.spans), default=0.0), 3))
+        for span in self.spans:
+            node = self._node_of(span, by_id)
+            stats = [summary.totals] + ([summary.nodes.setdefault(node.name, NodeStats())] if node else [])
+            for s in stats:
+                if span.category == "node":
+                    s.wall_s += span.duration_s
+                elif span.category == "llm":
+                    s.llm_calls += 1
+                    s.llm_s += span.duration_s
+                    s.cache_hits += span.attrs.get("cache") == "hit"
+                    for key in SUMMED_ATTRS:
+                        setattr(s, key, getattr(s, key) + (span.attrs.get(key) or 0))
+                elif span.category == "tool":
+                    s.tools[span.name] = s.tools.get(span.name, 0.0) + span.duration_s
+        for s in [summary.totals, *summary.nodes.values()]:
+            for key in ("wall_s", "llm_s", "queued_s", "backoff_s"):
+                setattr(s, key, round(getattr(s, key), 3))
+            s.cost_usd = round(s.cost_usd, 6)
+            s.tools = {k: round(v, 3) for k, v in s.tools.items()}
+        summary.totals.wall_s = summary.wall_s
+        summary.critical_path = self.critical_path()
+        return summary
+
+    def critical_path(self) -> List[str]:
+        """Chain of nodes that determined the run's wall time.
+
+        Walks back from the last node to finish: each node's predecessor is the
+        node of an earlier super-step that finished last before it started,
+        i.e. the straggler a fan-in waited for.
+        """
+        nodes = [s for s in self.spans if s.category == "node" and s.end_s is not None]
+        if not nodes:
+            return []
+        current = max(nodes, key=lambda s: s.end_s)
+        path = [current]
+        while True:
+            step = current.attrs.get("step")
+            before = [s for s in nodes if s.end_s <= current.start_s + CRITICAL_PATH_SLACK_S and s.end_s < current.end_s
+                      and (step is None or s.attrs.get("step") is None or s.attrs["step"] < step)]
+            if not before:
+                break
+            current = max(before, key=lambda s: s.end_s)
+            path.append(current)
+        return [f"{s.name} ({s.duration_s:.2f}s)" for s in reversed(path)]
+
+    # --- Export ---
+
+    def to_json(self) -> Dict:
+        return {"summary": self.summary().model_dump(), "spans": [s.model_dump() for s in self.spans]}
+
+    def to_chrome_trace(self) -> Dict:
+        """Chrome trace-event format (chrome://tracing, Perfetto, speedscope).
+
+        Parallel nodes and concurrent model calls get their own rows; a span
+        shares a row only with spans it nests in or does not overlap.
+        """
+        by_id = {s.id: s for s in self.spans}
+        lanes: List[List[Span]] = []
+        lane_names: List[str] = []
+        placed: Dict[int, int] = {}
+
+        def fits(stack: List[Span], span: Span) -> bool:
+            while stack and (stack[-1].end_s or 0.0) <= span.start_s:
+                stack.pop()
+            ancestor = by_id.get(span.parent_id)
+            while stack and ancestor is not None and stack[-1].id != ancestor.id:
+                ancestor = by_id.get(ancestor.parent_id)
+            return not stack or ancestor is not None
+
+        events = []
+        for span in sorted(self.spans, key=lambda s: (s.start_s, -s.duration_s)):
+            # Prefer the parent's row, then any row the span fits on
+            preferred = [placed[span.parent_id]] if span.parent_id in placed else []
+            lane = next((i for i in preferred + list(range(len(lanes))) if fits(lanes[i], span)), None)
+            if lane is None:
+                lane = len(lanes)
+                lanes.append([])
+                lane_names.append(span.name)
+            lanes[lane].append(span)
+            placed[span.id] = lane
+            events.append({
+                "name": span.name, "cat": span.category, "ph": "X", "pid": 1, "tid": lane,
+                "ts": round(span.start_s * 1e6), "dur": round(span.duration_s * 1e6), "args": span.attrs,
+            })
+        events += [{"name": "thread_name", "ph": "M", "pid": 1, "tid": i, "args": {"name": name}}
+                   for i, name in enumerate(lane_names)]
+        events.append({"name": "process_name", "ph": "M", "pid": 1, "args": {"name": f"audit {self.run_id}"}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, output_dir: str) -> Dict[str, str]:
+        """Writes trace.json and trace.chrome.json to output_dir; returns their paths."""
+        os.makedirs(output_dir, exist_ok=True)
+        paths = {"json": os.path.join(output_dir, "trace.json"),
+                 "chrome": os.path.join(output_dir, "trace.chrome.json")}
+        with open(paths["json"], "w") as f:
+            json.dump(self.to_json(), f, indent=2, default=str)
+        with open(paths["chrome"], "w") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+        return paths
+
+
+_tracer: ContextVar[Optional[Tracer]] = ContextVar("auditor_tracer", default=None)
+_current: ContextVar[Optional[Span]] = ContextVar("auditor_span", default=None)
+
+
+@contextmanager
+def start_trace(run_id: str) -> Iterator[Optional[Tracer]]:
+    """Traces everything run inside the block; yields None when AUDITOR_TRACE=off."""
+    if not tracing_enabled():
+        yield None
+        return
+    tracer = Tracer(run_id)
+    token = _tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _tracer.reset(token)
+
+
+@contextmanager
+def span(name: str, category: str = "tool", **attrs) -> Iterator[Optional[Span]]:
+    """Records a timed span under the current one; a no-op outside start_trace."""
+    tracer = _tracer.get()
+    if tracer is None:
+        yield None
+        return
+    current = tracer.open(name, category, _current.get(), attrs)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        _current.reset(token)
+        tracer.close(current)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def annotate(**attrs) -> None:
+    """Sets attributes on the current span."""
+    current = _current.get()
+    if current is not None:
+        current.attrs.update({k: v for k, v in attrs.items() if v is not None})
+
+
+def add(key: str, amount: float) -> None:
+    """Adds to a numeric attribute of the current span (retries, queueing time, ...)."""
+    current = _current.get()
+    if current is not None:
+        current.attrs[key] = round(current.attrs.get(key, 0) + amount, 6)
+
+
+def _step(config: Optional[Dict]) -> Optional[int]:
+    return ((config or {}).get("metadata") or {}).get("langgraph_step")
+
+
+def trace_node(name: str, fn: Callable) -> Callable:
+    """Wraps a graph node (sync or async) in a node span tagged with its super-step.
+
+    The wrapper takes LangGraph's config (for the step number) and calls the
+    node with the state only, so it deliberately does not copy fn's signature.
+    """
+    # LangGraph only passes config to parameters annotated with this exact type.
+    # Imported here so the tracer itself stays free of LangChain imports.
+    from langchain_core.runnables import RunnableConfig
+
+    if inspect.iscoroutinefunction(fn):
+        async def anode(state, config: RunnableConfig):
+            with span(name, "node", step=_step(config)):
+                return await fn(state)
+        anode.__name__ = fn.__name__
+        return anode
+
+    def node(state, config: RunnableConfig):
+        with span(name, "node", step=_step(config)):
+            return fn(state)
+    node.__name__ = fn.__name__
+    return node
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+def batch_trace_table(summaries: Dict[str, TraceSummary]) -> str:
+    """Markdown tables aggregating the traces of a batch: per node and per submission."""
+    lines = ["# Cohort Trace Summary\n",
+             "## Per node\n",
+             "| Node | Runs | Mean wall s | p95 wall s | Max wall s | Mean LLM s | Mean queued s | LLM calls | Cache hits | Tokens in/out | Cost $ | On critical path |",
+             "|---|---|---|---|---|---|---|---|---|---|---|---|"]
+    per_node: Dict[str, List[NodeStats]] = {}
+    on_path: Dict[str, int] = {}
+    for summary in summaries.values():
+        for name, stats in summary.nodes.items():
+            per_node.setdefault(name, []).append(stats)
+        for step in summary.critical_path:
+            name = step.rsplit(" (", 1)[0]
+            on_path[name] = on_path.get(name, 0) + 1
+    for name, runs in per_node.items():
+        walls = [s.wall_s for s in runs]
+        lines.append(
+            f"| {name} | {len(runs)} | {statistics.mean(walls):.2f} | {_percentile(walls, 95):.2f} | {max(walls):.2f} "
+            f"| {statistics.mean(s.llm_s for s in runs):.2f} | {statistics.mean(s.queued_s for s in runs):.2f} "
+            f"| {sum(s.llm_calls for s in runs)} | {sum(s.cache_hits for s in runs)} "
+            f"| {sum(s.tokens_in for s in runs)}/{sum(s.tokens_out for s in runs)} "
+            f"| {sum(s.cost_usd for s in runs):.4f} | {on_path.get(name, 0)}/{len(summaries)} |")
+
+    lines += ["\n## Per submission\n",
+              "| Submission | Wall s | LLM calls | Queued s | Tokens in/out | Cost $ | Critical path |",
+              "|---|---|---|---|---|---|---|"]
+    for run_id, summary in summaries.items():
+        t = summary.totals
+        lines.append(f"| {run_id} | {summary.wall_s:.2f} | {t.llm_calls} | {t.queued_s:.2f} "
+                     f"| {t.tokens_in}/{t.tokens_out} | {t.cost_usd:.4f} | {' → '.join(summary.critical_path)} |")
+    return "\n".join(lines) + "\n"
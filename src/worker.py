@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import socket
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from dotenv import load_dotenv
+from src.batch import audit_submission, load_manifest
+from src.jobs import DEFAULT_MAX_ATTEMPTS, JobQueue
+from src.llm.router import get_model
+from src.llm.scheduler import all_schedulers
+from src.rules import load_rubric
+
+# API keys and LLM settings from .env, as in main.py
+load_dotenv()
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_OUTPUT_DIR = "audit/worker"
+# Idle workers re-check the queue this often for jobs added by other processes
+POLL_INTERVAL_S = 2.0
+
+
+class AuditWorker:
+    """Resident audit service: one compiled graph, warm model clients and the rubric, fed from the job queue.
+
+    `concurrency` threads each claim a job, audit it through the shared graph
+    (exactly like a batch submission, so reports and traces land in
+    `<output_dir>/<job id>/`) and store the result back in the queue. A
+    heartbeat thread renews the leases of the worker's jobs and queues again
+    the jobs of workers whose leases ran out, so several workers can share
+    one queue file.
+    """
+
+    def __init__(self, queue: JobQueue, rubric: Dict, output_dir: str = DEFAULT_OUTPUT_DIR, concurrency: int = 4):
+        self.queue = queue
+        self.rubric = rubric
+        self.output_dir = output_dir
+        self.concurrency = max(1, concurrency)
+        from src.graph import create_auditor_graph
+        self.app = create_auditor_graph()
+        # Build the model routes (and their HTTP clients) before the first job needs them
+        for role in ("detective", "judge", "justice"):
+            try:
+                get_model(role)
+            except ValueError as e:
+                print(f"⚠️  {e}; audits will fail until a provider key is configured")
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self.active: Dict[str, str] = {}
+
+    def start(self) -> None:
+        self._requeue_expired()
+        for i in range(self.concurrency):
+            thread = threading.Thread(target=self._loop, name=f"audit-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat, name="audit-worker-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def _requeue_expired(self) -> None:
+        requeued, failed = self.queue.requeue_expired()
+        if requeued:
+            print(f"♻️  Re-queued {requeued} job(s) whose worker stopped mid-audit")
+            self.notify()
+        if failed:
+            print(f"❌ Failed {failed} job(s) interrupted {self.queue.max_attempts} times")
+
+    def _heartbeat(self) -> None:
+        # Renewing at a third of the lease leaves two missed beats of slack
+        while not self._stopped.wait(self.queue.lease_s / 3):
+            try:
+                self.queue.heartbeat(self.worker_id)
+                self._requeue_expired()
+            except Exception as e:
+                print(f"⚠️  Worker heartbeat failed: {str(e)}")
+
+    def notify(self) -> None:
+        """Wakes idle workers after a submission."""
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stops claiming jobs and waits for the running audits to finish."""
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        # Audits still running after the timeout lose their lease and are picked up again
+        self._stopped.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join()
+
+    def _loop(self) -> None:
+        name = threading.current_thread().name
+        while not self._stopping.is_set():
+            job = self.queue.claim(self.worker_id)
+            if job is None:
+                self._wake.wait(POLL_INTERVAL_S)
+                self._wake.clear()
+                continue
+            self.active[name] = job["id"]
+            print(f"▶️  {job['id']} {job['label'] or job['repo_url']}")
+            submission = {"id": job["id"], "repo_url": job["repo_url"], "pdf_path": job["pdf_path"]}
+            try:
+                result = audit_submission(self.app, submission, self.rubric, self.output_dir)
+            except Exception as e:
+                # audit_submission records audit crashes itself; this is the worker's own failure
+                result = {"id": job["id"], "status": "failed", "errors": [f"Worker error: {str(e)}"]}
+            if not self.queue.finish(job["id"], result, self.worker_id):
+                print(f"⚠️  {job['id']} lost its lease to another worker; its result was not stored")
+            self.active.pop(name, None)
+            print(f"{'✅' if result['status'].startswith('completed') else '❌'} {job['id']} ({result.get('duration_s', '-')}s)")
+
+    def health(self) -> Dict:
+        return {
+            "worker_id": self.worker_id,
+            "jobs": self.queue.counts(),
+            "running": sorted(self.active.values()),
+            "concurrency": self.concurrency,
+            "llm": {provider: scheduler.metrics.snapshot() for provider, scheduler in all_schedulers().items()},
+        }
+
+
+def _submissions(payload) -> List[Dict]:
+    """Validates a POST /jobs body: one submission or a list of them."""
+    items = payload if isinstance(payload, list) else [payload]
+    submissions = []
+    for i, item in enumerate(items, start=1):
+        if not isinstance(item, dict) or not item.get("repo_url") or not item.get("pdf_path"):
+            raise ValueError(f"Submission {i} needs both repo_url and pdf_path")
+        submissions.append({"repo_url": item["repo_url"], "pdf_path": item["pdf_path"], "id": item.get("id")})
+    return submissions
+
+
+def make_handler(worker: AuditWorker):
+    class Handler(BaseHTTPRequestHandler):
+        """Local JSON API: POST /jobs, GET /jobs[?status=], GET /jobs/<id>, GET /jobs/<id>/report, GET /health."""
+
+        def _send(self, status: int, body, content_type: str = "application/json") -> None:
+            data = (json.dumps(body, default=str) if content_type == "application/json" else body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/jobs":
+                return self._send(404, {"error": "not found"})
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                submissions = _submissions(json.loads(self.rfile.read(length) or b"null"))
+            except ValueError as e:
+                return self._send(400, {"error": str(e)})
+            ids = [worker.queue.submit(s["repo_url"], s["pdf_path"], label=s["id"]) for s in submissions]
+            worker.notify()
+            self._send(202, {"jobs": ids})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            parts = [p for p in url.path.split("/") if p]
+            if parts == ["health"]:
+                return self._send(200, worker.health())
+            if parts == ["jobs"]:
+                status = parse_qs(url.query).get("status", [None])[0]
+                return self._send(200, {"jobs": worker.queue.list(status=status)})
+            if len(parts) in (2, 3) and parts[0] == "jobs":
+                job = worker.queue.get(parts[1])
+                if job is None:
+                    return self._send(404, {"error": f"unknown job {parts[1]}"})
+                if len(parts) == 2:
+                    return self._send(200, job)
+                if parts[2] == "report":
+                    report_path = (job["result"] or {}).get("report_path")
+                    if not report_path or not os.path.exists(report_path):
+                        return self._send(409, {"error": f"job {job['id']} has no report ({job['status']})"})
+                    with open(report_path, encoding="utf-8") as f:
+                        return self._send(200, f.read(), "text/markdown; charset=utf-8")
+            self._send(404, {"error": "not found"})
+
+        def log_message(self, format, *args):
+            # Job progress is printed by the worker; keep request logs out of the console
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident audit worker with a SQLite job queue and a local HTTP API")
+    parser.add_argument("--concurrency", type=int, default=4, help="Audits run in parallel")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="Per-job reports and traces")
+    parser.add_argument("--queue", default=None, help="Job database (default AUDITOR_JOBS_PATH or .auditor_cache/jobs.sqlite)")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help="Fail a job after this many claims whose worker died mid-audit")
+    parser.add_argument("--enqueue", metavar="MANIFEST", help="Add a cohort manifest's submissions to the queue and exit")
+    args = parser.parse_args()
+
+    queue = JobQueue(args.queue, max_attempts=args.max_attempts)
+    if args.enqueue:
+        # Durable: a worker started now or later picks these up
+        ids = [queue.submit(s["repo_url"], s["pdf_path"], label=s["id"]) for s in load_manifest(args.enqueue)]
+        print(f"📥 Queued {len(ids)} audit job(s) in {queue.path}")
+        return
+
+    worker = AuditWorker(queue, load_rubric(), args.output_dir, args.concurrency)
+    worker.start()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(worker))
+    print(f"🛰️  Audit worker on http://{args.host}:{args.port} ({args.concurrency} concurrent audits, queue {queue.path})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopping: finishing running audits (queued jobs stay queued)...")
+    finally:
+        server.server_close()
+        worker.stop()
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import pytest
+from src.llm import router, scheduler
+
+
+@pytest.fixture(autouse=True)
+def offline_env(monkeypatch, tmp_path):
+    """Every test runs offline: no cache, checkpoints or traces, state under tmp_path, fresh schedulers."""
+    monkeypatch.setenv("LLM_CACHE", "off")
+    monkeypatch.setenv("AUDITOR_CHECKPOINTS", "off")
+    monkeypatch.setenv("AUDITOR_TRACE", "off")
+    monkeypatch.setenv("AUDITOR_WORKSPACE_DIR", str(tmp_path / "workspaces"))
+    monkeypatch.setenv("AUDITOR_JOBS_PATH", str(tmp_path / "jobs.sqlite"))
+    monkeypatch.setenv("LLM_REQUESTS_PER_MINUTE", "100000")
+    monkeypatch.setenv("LLM_TOKENS_PER_MINUTE", "1e12")
+    for name in ("GROQ_API_KEY", "XAI_API_KEY", "LLM_HEDGE_AFTER_S", "LLM_HEDGE_ROLES"):
+        monkeypatch.delenv(name, raising=False)
+    scheduler._schedulers.clear()
+    router._routes.clear()
+    yield
+    scheduler._schedulers.clear()
+    router._routes.clear()
+
+
+def git(repo: str, *args: str, date: str = "2024-01-01T10:00:00+00:00") -> str:
+    env = dict(os.environ, GIT_AUTHOR_NAME="Ada", GIT_AUTHOR_EMAIL="ada@example.com", GIT_COMMITTER_NAME="Ada",
+               GIT_COMMITTER_EMAIL="ada@example.com", GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+    return subprocess.run(["git", "-C", repo, *args], check=True, capture_output=True, text=True, env=env).stdout
+
+
+def commit_file(repo: str, path: str, content: str, message: str, date: str = "2024-01-01T10:00:00+00:00") -> None:
+    full_path = os.path.join(repo, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "w") as f:
+        f.write(content)
+    git(repo, "add", path, date=date)
+    git(repo, "commit", "-q", "-m", message, date=date)
+
+
+@pytest.fixture
+def origin_repo(tmp_path):
+    """A small source repository, cloned by the tests through its file:// URL."""
+    repo = str(tmp_path / "origin")
+    os.makedirs(repo)
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "config", "uploadpack.allowFilter", "true")
+    commit_file(repo, "README.md", "# Demo\n", "Set up the environment", date="2024-01-01T10:00:00+00:00")
+    commit_file(repo, "src/tools/repo_tools.py", "import subprocess\n", "Add repo tools", date="2024-01-02T10:00:00+00:00")
+    commit_file(repo, "src/state.py", "class AgentState: ...\n", "Add state", date="2024-01-03T10:00:00+00:00")
+    commit_file(repo, "src/graph.py", "from langgraph.graph import StateGraph\n", "Wire the graph",
+                date="2024-01-04T10:00:00+00:00")
+    return repo
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+from src.benchmark.fake_llm import FakeChatModel
+from src.llm import cache as cache_module
+from src.llm.cache import ACCESS_REFRESH_S, LLMCache, cache_key
+from src.llm import router
+from src.llm.gateway import ainvoke_model, invoke_model
+from src.llm.router import get_model
+from src.llm.scheduler import Priority
+from src.state import JudicialOpinion
+
+
+def test_key_depends_on_model_prompt_and_schema():
+    model = FakeChatModel()
+    key = cache_key(model, "prompt")
+    assert key == cache_key(FakeChatModel(), "prompt")
+    assert key != cache_key(model, "other prompt")
+    assert key != cache_key(model, "prompt", JudicialOpinion)
+    # The same model name served by another provider is another model
+    assert cache_key(model, "prompt", provider="fake") != cache_key(model, "prompt", provider="fake2")
+
+
+def test_hits_misses_and_expiry(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite"))
+    assert cache.get("k") is None
+    cache.put("k", "value")
+    assert cache.get("k") == "value"
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+    expired = LLMCache(str(tmp_path / "cache.sqlite"), max_age_seconds=-1)
+    assert expired.get("k") is None
+
+
+def _accessed_at(cache, key):
+    return cache._conn.execute("SELECT accessed_at FROM responses WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_hits_refresh_the_lru_timestamp_only_when_it_is_stale(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite"))
+    cache.put("k", "value")
+    stored = _accessed_at(cache, "k")
+    changes = cache._conn.total_changes
+    for _ in range(5):
+        assert cache.get("k") == "value"
+    assert cache._conn.total_changes == changes and _accessed_at(cache, "k") == stored
+    stale = time.time() - ACCESS_REFRESH_S - 1
+    cache._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = 'k'", (stale,))
+    assert cache.get("k") == "value"
+    assert _accessed_at(cache, "k") > stale + ACCESS_REFRESH_S
+
+
+def test_async_gateway_reads_the_cache_off_the_event_loop(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE", "on")
+    monkeypatch.setenv("LLM_ROUTE_JUDGE", "fake:a")
+    monkeypatch.setattr(cache_module, "_cache", LLMCache(str(tmp_path / "cache.sqlite")))
+    threads = []
+    real_get_first = LLMCache.get_first
+
+    def get_first(self, keys):
+        threads.append(threading.current_thread())
+        return real_get_first(self, keys)
+    monkeypatch.setattr(LLMCache, "get_first", get_first)
+
+    async def audit():
+        route = get_model("judge")
+        first = await ainvoke_model(route, "Judge this", Priority.JUDGE)
+        again = await ainvoke_model(route, "Judge this", Priority.JUDGE)
+        return first, again, threading.current_thread()
+    first, again, loop_thread = asyncio.run(audit())
+    assert again.content == first.content
+    assert len(threads) == 2 and loop_thread not in threads
+    assert cache_module._cache.stats()["hits"] == 1
+
+
+def test_failover_route_counts_one_lookup_per_call(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE", "on")
+    monkeypatch.setitem(router.PROVIDERS, "fake2", router.PROVIDERS["fake"])
+    monkeypatch.setenv("LLM_ROUTE_JUDGE", "fake:x?error_rate=1,fake2:x")
+    monkeypatch.setattr(cache_module, "_cache", LLMCache(str(tmp_path / "cache.sqlite")))
+    route = get_model("judge")
+    first = invoke_model(route, "Judge this", Priority.JUDGE)
+    assert invoke_model(route, "Judge this", Priority.JUDGE).content == first.content
+    assert cache_module._cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+    # The answer is stored under the provider that gave it, not under every "x"
+    keys = {repr(c): cache_key(c.model, "Judge this", provider=c.provider) for c in route.candidates}
+    assert cache_module._cache.get_first([keys["fake:x"]]) is None
+    assert cache_module._cache.get_first([keys["fake2:x"]]) == first.content
@@ -0,0 +1,22 @@
+import pytest
+from src.checkpointing import saved_profile, sqlite_checkpointer, thread_config
+from src.graph import create_auditor_graph
+
+
+@pytest.fixture
+def checkpoints(monkeypatch, tmp_path):
+    monkeypatch.setenv("AUDITOR_CHECKPOINTS", "on")
+    monkeypatch.setenv("AUDITOR_CHECKPOINT_PATH", str(tmp_path / "checkpoints.sqlite"))
+
+
+def test_checkpoints_record_the_graph_profile(checkpoints):
+    with sqlite_checkpointer() as checkpointer:
+        app = create_auditor_graph(checkpointer=checkpointer, profile="judges")
+        # update_state writes a checkpoint without running any node
+        app.update_state(thread_config("t1", "judges"), {"repo_url": "https://example.com/repo"})
+    assert saved_profile("t1") == "judges"
+    assert saved_profile("unknown") is None
+
+
+def test_saved_profile_is_none_without_checkpoints():
+    assert saved_profile("t1") is None
@@ -0,0 +1,29 @@
+import os
+import time
+from src.tools import doc_tools
+
+
+def _age(path, seconds):
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_page_cache_evicts_least_recently_used_and_stale_documents(monkeypatch, tmp_path):
+    monkeypatch.setenv("PDF_TEXT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("PDF_TEXT_CACHE_MAX_ENTRIES", "2")
+    monkeypatch.setenv("PDF_TEXT_CACHE_MAX_AGE_DAYS", "1")
+    doc_tools.clear_memory_cache()
+    doc_tools._store_pages("a", ["page a"])
+    doc_tools._store_pages("b", ["page b"])
+    _age(tmp_path / "a.json", 3600)
+    _age(tmp_path / "b.json", 1800)
+    # A disk hit makes "a" the most recently used again
+    doc_tools.clear_memory_cache()
+    assert doc_tools._cached_pages("a") == ["page a"]
+    doc_tools._store_pages("c", ["page c"])
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "c.json"]
+
+    _age(tmp_path / "a.json", 2 * 86400)
+    doc_tools._store_pages("d", ["page d"])
+    assert sorted(os.listdir(tmp_path)) == ["c.json", "d.json"]
+    doc_tools.clear_memory_cache()
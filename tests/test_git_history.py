@@ -0,0 +1,42 @@
+from src.tools.git_history import CommitRecord, iter_commits, summarize_history
+
+
+def _commit(n, date, insertions=10):
+    return CommitRecord(hash=f"{n:040x}", date=date, author="Ada", subject=f"commit {n}",
+                        files_changed=1, insertions=insertions, deletions=0)
+
+
+def test_single_commit_is_a_bulk_dump():
+    summary = summarize_history(iter([_commit(1, "2024-01-01T10:00:00+00:00")]))
+    assert summary.bulk_dump and summary.bulk_dump_reasons == ["single commit"]
+
+
+def test_commits_within_one_hour_and_rapid_fire():
+    commits = [_commit(i, f"2024-01-01T10:0{i}:00+00:00") for i in range(5)]
+    summary = summarize_history(iter(commits))
+    assert "all 5 commits within one hour" in summary.bulk_dump_reasons
+    assert "100% of commits less than 5 min apart" in summary.bulk_dump_reasons
+    assert summary.sessions == 1
+
+
+def test_one_commit_carrying_most_changes():
+    commits = [_commit(1, "2024-01-01T10:00:00+00:00", insertions=900),
+               _commit(2, "2024-01-02T10:00:00+00:00", insertions=50),
+               _commit(3, "2024-01-03T10:00:00+00:00", insertions=50)]
+    summary = summarize_history(iter(commits))
+    assert summary.bulk_dump_reasons == ["one commit carries 90% of all changes"]
+    assert summary.largest_commit.subject == "commit 1"
+
+
+def test_iterative_history_is_not_a_bulk_dump():
+    commits = [_commit(i, f"2024-01-0{i + 1}T10:00:00+00:00") for i in range(4)]
+    summary = summarize_history(iter(commits))
+    assert not summary.bulk_dump and summary.sessions == 4 and summary.active_days == 4
+
+
+def test_streams_a_real_repository(origin_repo):
+    summary = summarize_history(iter_commits(origin_repo, line_stats="numstat"))
+    assert summary.total_commits == 4
+    assert summary.first_subjects[0] == "Set up the environment"
+    assert summary.files_changed == 4 and summary.insertions == 4
+    assert not summary.bulk_dump
@@ -0,0 +1,59 @@
+import sqlite3
+import time
+from src.jobs import JobQueue
+
+
+def _queue(tmp_path, **options):
+    return JobQueue(str(tmp_path / "jobs.sqlite"), **options)
+
+
+def test_claims_are_leased_to_their_worker(tmp_path):
+    first, second = _queue(tmp_path), _queue(tmp_path)
+    job_id = first.submit("file:///repo", "report.pdf")
+    job = first.claim("worker-a")
+    assert job["id"] == job_id and job["worker_id"] == "worker-a" and job["attempts"] == 1
+    assert second.claim("worker-b") is None
+    # A second worker starting up leaves the first one's running job alone
+    assert second.requeue_expired() == (0, 0)
+    assert first.heartbeat("worker-a") == 1 and second.heartbeat("worker-b") == 0
+    assert first.finish(job_id, {"status": "completed", "errors": []}, "worker-a")
+    assert second.get(job_id)["status"] == "completed"
+
+
+def test_expired_leases_are_requeued_until_max_attempts(tmp_path):
+    queue = _queue(tmp_path, lease_s=0.05, max_attempts=2)
+    job_id = queue.submit("file:///repo", "report.pdf")
+    queue.claim("worker-a")
+    time.sleep(0.1)
+    assert queue.requeue_expired() == (1, 0)
+    assert queue.claim("worker-b")["attempts"] == 2
+    # The first worker's late result is not stored over the new claim
+    assert not queue.finish(job_id, {"status": "completed", "errors": []}, "worker-a")
+    time.sleep(0.1)
+    assert queue.requeue_expired() == (0, 1)
+    job = queue.get(job_id)
+    assert job["status"] == "failed" and "2 attempts" in job["error"]
+
+
+def test_heartbeat_keeps_the_lease(tmp_path):
+    queue = _queue(tmp_path, lease_s=0.2)
+    queue.submit("file:///repo", "report.pdf")
+    queue.claim("worker-a")
+    for _ in range(3):
+        time.sleep(0.1)
+        queue.heartbeat("worker-a")
+        assert queue.requeue_expired() == (0, 0)
+
+
+def test_queue_files_without_leases_are_migrated(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "jobs.sqlite"))
+    conn.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, label TEXT, repo_url TEXT NOT NULL, pdf_path TEXT NOT NULL, "
+        "status TEXT NOT NULL, submitted_at REAL NOT NULL, started_at REAL, finished_at REAL, "
+        "attempts INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT)")
+    conn.execute("INSERT INTO jobs (id, repo_url, pdf_path, status, submitted_at, attempts) "
+                 "VALUES ('old', 'file:///repo', 'report.pdf', 'running', 0, 1)")
+    conn.commit()
+    conn.close()
+    # A job left running before leases existed has none, so it counts as expired
+    assert _queue(tmp_path).requeue_expired() == (1, 0)
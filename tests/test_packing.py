@@ -0,0 +1,40 @@
+from src.llm.packing import pack_evidence
+from src.llm.scheduler import estimate_tokens
+from src.state import Evidence
+
+DIMENSION = {"id": "graph_orchestration", "name": "Graph Orchestration",
+             "forensic_instruction": "Verify the StateGraph fan-out of the detectives."}
+
+
+def _evidence(goal, lines, found=True, confidence=0.9):
+    content = "\n".join(f"line {i}: StateGraph fan-out detail number {i}" for i in range(lines))
+    return Evidence(goal=goal, found=found, content=content, location="src/graph.py", rationale="-",
+                    confidence=confidence)
+
+
+def test_stays_within_budget_and_cuts_at_a_line_boundary():
+    packed = pack_evidence([_evidence("Graph wiring", 400)], DIMENSION, budget=200)
+    assert estimate_tokens(packed) <= 200
+    kept = packed.split("\n[... truncated")[0]
+    assert kept.splitlines()[-1].endswith(tuple("0123456789"))
+    assert "more lines]" in packed
+
+
+def test_short_evidence_is_kept_whole():
+    evidence = _evidence("Graph wiring", 3)
+    assert evidence.content in pack_evidence([evidence], DIMENSION, budget=600)
+
+
+def test_best_evidence_first_and_the_rest_named_as_omitted():
+    strong = _evidence("Strong", 300)
+    weak = _evidence("Weak", 300, found=False, confidence=0.1)
+    packed = pack_evidence([weak, strong], DIMENSION, budget=150)
+    assert packed.startswith("- Strong:")
+    assert packed.endswith("(omitted for length: Weak)")
+
+
+def test_evidence_without_content_is_packed():
+    empty = Evidence(goal="Architecture diagram", found=False, content=None, location="Architecture.md",
+                     rationale="-", confidence=0.5)
+    packed = pack_evidence([empty, _evidence("Graph wiring", 3)], DIMENSION, budget=600)
+    assert "- Architecture diagram: None (Confidence: 0.5)" in packed
@@ -0,0 +1,42 @@
+from src.tools.path_verifier import PathVerifier, is_file_path, normalize_path
+
+REPO_PATHS = ["README.md", "main.py", "src/graph.py", "src/state.py", "src/nodes/judges.py",
+              "src/nodes/justice.py", "tests/nodes/judges.py"]
+
+
+def test_lookup_exact():
+    assert PathVerifier(REPO_PATHS).lookup("src/graph.py") == (["src/graph.py"], "exact")
+
+
+def test_lookup_claim_is_a_suffix_of_repo_paths():
+    matched, match_type = PathVerifier(REPO_PATHS).lookup("nodes/judges.py")
+    assert match_type == "suffix"
+    assert matched == ["src/nodes/judges.py", "tests/nodes/judges.py"]
+
+
+def test_lookup_claim_with_extra_leading_directories():
+    verifier = PathVerifier(REPO_PATHS)
+    assert verifier.lookup("my-repo/src/graph.py") == (["src/graph.py"], "suffix")
+    # A bare root file name does not vouch for a deeper claim
+    assert verifier.lookup("docs/README.md") == ([], None)
+
+
+def test_lookup_miss_and_suggestions():
+    verifier = PathVerifier(REPO_PATHS)
+    assert verifier.lookup("src/nodes/judge.py") == ([], None)
+    assert verifier.suggestions("src/nodes/judge.py")[0] == "src/nodes/judges.py"
+
+
+def test_verify_sorts_claims():
+    result = PathVerifier(REPO_PATHS).verify({
+        "./src/graph.py": [1], "src/nodes/judge.py": [2], "github.com/org/repo.git": [3], "notes.xyz": [4]})
+    assert [v.claimed for v in result.verified] == ["./src/graph.py"]
+    assert [h.claimed for h in result.hallucinated] == ["src/nodes/judge.py"]
+    assert result.hallucinated[0].pages == [2]
+    assert result.ignored == ["github.com/org/repo.git", "notes.xyz"]
+
+
+def test_normalize_and_classify():
+    assert normalize_path("`./src//graph.py`") == "src/graph.py"
+    assert is_file_path("main.py") and is_file_path("src/anything")
+    assert not is_file_path("../outside.py") and not is_file_path("example.com/page.html")
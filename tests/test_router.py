@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+import pytest
+from src.benchmark.fake_llm import FakeProviderError
+from src.llm import router
+from src.llm.gateway import ainvoke_model, invoke_model
+from src.llm.router import arun_route, get_model, run_route
+from src.llm.scheduler import Priority, get_scheduler
+
+
+def _answered_by(candidate, last):
+    candidate.model.invoke(f"prompt for {candidate}")
+    return candidate.model_name
+
+
+async def _aanswered_by(candidate, last):
+    await candidate.model.ainvoke(f"prompt for {candidate}")
+    return candidate.model_name
+
+
+def test_route_from_environment(monkeypatch):
+    monkeypatch.setenv("LLM_ROUTE_JUDGE", "fake:a,groq:llama-3.3-70b-versatile,fake:b")
+    route = get_model("judge")
+    # Groq has no API key configured, so it is skipped
+    assert [repr(c) for c in route.candidates] == ["fake:a", "fake:b"]
+    assert get_model("judge") is route
+
+
+def test_fails_over_on_server_errors(monkeypatch):
+    monkeypatch.setenv("LLM_ROUTE_JUDGE", "fake:a?error_rate=1,fake:b")
+    assert run_route(get_model("judge"), _answered_by) == "b"
+    assert asyncio.run(arun_route(get_model("judge"), _aanswered_by)) == "b"
+
+
+def test_rate_limited_provider_fails_fast_and_moves_to_the_back(monkeypatch):
+    # A second fake provider, so each candidate has its own scheduler as real providers do
+    monkeypatch.setitem(router.PROVIDERS, "fake2", router.PROVIDERS["fake"])
+    monkeypatch.setenv("LLM_ROUTE_JUDGE", "fake:a?rate_limit_rate=1&retry_after_s=30,fake2:b")
+    route = get_model("judge")
+    started = time.perf_counter()
+    result = invoke_model(route, "Judge this", Priority.JUDGE)
+    assert result.content.startswith("Fake analysis")
+    assert time.perf_counter() - started < 1
+    assert get_scheduler("fake").paused_for() > 25
+    assert get_scheduler("fake").metrics.retries == 0
+    assert [c.model_name for c in route.ordered()] == ["b", "a"]
+
+
+def test_other_errors_do_not_fail_over(monkeypatch):
+    monkeypatch.setenv("LLM_ROUTE_JUDGE", "fake:a,fake:b")
+
+    def attempt(candidate, last):
+        raise ValueError("bad prompt")
+    with pytest.raises(ValueError):
+        run_route(get_model("judge"), attempt)
+
+
+def test_last_candidate_error_is_raised(monkeypatch):
+    monkeypatch.setenv("LLM_ROUTE_JUDGE", "fake:a?error_rate=1,fake:b?error_rate=1")
+    with pytest.raises(FakeProviderError):
+        run_route(get_model("judge"), _answered_by)
+
+
+def test_hedges_a_slow_call(monkeypatch):
+    monkeypatch.setenv("LLM_ROUTE_JUDGE", "fake:slow?latency_s=1,fake:fast")
+    monkeypatch.setenv("LLM_HEDGE_AFTER_S", "0.05")
+    route = get_model("judge")
+    assert route.hedge_after_s == 0.05
+    started = time.perf_counter()
+    assert run_route(route, _answered_by) == "fast"
+    assert time.perf_counter() - started < 0.5
+    started = time.perf_counter()
+    assert asyncio.run(arun_route(route, _aanswered_by)) == "fast"
+    assert time.perf_counter() - started < 0.5
+
+
+def test_fast_primary_is_not_hedged(monkeypatch):
+    monkeypatch.setenv("LLM_ROUTE_JUDGE", "fake:a,fake:b")
+    monkeypatch.setenv("LLM_HEDGE_AFTER_S", "5")
+    calls = []
+
+    def attempt(candidate, last):
+        calls.append(candidate.model_name)
+        return candidate.model_name
+    assert run_route(get_model("judge"), attempt) == "a"
+    assert calls == ["a"]
+
+
+def test_hedge_takes_over_when_the_primary_fails_early(monkeypatch):
+    monkeypatch.setenv("LLM_ROUTE_JUDGE", "fake:a?error_rate=1,fake:b")
+    monkeypatch.setenv("LLM_HEDGE_AFTER_S", "5")
+    started = time.perf_counter()
+    assert run_route(get_model("judge"), _answered_by) == "b"
+    assert time.perf_counter() - started < 1
+
+
+def _wait_for_idle_hedge_threads():
+    # Losers of earlier tests may still be running
+    deadline = time.monotonic() + 5
+    while router._hedge_slots._value < router.MAX_HEDGE_THREADS and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_saturated_hedge_pool_runs_calls_unhedged(monkeypatch):
+    monkeypatch.setenv("LLM_ROUTE_JUDGE", "fake:a,fake:b")
+    monkeypatch.setenv("LLM_HEDGE_AFTER_S", "0.05")
+    route = get_model("judge")
+    _wait_for_idle_hedge_threads()
+    release, blocked = threading.Event(), []
+
+    def stuck(candidate, last):
+        blocked.append(candidate.model_name)
+        release.wait(10)
+        return candidate.model_name
+    # Every stuck call is hedged and holds two pool threads until released
+    callers = [threading.Thread(target=run_route, args=(route, stuck)) for _ in range(router.MAX_HEDGE_THREADS // 2)]
+    for caller in callers:
+        caller.start()
+    deadline = time.monotonic() + 5
+    while len(blocked) < router.MAX_HEDGE_THREADS and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(blocked) == router.MAX_HEDGE_THREADS
+    calls = []
+
+    def attempt(candidate, last):
+        calls.append((candidate.model_name, threading.current_thread() is threading.main_thread()))
+        time.sleep(0.1)
+        return candidate.model_name
+    try:
+        # Queued behind the stuck calls, the old timer would have fired before the request even began
+        assert run_route(route, attempt) == "a"
+        assert calls == [("a", True)]
+    finally:
+        release.set()
+        for caller in callers:
+            caller.join()
+    # Threads are handed back once the stuck calls finish, and hedging resumes
+    _wait_for_idle_hedge_threads()
+    calls.clear()
+    assert run_route(route, attempt) == "a"
+    assert [name for name, on_caller in calls] == ["a", "b"] and not any(on_caller for _, on_caller in calls)
+
+
+def test_hedging_is_limited_to_its_roles(monkeypatch):
+    monkeypatch.setenv("LLM_HEDGE_AFTER_S", "1")
+    monkeypatch.setenv("LLM_ROUTE_DETECTIVE", "fake:a,fake:b")
+    assert get_model("detective").hedge_after_s is None
+
+
+def test_async_gateway_fails_over(monkeypatch):
+    monkeypatch.setenv("LLM_ROUTE_JUSTICE", "fake:a?error_rate=1,fake:b")
+    result = asyncio.run(ainvoke_model(get_model("justice"), "Summarize", Priority.JUSTICE))
+    assert result.content.startswith("Fake analysis")
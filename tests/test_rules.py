@@ -0,0 +1,94 @@
+import itertools
+import json
+import pytest
+from pydantic import ValidationError
+from src.rules import (OverrideCondition, ScoreOverride, ScoringRules, load_rubric, load_scoring_rules,
+                       needs_synthesis, score_dimension)
+from src.state import JudicialOpinion
+
+JUDGES = ("Prosecutor", "Defense", "TechLead")
+
+
+def _opinions(criterion_id, scores):
+    return [JudicialOpinion(judge=judge, criterion_id=criterion_id, score=score, argument="-", cited_evidence=[])
+            for judge, score in zip(JUDGES, scores) if score is not None]
+
+
+def _legacy_score(dim_id, p_sc, d_sc, t_sc):
+    # The Chief Justice branches the rules engine replaced
+    if dim_id == "safe_tool_engineering" and p_sc <= 2:
+        final_score = min(p_sc, 3)
+    elif dim_id == "graph_orchestration":
+        final_score = t_sc
+    else:
+        final_score = round((p_sc * 0.3) + (d_sc * 0.3) + (t_sc * 0.4))
+    dissent = (max(p_sc, d_sc, t_sc) - min(p_sc, d_sc, t_sc)) > 2
+    return final_score, dissent
+
+
+@pytest.mark.parametrize("dim_id", ["safe_tool_engineering", "graph_orchestration", "theoretical_depth"])
+def test_default_rules_match_the_legacy_branches(dim_id):
+    rules = load_scoring_rules(None)
+    for scores in itertools.product(range(1, 6), repeat=3):
+        verdict = score_dimension(rules, dim_id, _opinions(dim_id, scores))
+        final_score, dissent = _legacy_score(dim_id, *scores)
+        assert verdict.final_score == final_score, scores
+        assert (verdict.dissent_summary is not None) == dissent, scores
+
+
+def test_missing_opinions_count_as_the_missing_score():
+    rules = load_scoring_rules(None)
+    verdict = score_dimension(rules, "theoretical_depth", _opinions("theoretical_depth", (5, None, None)))
+    assert verdict.scores == {"Prosecutor": 5, "Defense": 3, "TechLead": 3}
+    assert verdict.final_score == _legacy_score("theoretical_depth", 5, 3, 3)[0]
+
+
+def test_rule_names_and_synthesis_threshold():
+    rules = ScoringRules()
+    security = score_dimension(rules, "safe_tool_engineering", _opinions("safe_tool_engineering", (1, 5, 5)))
+    assert (security.final_score, security.rule) == (1, "security_override")
+    assert security.spread == 4 and needs_synthesis(rules, security)
+    orchestration = score_dimension(rules, "graph_orchestration", _opinions("graph_orchestration", (2, 3, 4)))
+    assert (orchestration.final_score, orchestration.rule) == (4, "functionality_weight")
+    assert not needs_synthesis(rules, orchestration)
+
+
+def test_rules_reject_weights_that_do_not_sum_to_one():
+    with pytest.raises(ValidationError, match="sum to 1"):
+        load_scoring_rules({"judge_weights": {"Prosecutor": 0.5, "Defense": 0.5, "TechLead": 0.5}})
+
+
+@pytest.mark.parametrize("override", [
+    {"rule": "r", "criterion_id": "c", "score_from": "Judge Dredd"},
+    {"rule": "r", "criterion_id": "c", "score_from": "TechLead", "when": {"judge": "Judge Dredd", "at_most": 2}},
+])
+def test_rules_reject_overrides_naming_unknown_judges(override):
+    with pytest.raises(ValidationError, match="Judge Dredd"):
+        load_scoring_rules({"overrides": [override]})
+
+
+def test_override_is_skipped_for_a_judge_without_a_score():
+    # Bypasses validation, as a rules object assembled in code could
+    rules = ScoringRules.model_construct(**{**ScoringRules().__dict__, "overrides": [
+        ScoreOverride(rule="ghost", criterion_id="theoretical_depth", score_from="Clerk",
+                      when=OverrideCondition(judge="Clerk", at_most=5))]})
+    verdict = score_dimension(rules, "theoretical_depth", _opinions("theoretical_depth", (4, 4, 4)))
+    assert (verdict.final_score, verdict.rule) == (4, "weighted_average")
+    assert not OverrideCondition(judge="Clerk", at_least=1).matches({"Prosecutor": 3})
+
+
+def test_final_score_is_clamped_to_the_scale():
+    rules = load_scoring_rules({"missing_score": 9})
+    verdict = score_dimension(rules, "theoretical_depth", [])
+    assert verdict.final_score == 5
+    rules = load_scoring_rules({"overrides": [
+        {"rule": "floor", "criterion_id": "theoretical_depth", "score_from": "Prosecutor", "cap": 0}]})
+    assert score_dimension(rules, "theoretical_depth", _opinions("theoretical_depth", (3, 3, 3))).final_score == 1
+
+
+def test_load_rubric_rejects_broken_scoring_rules(tmp_path):
+    assert load_rubric()["dimensions"]
+    broken = tmp_path / "rubric.json"
+    broken.write_text(json.dumps({"dimensions": [], "scoring_rules": {"judge_weights": {"Prosecutor": 2.0}}}))
+    with pytest.raises(ValidationError):
+        load_rubric(str(broken))
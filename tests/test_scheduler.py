@@ -0,0 +1,74 @@
+import time
+from email.utils import formatdate
+import pytest
+from src.benchmark.fake_llm import FakeProviderError
+from src.llm.scheduler import LLMScheduler, Priority, _parse_duration, retry_after_seconds
+
+
+def _error_with_headers(headers):
+    error = FakeProviderError(429)
+    error.response.headers = headers
+    return error
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("7.66s", 7.66), ("2m59.56s", 179.56), ("120ms", 0.12), ("1h2m", 3720.0), ("3", 3.0), ("soon", None)])
+def test_parse_duration(value, seconds):
+    assert _parse_duration(value) == pytest.approx(seconds) if seconds is not None else _parse_duration(value) is None
+
+
+def test_retry_after_from_headers():
+    assert retry_after_seconds(FakeProviderError(429, retry_after_s=1.5)) == 1.5
+    assert retry_after_seconds(_error_with_headers({"x-ratelimit-reset-tokens": "2m"})) == 120.0
+    http_date = retry_after_seconds(_error_with_headers({"retry-after": formatdate(time.time() + 30, usegmt=True)}))
+    assert 25 < http_date <= 30
+    assert retry_after_seconds(FakeProviderError(429)) is None
+
+
+def _flaky(failures, retry_after_s):
+    calls = []
+
+    def call():
+        calls.append(time.monotonic())
+        if len(calls) <= failures:
+            raise FakeProviderError(429, retry_after_s)
+        return "ok", 10
+    return call, calls
+
+
+def test_429_pauses_admission_for_the_retry_after_window():
+    scheduler = LLMScheduler(requests_per_minute=100000, tokens_per_minute=1e12)
+    call, calls = _flaky(failures=1, retry_after_s=0.2)
+    assert scheduler.run(call, Priority.JUDGE, estimated_tokens=10) == "ok"
+    assert calls[1] - calls[0] >= 0.19
+    assert scheduler.metrics.retries == 1 and scheduler.metrics.rate_limited == 1
+
+
+def test_fail_fast_still_pauses_the_provider():
+    scheduler = LLMScheduler(requests_per_minute=100000, tokens_per_minute=1e12)
+    call, _ = _flaky(failures=1, retry_after_s=5)
+    with pytest.raises(FakeProviderError):
+        scheduler.run(call, Priority.JUDGE, estimated_tokens=10, max_retries=0)
+    assert 4 < scheduler.paused_for() <= 5
+    assert scheduler.metrics.retries == 0
+
+
+def test_non_rate_limit_errors_are_not_retried():
+    scheduler = LLMScheduler(requests_per_minute=100000, tokens_per_minute=1e12)
+
+    def call():
+        raise FakeProviderError(500)
+    with pytest.raises(FakeProviderError):
+        scheduler.run(call, Priority.JUDGE, estimated_tokens=10)
+    assert scheduler.paused_for() == 0
+
+
+async def _ok():
+    return "ok", 1
+
+
+def test_async_run():
+    import asyncio
+    scheduler = LLMScheduler(requests_per_minute=100000, tokens_per_minute=1e12)
+    assert asyncio.run(scheduler.arun(_ok, Priority.DETECTIVE, estimated_tokens=1)) == "ok"
+    assert scheduler.metrics.requests == 1
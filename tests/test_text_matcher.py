@@ -0,0 +1,37 @@
+from src.tools.text_matcher import MultiPatternMatcher, PAGE_SEPARATOR, find_paths, format_pages
+
+
+def test_matches_every_term_in_one_pass_with_pages_and_offsets():
+    pages = ["Our Fan-Out design ends in a fan-in.", "Dialectical\nSynthesis resolves it. Fan-Out again."]
+    hits = MultiPatternMatcher(["Fan-In", "Fan-Out", "Dialectical Synthesis", "Metacognition"]).scan_pages(pages)
+
+    assert hits["Fan-Out"].count == 2 and hits["Fan-Out"].pages == [1, 2]
+    assert hits["Fan-In"].count == 1 and hits["Fan-In"].matches[0].text == "fan-in"
+    # A line break inside a phrase still matches
+    synthesis = hits["Dialectical Synthesis"]
+    assert synthesis.count == 1 and synthesis.pages == [2]
+    assert synthesis.matches[0].offset == len(pages[0]) + len(PAGE_SEPARATOR)
+    assert hits["Metacognition"].count == 0
+    assert hits["Metacognition"].citation() == "'Metacognition': not found"
+
+
+def test_shared_prefixes_prefer_the_longest_term_and_respect_word_boundaries():
+    matcher = MultiPatternMatcher(["State", "State Synchronization"])
+    hits = matcher.scan("State Synchronization keeps State consistent; Statement and restate do not count.")
+    assert hits["State Synchronization"].count == 1
+    assert hits["State"].count == 1
+
+
+def test_case_sensitive_matching():
+    hits = MultiPatternMatcher(["StateGraph"], case_sensitive=True).scan("stategraph StateGraph")
+    assert hits["StateGraph"].count == 1
+
+
+def test_find_paths_in_reading_order():
+    mentions = find_paths(["See src/graph.py and ./README.md.", "The judges live in src/nodes/judges.py"])
+    assert [(m.text, m.page) for m in mentions] == [
+        ("src/graph.py", 1), ("./README.md", 1), ("src/nodes/judges.py", 2)]
+
+
+def test_format_pages():
+    assert format_pages([7, 1, 2, 3, 3]) == "1-3, 7"
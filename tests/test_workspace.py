@@ -0,0 +1,174 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.batch import audit_submission
+from src.nodes import detectives
+from src.resources import audit_resources
+from src.state import Evidence
+from src.tools.repo_index import RepoIndex
+from src.tools.repo_tools import RepoTools
+from src.tools.workspace import RepoWorkspace, WorkspaceLock
+from tests.conftest import commit_file
+
+
+def _url(repo):
+    return f"file://{repo}"
+
+
+def _missing_blobs(path):
+    listing = subprocess.run(["git", "-C", path, "rev-list", "--objects", "--missing=print", "HEAD"],
+                             capture_output=True, text=True, check=True).stdout
+    return {line for line in listing.splitlines() if line.startswith("?")}
+
+
+@pytest.mark.parametrize("strategy", ["full", "blobless", "sparse"])
+def test_clone_strategies_index_the_tree(origin_repo, tmp_path, strategy):
+    # An older revision and a file outside the sparse patterns: blobs a partial clone leaves out
+    commit_file(origin_repo, "src/graph.py", "from langgraph.graph import END, StateGraph\n", "Add END",
+                date="2024-01-05T10:00:00+00:00")
+    commit_file(origin_repo, "docs/guide.md", "# Guide\n", "Add guide", date="2024-01-06T10:00:00+00:00")
+    path = RepoTools.clone_repository(_url(origin_repo), target_dir=str(tmp_path / strategy), strategy=strategy,
+                                      sparse_paths=["*.py"])
+    missing = _missing_blobs(path)
+    index = RepoIndex.build(path, RepoTools.get_head_sha(path), strategy)
+    assert {"README.md", "src/graph.py", "src/state.py"} <= set(index.paths())
+    # Indexing reads trees only: the blobs a partial clone left out stay out
+    assert _missing_blobs(path) == missing
+    assert (len(missing) > 0) == (strategy != "full")
+    assert index.files["src/graph.py"].size > 0
+    assert (index.files["docs/guide.md"].size is None) == (strategy == "sparse")
+    # Files outside a sparse checkout are listed and read lazily from git
+    assert RepoTools.read_file(path, "README.md").rstrip() == "# Demo"
+    assert os.path.exists(os.path.join(path, "README.md")) == (strategy != "sparse")
+
+
+def test_workspace_fetches_new_commits(origin_repo):
+    workspace = RepoWorkspace(_url(origin_repo))
+    first = RepoTools.get_head_sha(workspace.sync())
+    commit_file(origin_repo, "src/nodes/judges.py", "PROMPT = 'x'\n", "Add judges", date="2024-01-05T10:00:00+00:00")
+    path = workspace.sync()
+    assert RepoTools.get_head_sha(path) != first
+    assert os.path.exists(os.path.join(path, "src/nodes/judges.py"))
+
+
+def test_reusable_evidence_follows_fingerprints(origin_repo):
+    workspace = RepoWorkspace(_url(origin_repo))
+    evidence = Evidence(goal="g", found=True, location="l", rationale="r", confidence=1.0)
+    workspace.record("sha", {}, {"a": "fp-a", "b": "fp-b"}, {"a": [evidence], "b": [evidence]})
+    assert set(workspace.reusable_evidence({"a": "fp-a", "b": "changed"})) == {"a"}
+    # A smaller rubric keeps the evidence of criteria it did not investigate
+    workspace.record("sha", {}, {"a": "fp-a2"}, {"a": [evidence]})
+    assert set(workspace.reusable_evidence({"a": "fp-a2", "b": "fp-b"})) == {"a", "b"}
+
+
+def test_detective_route_keys_the_model_written_evidence(monkeypatch):
+    hashes = {"src/tools/repo_tools.py": "h1", "src/graph.py": "h2", "src/state.py": "h3"}
+
+    def fingerprints(route):
+        monkeypatch.setenv("LLM_ROUTE_DETECTIVE", route)
+        return detectives._repo_fingerprints("sha", hashes, "sparse", detectives._detective_route_spec())
+    before, after = fingerprints("fake:small"), fingerprints("fake:large")
+    assert before["safe_tool_engineering"] != after["safe_tool_engineering"]
+    # The static criteria do not depend on the model
+    assert all(before[c] == after[c] for c in before if c not in detectives.LLM_CRITERIA)
+
+
+def _acquired_elsewhere(workspace, within_s=0.2):
+    """Whether another thread gets the workspace lock within `within_s`; it is released again either way."""
+    acquired = threading.Event()
+    lock = WorkspaceLock(workspace.root)
+
+    def take():
+        lock.acquire()
+        acquired.set()
+    thread = threading.Thread(target=take)
+    thread.start()
+    got_it = acquired.wait(within_s)
+    return got_it, lambda: (thread.join(), lock.release())
+
+
+def test_audit_holds_the_workspace_until_its_checkout_is_released(origin_repo):
+    workspace = RepoWorkspace(_url(origin_repo))
+    with audit_resources() as resources:
+        index = detectives._build_repo_index(_url(origin_repo))
+        assert index.repo_path == workspace.path and resources.holds(workspace.path)
+        # Nested uses within the audit do not deadlock on its own lock
+        with workspace.lock():
+            pass
+        got_it, finish = _acquired_elsewhere(workspace)
+        assert not got_it
+        # Another process (a worker next to the CLI) is kept out as well
+        probe = "import fcntl, sys; fcntl.flock(open(sys.argv[1], 'a'), fcntl.LOCK_EX | fcntl.LOCK_NB)"
+        assert subprocess.run([sys.executable, "-c", probe, workspace.root + ".lock"],
+                              capture_output=True).returncode != 0
+        detectives.evidence_aggregator_node({"repo_index": index, "claimed_paths": None})
+        finish()
+        assert not resources.holds(workspace.path)
+
+
+def test_async_audits_of_one_repo_wait_on_the_loop(origin_repo):
+    state = {"repo_url": _url(origin_repo), "rubric_dimensions": [{"id": "git_forensic_analysis"}]}
+
+    async def audit():
+        with audit_resources():
+            update = await detectives.arepo_indexer_node(state)
+            # LangGraph runs the sync aggregator on the default executor, like this
+            await asyncio.get_running_loop().run_in_executor(None, detectives.evidence_aggregator_node, update)
+            return update
+
+    async def cohort():
+        # More audits of the repo than executor threads: a waiter parked on a thread would starve the holder
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=2))
+        return await asyncio.wait_for(asyncio.gather(*(audit() for _ in range(5))), timeout=60)
+    updates = asyncio.run(cohort())
+    assert all("repo_index" in update for update in updates)
+    got_it, finish = _acquired_elsewhere(RepoWorkspace(_url(origin_repo)))
+    finish()
+    assert got_it
+
+
+def test_interrupted_audit_releases_the_workspace(origin_repo):
+    workspace = RepoWorkspace(_url(origin_repo))
+    with pytest.raises(KeyboardInterrupt):
+        with audit_resources():
+            detectives._build_repo_index(_url(origin_repo))
+            raise KeyboardInterrupt
+    got_it, finish = _acquired_elsewhere(workspace)
+    finish()
+    assert got_it
+
+
+def test_throwaway_clone_is_removed_when_the_audit_fails(origin_repo, monkeypatch):
+    monkeypatch.setenv("AUDITOR_INCREMENTAL", "off")
+    with pytest.raises(RuntimeError):
+        with audit_resources():
+            index = detectives._build_repo_index(_url(origin_repo))
+            assert index.temporary and os.path.isdir(index.repo_path)
+            raise RuntimeError("judge crashed")
+    assert not os.path.exists(index.repo_path)
+
+
+def test_throwaway_clone_is_removed_by_the_aggregator(origin_repo, monkeypatch):
+    monkeypatch.setenv("AUDITOR_INCREMENTAL", "off")
+    with audit_resources() as resources:
+        index = detectives._build_repo_index(_url(origin_repo))
+        detectives.evidence_aggregator_node({"repo_index": index, "claimed_paths": None})
+        assert not os.path.exists(index.repo_path) and not resources.holds(index.repo_path)
+
+
+def test_batch_audit_crash_does_not_leak_the_clone(origin_repo, tmp_path, monkeypatch):
+    monkeypatch.setenv("AUDITOR_INCREMENTAL", "off")
+    clones = []
+
+    class CrashingApp:
+        def invoke(self, state):
+            clones.append(detectives._build_repo_index(state["repo_url"]).repo_path)
+            raise RuntimeError("judge crashed")
+    submission = {"id": "s1", "repo_url": _url(origin_repo), "pdf_path": str(tmp_path / "report.pdf")}
+    result = audit_submission(CrashingApp(), submission, {"dimensions": []}, str(tmp_path / "out"))
+    assert result["errors"] == ["Audit crashed: judge crashed"]
+    assert clones and not os.path.exists(clones[0])